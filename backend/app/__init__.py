@@ -27,6 +27,20 @@ def create_app():
     app.config['JWT_ACCESS_TOKEN_EXPIRES'] = False
     app.config['JWT_REFRESH_TOKEN_EXPIRES'] = False
     app.config['HUGGINGFACE_API_KEY'] = os.environ.get('HUGGINGFACE_API_KEY')
+    app.config['HOT_COURSE_ENROLLMENT_THRESHOLD'] = int(os.environ.get('HOT_COURSE_ENROLLMENT_THRESHOLD', 1000))
+    app.config['ENROLLMENT_COUNTER_SHARDS'] = int(os.environ.get('ENROLLMENT_COUNTER_SHARDS', 16))
+    app.config['JSON_PROVIDER'] = os.environ.get('JSON_PROVIDER', 'orjson')
+    app.config['CACHE_BACKEND'] = os.environ.get('CACHE_BACKEND', 'memory')
+    app.config['CACHE_DEFAULT_TTL'] = int(os.environ.get('CACHE_DEFAULT_TTL', 300))
+    app.config['CACHE_MAX_ENTRIES'] = int(os.environ.get('CACHE_MAX_ENTRIES', 1024))
+    app.config['REDIS_URL'] = os.environ.get('REDIS_URL')
+    app.config['FACET_INDEX_MAX_AGE'] = int(os.environ.get('FACET_INDEX_MAX_AGE', 300))
+    app.config['DASHBOARD_SUMMARY_WORKERS'] = int(os.environ.get('DASHBOARD_SUMMARY_WORKERS', 4))
+    app.config['DASHBOARD_SECTION_TIMEOUT'] = float(os.environ.get('DASHBOARD_SECTION_TIMEOUT', 2.0))
+    app.config['DASHBOARD_SUMMARY_MAX_INFLIGHT'] = int(os.environ.get('DASHBOARD_SUMMARY_MAX_INFLIGHT', 2))
+    app.config['ACTIVITY_LOG_BATCH_SIZE'] = int(os.environ.get('ACTIVITY_LOG_BATCH_SIZE', 500))
+    app.config['ACTIVITY_LOG_FLUSH_INTERVAL'] = float(os.environ.get('ACTIVITY_LOG_FLUSH_INTERVAL', 1.0))
+    app.config['UPCOMING_QUIZ_CACHE_TTL'] = int(os.environ.get('UPCOMING_QUIZ_CACHE_TTL', 60))
     
     # Initialize extensions with app
     db.init_app(app)
@@ -35,6 +49,30 @@ def create_app():
     cors.init_app(app, origins=['http://localhost:3000'])
     bcrypt.init_app(app)
     
+    # Fast JSON encoding for every response
+    from app.utils.json_provider import install_json_provider
+    install_json_provider(app)
+    
+    # Response cache for public read-heavy endpoints
+    from app.utils.cache import init_cache
+    init_cache(app)
+    
+    # Catalog facet counts are served from memory
+    from app.services.facet_index import init_facet_index
+    init_facet_index(app)
+    
+    # Worker pool for the aggregated dashboard summary
+    from app.services.dashboard_service import init_dashboard_executor
+    init_dashboard_executor(app)
+    
+    # Buffered writer for the learning-event log
+    from app.services.activity_service import init_activity_log
+    init_activity_log(app)
+    
+    # Achievements are awarded from the learning events as they are written
+    from app.services.achievement_service import init_achievements
+    init_achievements(app)
+    
     # Import models to register them
     from app.models import User, Course, Lesson, Quiz, Question, QuizAttempt, QuizAnswer, Enrollment, Progress
     
@@ -53,6 +91,10 @@ def create_app():
     app.register_blueprint(lessons_bp, url_prefix='/api/lessons')
     app.register_blueprint(users_bp, url_prefix='/api/user')
     
+    # Register CLI commands
+    from app.commands import register_commands
+    register_commands(app)
+    
     # Seed demo data if empty (dev convenience)
     with app.app_context():
         try:
@@ -161,6 +203,11 @@ def create_app():
                             updated_at=datetime.utcnow(),
                         ))
 
+                from app.services.search_index import SearchIndex
+                search_index = SearchIndex()
+                for course in created_courses:
+                    search_index.index_course(course.id)
+
                 db.session.commit()
         except Exception:
             db.session.rollback()
@@ -0,0 +1,88 @@
+# Backend app/commands.py
+import click
+from flask.cli import with_appcontext
+
+
+@click.command('reconcile-enrollment-counts')
+@with_appcontext
+def reconcile_enrollment_counts_command():
+    """Recompute course enrollment counters from the enrollments table."""
+    from app.services.course_service import CourseService
+
+    updated = CourseService().reconcile_enrollment_counts()
+    click.echo(f'Reconciled enrollment counts for {updated} courses')
+
+
+@click.command('compact-uuids')
+@click.option('--batch-size', default=5000, show_default=True, help='Rows converted per transaction.')
+@with_appcontext
+def compact_uuids_command(batch_size):
+    """Convert string UUID keys to native/16-byte storage (resumable)."""
+    from app import db
+    from app.models import COMPACT_UUID_STORAGE
+    from app.utils.uuid_storage import convert_to_compact_uuids
+
+    if not COMPACT_UUID_STORAGE:
+        raise click.ClickException('Set COMPACT_UUID_STORAGE=true before converting the database')
+    converted = convert_to_compact_uuids(db.engine, db.metadata, batch_size=batch_size, log=click.echo)
+    click.echo(f'Converted {converted} values')
+
+
+@click.command('rebuild-search-index')
+@with_appcontext
+def rebuild_search_index_command():
+    """Rebuild the course full-text search index from scratch."""
+    from app.services.search_index import SearchIndex
+
+    indexed = SearchIndex().rebuild()
+    click.echo(f'Indexed {indexed} courses')
+
+
+@click.command('reconcile-user-stats')
+@click.option('--interval', type=int, default=None,
+              help='Keep running and reconcile every INTERVAL seconds.')
+@with_appcontext
+def reconcile_user_stats_command(interval):
+    """Recompute every user's dashboard stats snapshot to correct drift."""
+    import time
+    from app import db
+    from app.services.user_stats_service import UserStatsService
+
+    service = UserStatsService()
+    while True:
+        updated = service.reconcile()
+        click.echo(f'Reconciled stats for {updated} users')
+        if interval is None:
+            break
+        db.session.remove()
+        time.sleep(interval)
+
+
+@click.command('build-recommendations')
+@click.option('--top-k', default=20, show_default=True, help='Neighbours stored per course.')
+@with_appcontext
+def build_recommendations_command(top_k):
+    """Recompute co-enrollment course similarities for recommendations."""
+    from app.services.recommendation_service import RecommendationService
+
+    stored = RecommendationService().build(top_k=top_k)
+    click.echo(f'Stored {stored} course neighbours')
+
+
+@click.command('backfill-achievements')
+@with_appcontext
+def backfill_achievements_command():
+    """Award badges for existing learning history."""
+    from app.services.achievement_service import AchievementService
+
+    awarded = AchievementService().backfill()
+    click.echo(f'Awarded {awarded} achievements')
+
+
+def register_commands(app):
+    app.cli.add_command(reconcile_enrollment_counts_command)
+    app.cli.add_command(compact_uuids_command)
+    app.cli.add_command(rebuild_search_index_command)
+    app.cli.add_command(reconcile_user_stats_command)
+    app.cli.add_command(build_recommendations_command)
+    app.cli.add_command(backfill_achievements_command)
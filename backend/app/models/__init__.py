@@ -1,13 +1,33 @@
+import os
 from datetime import datetime
 from app import db
+from app.models.types import UUIDString
+from app.utils.fieldsets import nested_include, project, wants_relation
 from flask_bcrypt import Bcrypt
 
 bcrypt = Bcrypt()
 
-class User(db.Model):
+# Opt-in native UUID storage; existing databases must be converted with `flask compact-uuids` first
+COMPACT_UUID_STORAGE = os.environ.get('COMPACT_UUID_STORAGE', 'false').lower() == 'true'
+UUID_TYPE = UUIDString(compact=COMPACT_UUID_STORAGE)
+
+class SerializerMixin:
+    def _serialize(self, attributes, relations=None, fields=None, include=None):
+        """Build a response dict, evaluating only the requested attributes and relationships.
+        
+        Callable attribute values are computed lazily; relationship renderers receive
+        the nested include set so unrequested relationships are never loaded.
+        """
+        data = project(attributes, fields)
+        for key, render in (relations or {}).items():
+            if wants_relation(fields, include, key):
+                data[key] = render(nested_include(include, key))
+        return data
+
+class User(SerializerMixin, db.Model):
     __tablename__ = 'users'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUID_TYPE, primary_key=True, default=lambda: str(uuid.uuid4()))
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
     password_hash = db.Column(db.String(128), nullable=False)
     first_name = db.Column(db.String(50), nullable=False)
@@ -30,8 +50,8 @@ class User(db.Model):
     def check_password(self, password):
         return bcrypt.check_password_hash(self.password_hash, password)
     
-    def to_dict(self):
-        return {
+    def to_dict(self, fields=None, include=None):
+        return self._serialize({
             'id': self.id,
             'email': self.email,
             'firstName': self.first_name,
@@ -39,85 +59,123 @@ class User(db.Model):
             'role': self.role,
             'avatar': self.avatar,
             'isActive': self.is_active,
-            'createdAt': self.created_at.isoformat(),
-            'updatedAt': self.updated_at.isoformat()
-        }
+            'createdAt': self.created_at,
+            'updatedAt': self.updated_at
+        }, fields=fields)
 
-class Course(db.Model):
+class Course(SerializerMixin, db.Model):
     __tablename__ = 'courses'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUID_TYPE, primary_key=True, default=lambda: str(uuid.uuid4()))
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
-    instructor_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    instructor_id = db.Column(UUID_TYPE, db.ForeignKey('users.id'), nullable=False)
     thumbnail = db.Column(db.String(255))
     duration = db.Column(db.Integer, default=0)  # in minutes
     difficulty = db.Column(db.Enum('beginner', 'intermediate', 'advanced', name='course_difficulty'), default='beginner')
     category = db.Column(db.String(100))
     is_published = db.Column(db.Boolean, default=False)
+    enrollment_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Indexes
+    __table_args__ = (db.Index('ix_courses_published_created_id', 'is_published', 'created_at', 'id'),)
+    
     # Relationships
     lessons = db.relationship('Lesson', backref='course', lazy='dynamic', cascade='all, delete-orphan')
     enrollments = db.relationship('Enrollment', backref='course', lazy='dynamic')
     quizzes = db.relationship('Quiz', backref='course', lazy='dynamic')
     progress = db.relationship('Progress', backref='course', lazy='dynamic')
+    counter_shards = db.relationship('CourseCounterShard', lazy='select', cascade='all, delete-orphan')
     
-    def to_dict(self):
-        return {
+    @property
+    def enrolled_students(self):
+        # Hot courses spread increments over shard rows; the total is the base column plus the shards
+        return (self.enrollment_count or 0) + sum(shard.enrollment_delta for shard in self.counter_shards)
+    
+    def to_dict(self, fields=None, include=None, lessons=None):
+        # Catalog pages pass preloaded lessons to avoid per-course queries
+        if lessons is None:
+            lessons = self.lessons.options(*Lesson.outline_options()).order_by(Lesson.order)
+        return self._serialize({
             'id': self.id,
             'title': self.title,
             'description': self.description,
-            'instructor': self.instructor.to_dict() if self.instructor else None,
             'instructorId': self.instructor_id,
             'thumbnail': self.thumbnail,
             'duration': self.duration,
             'difficulty': self.difficulty,
             'category': self.category,
             'isPublished': self.is_published,
-            'enrolledStudents': self.enrollments.count(),
+            'enrolledStudents': lambda: self.enrolled_students,
             'rating': 4.5,  # TODO: Calculate actual rating
-            'lessons': [lesson.to_dict() for lesson in self.lessons],
-            'createdAt': self.created_at.isoformat(),
-            'updatedAt': self.updated_at.isoformat()
-        }
+            'createdAt': self.created_at,
+            'updatedAt': self.updated_at
+        }, {
+            'instructor': lambda nested: self.instructor.to_dict(include=nested) if self.instructor else None,
+            'lessons': lambda nested: [lesson.to_outline() for lesson in lessons],
+        }, fields=fields, include=include)
+
+class CourseCounterShard(db.Model):
+    __tablename__ = 'course_counter_shards'
+    
+    course_id = db.Column(UUID_TYPE, db.ForeignKey('courses.id'), primary_key=True)
+    shard = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    enrollment_delta = db.Column(db.Integer, nullable=False, default=0)
 
-class Lesson(db.Model):
+class Lesson(SerializerMixin, db.Model):
     __tablename__ = 'lessons'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUID_TYPE, primary_key=True, default=lambda: str(uuid.uuid4()))
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
-    content = db.Column(db.Text)
+    # Lesson bodies can be large; only the single-lesson endpoint loads them
+    content = db.deferred(db.Column(db.Text))
     video_url = db.Column(db.String(255))
     duration = db.Column(db.Integer, default=0)  # in minutes
     order = db.Column(db.Integer, default=0)
-    course_id = db.Column(db.String(36), db.ForeignKey('courses.id'), nullable=False)
+    course_id = db.Column(UUID_TYPE, db.ForeignKey('courses.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    def to_dict(self):
-        return {
+    # Indexes
+    __table_args__ = (db.Index('ix_lessons_course_id_order', 'course_id', 'order'),)
+    
+    def to_dict(self, fields=None, include=None):
+        return self._serialize({
             'id': self.id,
             'title': self.title,
             'description': self.description,
-            'content': self.content,
+            'content': lambda: self.content,
             'videoUrl': self.video_url,
             'duration': self.duration,
             'order': self.order,
             'courseId': self.course_id,
-            'createdAt': self.created_at.isoformat(),
-            'updatedAt': self.updated_at.isoformat()
+            'createdAt': self.created_at,
+            'updatedAt': self.updated_at
+        }, fields=fields)
+    
+    def to_outline(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'duration': self.duration,
+            'order': self.order
         }
+    
+    @staticmethod
+    def outline_options():
+        """Loader options restricting a lesson query to the outline columns"""
+        return (db.load_only(Lesson.id, Lesson.course_id, Lesson.title, Lesson.duration, Lesson.order),)
 
-class Quiz(db.Model):
+class Quiz(SerializerMixin, db.Model):
     __tablename__ = 'quizzes'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUID_TYPE, primary_key=True, default=lambda: str(uuid.uuid4()))
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
-    course_id = db.Column(db.String(36), db.ForeignKey('courses.id'), nullable=False)
+    course_id = db.Column(UUID_TYPE, db.ForeignKey('courses.id'), nullable=False)
     scheduled_at = db.Column(db.DateTime)
     duration = db.Column(db.Integer, default=30)  # in minutes
     difficulty = db.Column(db.Enum('easy', 'medium', 'hard', name='quiz_difficulty'), default='medium')
@@ -125,30 +183,35 @@ class Quiz(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Indexes
+    # Upcoming quizzes of a set of courses
+    __table_args__ = (db.Index('ix_quizzes_course_scheduled', 'course_id', 'scheduled_at'),)
+    
     # Relationships
     questions = db.relationship('Question', backref='quiz', lazy='dynamic', cascade='all, delete-orphan')
     attempts = db.relationship('QuizAttempt', backref='quiz', lazy='dynamic')
     
-    def to_dict(self):
-        return {
+    def to_dict(self, fields=None, include=None):
+        return self._serialize({
             'id': self.id,
             'title': self.title,
             'description': self.description,
             'courseId': self.course_id,
-            'course': self.course.to_dict() if self.course else None,
-            'questions': [question.to_dict() for question in self.questions],
-            'scheduledAt': self.scheduled_at.isoformat() if self.scheduled_at else None,
+            'scheduledAt': self.scheduled_at,
             'duration': self.duration,
             'difficulty': self.difficulty,
             'isAiGenerated': self.is_ai_generated,
-            'createdAt': self.created_at.isoformat(),
-            'updatedAt': self.updated_at.isoformat()
-        }
+            'createdAt': self.created_at,
+            'updatedAt': self.updated_at
+        }, {
+            'course': lambda nested: self.course.to_dict(include=nested) if self.course else None,
+            'questions': lambda nested: [question.to_dict() for question in self.questions],
+        }, fields=fields, include=include)
 
-class Question(db.Model):
+class Question(SerializerMixin, db.Model):
     __tablename__ = 'questions'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUID_TYPE, primary_key=True, default=lambda: str(uuid.uuid4()))
     text = db.Column(db.Text, nullable=False)
     type = db.Column(db.Enum('multiple_choice', 'short_answer', 'essay', name='question_type'), nullable=False)
     options = db.Column(db.JSON)  # For multiple choice questions
@@ -156,12 +219,15 @@ class Question(db.Model):
     explanation = db.Column(db.Text)
     difficulty = db.Column(db.Enum('easy', 'medium', 'hard', name='question_difficulty'), default='medium')
     points = db.Column(db.Integer, default=1)
-    quiz_id = db.Column(db.String(36), db.ForeignKey('quizzes.id'), nullable=False)
+    quiz_id = db.Column(UUID_TYPE, db.ForeignKey('quizzes.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    def to_dict(self):
-        return {
+    # Indexes
+    __table_args__ = (db.Index('ix_questions_quiz_id', 'quiz_id'),)
+    
+    def to_dict(self, fields=None, include=None):
+        return self._serialize({
             'id': self.id,
             'text': self.text,
             'type': self.type,
@@ -171,84 +237,95 @@ class Question(db.Model):
             'difficulty': self.difficulty,
             'points': self.points,
             'quizId': self.quiz_id,
-            'createdAt': self.created_at.isoformat(),
-            'updatedAt': self.updated_at.isoformat()
-        }
+            'createdAt': self.created_at,
+            'updatedAt': self.updated_at
+        }, fields=fields)
 
-class QuizAttempt(db.Model):
+class QuizAttempt(SerializerMixin, db.Model):
     __tablename__ = 'quiz_attempts'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
-    quiz_id = db.Column(db.String(36), db.ForeignKey('quizzes.id'), nullable=False)
+    id = db.Column(UUID_TYPE, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = db.Column(UUID_TYPE, db.ForeignKey('users.id'), nullable=False)
+    quiz_id = db.Column(UUID_TYPE, db.ForeignKey('quizzes.id'), nullable=False)
     score = db.Column(db.Float, default=0)
     total_points = db.Column(db.Float, default=0)
     completed_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Indexes
+    __table_args__ = (db.Index('ix_quiz_attempts_user_quiz_completed', 'user_id', 'quiz_id', 'completed_at'),)
+    
     # Relationships
     answers = db.relationship('QuizAnswer', backref='attempt', lazy='dynamic', cascade='all, delete-orphan')
     
-    def to_dict(self):
-        return {
+    def to_dict(self, fields=None, include=None):
+        return self._serialize({
             'id': self.id,
             'userId': self.user_id,
-            'user': self.user.to_dict() if self.user else None,
             'quizId': self.quiz_id,
-            'quiz': self.quiz.to_dict() if self.quiz else None,
-            'answers': [answer.to_dict() for answer in self.answers],
             'score': self.score,
             'totalPoints': self.total_points,
-            'completedAt': self.completed_at.isoformat() if self.completed_at else None,
-            'createdAt': self.created_at.isoformat()
-        }
+            'completedAt': self.completed_at,
+            'createdAt': self.created_at
+        }, {
+            'user': lambda nested: self.user.to_dict(include=nested) if self.user else None,
+            'quiz': lambda nested: self.quiz.to_dict(include=nested) if self.quiz else None,
+            'answers': lambda nested: [answer.to_dict(include=nested) for answer in self.answers],
+        }, fields=fields, include=include)
 
-class QuizAnswer(db.Model):
+class QuizAnswer(SerializerMixin, db.Model):
     __tablename__ = 'quiz_answers'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    question_id = db.Column(db.String(36), db.ForeignKey('questions.id'), nullable=False)
+    id = db.Column(UUID_TYPE, primary_key=True, default=lambda: str(uuid.uuid4()))
+    question_id = db.Column(UUID_TYPE, db.ForeignKey('questions.id'), nullable=False)
     answer = db.Column(db.Text, nullable=False)
     is_correct = db.Column(db.Boolean, default=False)
     points = db.Column(db.Float, default=0)
-    attempt_id = db.Column(db.String(36), db.ForeignKey('quiz_attempts.id'), nullable=False)
+    attempt_id = db.Column(UUID_TYPE, db.ForeignKey('quiz_attempts.id'), nullable=False)
     
-    def to_dict(self):
-        return {
+    # Indexes
+    __table_args__ = (db.Index('ix_quiz_answers_attempt_id', 'attempt_id'),)
+    
+    def to_dict(self, fields=None, include=None):
+        return self._serialize({
             'id': self.id,
             'questionId': self.question_id,
-            'question': self.question.to_dict() if self.question else None,
             'answer': self.answer,
             'isCorrect': self.is_correct,
             'points': self.points,
             'attemptId': self.attempt_id
-        }
+        }, {
+            'question': lambda nested: self.question.to_dict(include=nested) if self.question else None,
+        }, fields=fields, include=include)
 
-class Enrollment(db.Model):
+class Enrollment(SerializerMixin, db.Model):
     __tablename__ = 'enrollments'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
-    course_id = db.Column(db.String(36), db.ForeignKey('courses.id'), nullable=False)
+    id = db.Column(UUID_TYPE, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = db.Column(UUID_TYPE, db.ForeignKey('users.id'), nullable=False)
+    course_id = db.Column(UUID_TYPE, db.ForeignKey('courses.id'), nullable=False)
     enrolled_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    # Unique constraint
-    __table_args__ = (db.UniqueConstraint('user_id', 'course_id', name='unique_enrollment'),)
+    # Unique constraint (also serves user_id lookups) and per-course index
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'course_id', name='unique_enrollment'),
+        db.Index('ix_enrollments_course_id', 'course_id'),
+    )
     
-    def to_dict(self):
-        return {
+    def to_dict(self, fields=None, include=None):
+        return self._serialize({
             'id': self.id,
             'userId': self.user_id,
             'courseId': self.course_id,
-            'enrolledAt': self.enrolled_at.isoformat()
-        }
+            'enrolledAt': self.enrolled_at
+        }, fields=fields)
 
-class Progress(db.Model):
+class Progress(SerializerMixin, db.Model):
     __tablename__ = 'progress'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
-    course_id = db.Column(db.String(36), db.ForeignKey('courses.id'), nullable=False)
+    id = db.Column(UUID_TYPE, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = db.Column(UUID_TYPE, db.ForeignKey('users.id'), nullable=False)
+    course_id = db.Column(UUID_TYPE, db.ForeignKey('courses.id'), nullable=False)
     completed_lessons = db.Column(db.Integer, default=0)
     total_lessons = db.Column(db.Integer, default=0)
     completed_quizzes = db.Column(db.Integer, default=0)
@@ -261,8 +338,8 @@ class Progress(db.Model):
     # Unique constraint
     __table_args__ = (db.UniqueConstraint('user_id', 'course_id', name='unique_progress'),)
     
-    def to_dict(self):
-        return {
+    def to_dict(self, fields=None, include=None):
+        return self._serialize({
             'id': self.id,
             'userId': self.user_id,
             'courseId': self.course_id,
@@ -271,32 +348,102 @@ class Progress(db.Model):
             'completedQuizzes': self.completed_quizzes,
             'totalQuizzes': self.total_quizzes,
             'averageScore': self.average_score,
-            'lastAccessedAt': self.last_accessed_at.isoformat(),
-            'createdAt': self.created_at.isoformat(),
-            'updatedAt': self.updated_at.isoformat()
-        }
+            'lastAccessedAt': self.last_accessed_at,
+            'createdAt': self.created_at,
+            'updatedAt': self.updated_at
+        }, fields=fields)
 
-class LessonCompletion(db.Model):
+class LessonCompletion(SerializerMixin, db.Model):
     __tablename__ = 'lesson_completions'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
-    course_id = db.Column(db.String(36), db.ForeignKey('courses.id'), nullable=False)
-    lesson_id = db.Column(db.String(36), db.ForeignKey('lessons.id'), nullable=False)
+    id = db.Column(UUID_TYPE, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = db.Column(UUID_TYPE, db.ForeignKey('users.id'), nullable=False)
+    course_id = db.Column(UUID_TYPE, db.ForeignKey('courses.id'), nullable=False)
+    lesson_id = db.Column(UUID_TYPE, db.ForeignKey('lessons.id'), nullable=False)
     time_spent_minutes = db.Column(db.Integer, default=0)
     score = db.Column(db.Float)  # quiz score associated with the lesson, if any
     completed_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    def to_dict(self):
-        return {
+    # One completion per lesson and user, plus the recent-completions index
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'lesson_id', name='unique_lesson_completion'),
+        db.Index('ix_lesson_completions_user_completed', 'user_id', 'completed_at'),
+    )
+    
+    def to_dict(self, fields=None, include=None):
+        return self._serialize({
             'id': self.id,
             'userId': self.user_id,
             'courseId': self.course_id,
             'lessonId': self.lesson_id,
             'timeSpentMinutes': self.time_spent_minutes,
             'score': self.score,
-            'completedAt': self.completed_at.isoformat() if self.completed_at else None,
+            'completedAt': self.completed_at,
+        }, fields=fields)
+
+class UserStats(db.Model):
+    """Per-user dashboard counters, kept current by the writes that change them"""
+    __tablename__ = 'user_stats'
+    
+    user_id = db.Column(UUID_TYPE, db.ForeignKey('users.id'), primary_key=True)
+    enrolled_courses = db.Column(db.Integer, nullable=False, default=0)
+    lessons_completed = db.Column(db.Integer, nullable=False, default=0)
+    quizzes_taken = db.Column(db.Integer, nullable=False, default=0)
+    quiz_score_total = db.Column(db.Float, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_metrics(self):
+        return {
+            'enrolledCourses': self.enrolled_courses,
+            'lessonsCompleted': self.lessons_completed,
+            'quizzesTaken': self.quizzes_taken,
+            'averageScore': round(self.quiz_score_total / self.quizzes_taken, 1) if self.quizzes_taken else 0
         }
 
+class LearningEvent(SerializerMixin, db.Model):
+    """Append-only log of learner actions; rows are never updated"""
+    __tablename__ = 'learning_events'
+    
+    id = db.Column(UUID_TYPE, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = db.Column(UUID_TYPE, db.ForeignKey('users.id'), nullable=False)
+    type = db.Column(db.String(32), nullable=False)
+    course_id = db.Column(UUID_TYPE)  # no FK: events outlive the courses they mention
+    subject_id = db.Column(UUID_TYPE)  # lesson or quiz the event is about
+    data = db.Column(db.JSON)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Per-user feed, newest first
+    __table_args__ = (
+        db.Index('ix_learning_events_user_created', 'user_id', created_at.desc(), id.desc()),
+    )
+    
+    def to_dict(self, fields=None, include=None):
+        return self._serialize({
+            'id': self.id,
+            'type': self.type,
+            'courseId': self.course_id,
+            'subjectId': self.subject_id,
+            'data': self.data,
+            'createdAt': self.created_at,
+        }, fields=fields)
+
+class CourseSimilarity(db.Model):
+    """Precomputed nearest neighbours of each course, rebuilt by the recommendation job"""
+    __tablename__ = 'course_similarities'
+    
+    course_id = db.Column(UUID_TYPE, db.ForeignKey('courses.id', ondelete='CASCADE'), primary_key=True)
+    similar_course_id = db.Column(UUID_TYPE, db.ForeignKey('courses.id', ondelete='CASCADE'), primary_key=True)
+    score = db.Column(db.Float, nullable=False)
+    rank = db.Column(db.Integer, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class UserAchievement(db.Model):
+    """A badge a user has earned; codes refer to the rules in achievement_service"""
+    __tablename__ = 'user_achievements'
+    
+    user_id = db.Column(UUID_TYPE, db.ForeignKey('users.id'), primary_key=True)
+    code = db.Column(db.String(64), primary_key=True)
+    earned_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
 # Import uuid at the top
 import uuid
@@ -0,0 +1,59 @@
+import uuid
+
+from sqlalchemy import LargeBinary, String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import TypeDecorator
+
+
+def _as_uuid(value):
+    if isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+class UUIDString(TypeDecorator):
+    """UUID key column that always surfaces as a 36-char string.
+
+    With ``compact=True`` the value is stored natively: ``UUID`` on Postgres and a
+    16-byte BLOB on SQLite. Malformed ids (e.g. a bad path segment) bind as raw
+    bytes on SQLite and as NULL on Postgres, so lookups simply find nothing
+    instead of raising a DataError and aborting the transaction.
+    """
+
+    impl = String(36)
+    cache_ok = True
+
+    def __init__(self, compact=False):
+        super().__init__()
+        self.compact = compact
+
+    def load_dialect_impl(self, dialect):
+        if self.compact and dialect.name == 'postgresql':
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        if self.compact and dialect.name == 'sqlite':
+            return dialect.type_descriptor(LargeBinary(16))
+        return dialect.type_descriptor(String(36))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or not self.compact:
+            return value
+        parsed = _as_uuid(value)
+        if dialect.name == 'sqlite':
+            return parsed.bytes if parsed else str(value).encode('utf-8')
+        if parsed is None:
+            return None
+        return str(parsed)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return value
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            value = bytes(value)
+            if len(value) == 16:
+                return str(uuid.UUID(bytes=value))
+            # a malformed id that was stored as its raw text
+            return value.decode('utf-8', errors='replace')
+        return str(value)
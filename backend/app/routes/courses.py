@@ -1,31 +1,96 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models import Course, Lesson, Enrollment, Progress, User, db, LessonCompletion
-from app.services.course_service import CourseService
-from app.utils.decorators import validate_json, admin_required
+from app.models import Course, Lesson, Progress, User, db
+from app.services.facet_index import get_facet_index
+from app.services.course_service import CourseService, MAX_BULK_ENROLLMENT, MAX_LESSON_IMPORT, catalog_cache_tag, course_cache_tag
+from app.utils.decorators import validate_json, admin_required, cache_response, conditional_get
+from app.utils.fieldsets import parse_fieldset
 
 courses_bp = Blueprint('courses', __name__)
 course_service = CourseService()
 
+def _catalog_tags(view_args, query_args, payload):
+    items = payload['data']['items']
+    return [catalog_cache_tag(query_args.get('category'), query_args.get('difficulty'))] + [
+        course_cache_tag(item['id']) for item in items
+    ]
+
+def _course_tags(view_args, query_args, payload):
+    return [course_cache_tag(view_args['course_id'])]
+
 @courses_bp.route('/', methods=['GET'])
+@cache_response(tags=_catalog_tags)
 def get_courses():
     try:
         page = request.args.get('page', 1, type=int)
         limit = request.args.get('limit', 10, type=int)
         category = request.args.get('category')
         difficulty = request.args.get('difficulty')
-        
-        courses = course_service.get_courses(page, limit, category, difficulty)
+        fields = parse_fieldset(request.args.get('fields'))
+        include = parse_fieldset(request.args.get('include'))
+        cursor = request.args.get('cursor')
+        
+        # Any `cursor` parameter (empty for the first page) switches to keyset pagination
+        if cursor is not None:
+            courses = course_service.get_courses_keyset(
+                limit, cursor, category, difficulty, fields, include, request.args.get('count')
+            )
+        else:
+            courses = course_service.get_courses(page, limit, category, difficulty, fields, include)
         
         return jsonify({
             'success': True,
             'data': courses
         }), 200
         
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': str(e)}), 500
+
+@courses_bp.route('/search', methods=['GET'])
+def search_courses():
+    try:
+        query = (request.args.get('q') or '').strip()
+        if not query:
+            return jsonify({'message': 'Search query is required'}), 400
+        
+        page = request.args.get('page', 1, type=int)
+        limit = request.args.get('limit', 10, type=int)
+        fields = parse_fieldset(request.args.get('fields'))
+        include = parse_fieldset(request.args.get('include'))
+        
+        results = course_service.search_courses(query, page, limit, fields, include)
+        
+        return jsonify({
+            'success': True,
+            'data': results
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': str(e)}), 500
+
+@courses_bp.route('/facets', methods=['GET'])
+def get_course_facets():
+    try:
+        counts = get_facet_index().counts(
+            category=request.args.get('category'),
+            difficulty=request.args.get('difficulty'),
+        )
+        
+        return jsonify({
+            'success': True,
+            'data': counts
+        }), 200
+        
     except Exception as e:
+        db.session.rollback()
         return jsonify({'message': str(e)}), 500
 
 @courses_bp.route('/<course_id>', methods=['GET'])
+@conditional_get(course_service.get_course_version)
+@cache_response(tags=_course_tags)
 def get_course(course_id):
     try:
         course = course_service.get_course_by_id(course_id)
@@ -40,23 +105,78 @@ def get_course(course_id):
     except Exception as e:
         return jsonify({'message': str(e)}), 500
 
+@courses_bp.route('/<course_id>/lessons/<lesson_id>', methods=['GET'])
+def get_lesson(course_id, lesson_id):
+    try:
+        lesson = course_service.get_lesson(course_id, lesson_id)
+        if not lesson:
+            return jsonify({'message': 'Lesson not found'}), 404
+        
+        return jsonify({
+            'success': True,
+            'data': lesson.to_dict()
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'message': str(e)}), 500
+
 @courses_bp.route('/<course_id>/enroll', methods=['POST'])
 @jwt_required()
 def enroll_in_course(course_id):
     try:
         user_id = get_jwt_identity()
         
-        # Check if user is already enrolled
-        enrollment = Enrollment.query.filter_by(user_id=user_id, course_id=course_id).first()
-        if enrollment:
+        # The insert itself tells us whether the user was already enrolled
+        result = course_service.enroll_users(course_id, [user_id])
+        if result is None:
+            return jsonify({'message': 'Course not found'}), 404
+        if result['unknownUsers']:
+            return jsonify({'message': 'User not found'}), 404
+        if not result['enrolled']:
             return jsonify({'message': 'Already enrolled in this course'}), 400
         
-        # Enroll user
-        success = course_service.enroll_user(user_id, course_id)
-        if not success:
+        return jsonify({'message': 'Enrolled successfully'}), 200
+        
+    except Exception as e:
+        return jsonify({'message': str(e)}), 500
+
+@courses_bp.route('/<course_id>/enrollments/bulk', methods=['POST'])
+@jwt_required()
+@admin_required
+@validate_json(['userIds'])
+def bulk_enroll(course_id):
+    try:
+        user_ids = request.get_json()['userIds']
+        
+        if not isinstance(user_ids, list) or not all(isinstance(u, str) for u in user_ids):
+            return jsonify({'message': 'userIds must be an array of strings'}), 400
+        if len(user_ids) > MAX_BULK_ENROLLMENT:
+            return jsonify({'message': f'At most {MAX_BULK_ENROLLMENT} users can be enrolled at once'}), 400
+        
+        result = course_service.enroll_users(course_id, user_ids)
+        if result is None:
             return jsonify({'message': 'Course not found'}), 404
         
-        return jsonify({'message': 'Enrolled successfully'}), 200
+        return jsonify({
+            'success': True,
+            'data': result
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': str(e)}), 500
+
+@courses_bp.route('/<course_id>/enroll', methods=['DELETE'])
+@jwt_required()
+def unenroll_from_course(course_id):
+    try:
+        user_id = get_jwt_identity()
+        
+        success = course_service.unenroll_user(user_id, course_id)
+        if not success:
+            return jsonify({'message': 'Not enrolled in this course'}), 404
+        
+        return jsonify({'message': 'Unenrolled successfully'}), 200
         
     except Exception as e:
         return jsonify({'message': str(e)}), 500
@@ -85,25 +205,18 @@ def mark_lesson_complete(course_id, lesson_id):
     try:
         user_id = get_jwt_identity()
         
-        success = course_service.mark_lesson_complete(user_id, course_id, lesson_id)
-        if not success:
-            return jsonify({'message': 'Lesson not found'}), 404
-        
-        # Persist granular completion
         data = request.get_json(silent=True) or {}
-        time_spent = int(data.get('timeSpentMinutes') or 0)
-        score = data.get('score')
-        lc = LessonCompletion(
-            user_id=user_id,
-            course_id=course_id,
-            lesson_id=lesson_id,
-            time_spent_minutes=time_spent,
-            score=score
+        completion = course_service.complete_lesson(
+            user_id,
+            course_id,
+            lesson_id,
+            time_spent_minutes=int(data.get('timeSpentMinutes') or 0),
+            score=data.get('score')
         )
-        db.session.add(lc)
-        db.session.commit()
-
-        return jsonify({'message': 'Lesson marked as complete', 'data': lc.to_dict()}), 200
+        if not completion:
+            return jsonify({'message': 'Lesson not found'}), 404
+        
+        return jsonify({'message': 'Lesson marked as complete', 'data': completion.to_dict()}), 200
         
     except Exception as e:
         return jsonify({'message': str(e)}), 500
@@ -184,6 +297,33 @@ def create_lesson(course_id):
     except Exception as e:
         return jsonify({'message': str(e)}), 500
 
+@courses_bp.route('/<course_id>/lessons/bulk', methods=['POST'])
+@jwt_required()
+@admin_required
+@validate_json(['lessons'])
+def import_lessons(course_id):
+    try:
+        user_id = get_jwt_identity()
+        lessons = request.get_json()['lessons']
+        
+        if not isinstance(lessons, list):
+            return jsonify({'message': 'lessons must be an array'}), 400
+        if len(lessons) > MAX_LESSON_IMPORT:
+            return jsonify({'message': f'At most {MAX_LESSON_IMPORT} lessons can be imported at once'}), 400
+        
+        result = course_service.import_lessons(user_id, course_id, lessons)
+        if result is None:
+            return jsonify({'message': 'Course not found'}), 404
+        
+        return jsonify({
+            'success': bool(result['created']),
+            'data': result
+        }), 201 if result['created'] else 400
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': str(e)}), 500
+
 @courses_bp.route('/<course_id>/lessons/<lesson_id>', methods=['PUT'])
 @jwt_required()
 @admin_required
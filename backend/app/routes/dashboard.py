@@ -1,19 +1,42 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import Course, Quiz, Enrollment, Progress, User, db
-from app.services.dashboard_service import DashboardService
+from app.services.dashboard_service import DashboardService, SUMMARY_SECTIONS
 from app.utils.decorators import validate_json
+from app.utils.fieldsets import parse_fieldset, project, project_all
 
 dashboard_bp = Blueprint('dashboard', __name__)
 dashboard_service = DashboardService()
 
+@dashboard_bp.route('/summary', methods=['GET'])
+@jwt_required()
+def get_dashboard_summary():
+    try:
+        user_id = get_jwt_identity()
+        sections = parse_fieldset(request.args.get('sections'))
+        
+        unknown = sorted((sections or set()) - set(SUMMARY_SECTIONS))
+        if unknown:
+            return jsonify({'message': f"Unknown sections: {', '.join(unknown)}"}), 400
+        
+        summary = dashboard_service.get_summary(user_id, sections)
+        
+        return jsonify({
+            'success': True,
+            **summary
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'message': str(e)}), 500
+
 @dashboard_bp.route('/metrics', methods=['GET'])
 @jwt_required()
 def get_dashboard_metrics():
     try:
         user_id = get_jwt_identity()
+        fields = parse_fieldset(request.args.get('fields'))
         
-        metrics = dashboard_service.get_user_metrics(user_id)
+        metrics = project(dashboard_service.get_user_metrics(user_id), fields)
         
         return jsonify({
             'success': True,
@@ -28,8 +51,9 @@ def get_dashboard_metrics():
 def get_student_courses():
     try:
         user_id = get_jwt_identity()
+        fields = parse_fieldset(request.args.get('fields'))
         
-        courses = dashboard_service.get_user_courses(user_id)
+        courses = dashboard_service.get_user_courses(user_id, fields)
         
         return jsonify({
             'success': True,
@@ -44,8 +68,9 @@ def get_student_courses():
 def get_upcoming_quizzes():
     try:
         user_id = get_jwt_identity()
+        fields = parse_fieldset(request.args.get('fields'))
         
-        quizzes = dashboard_service.get_upcoming_quizzes(user_id)
+        quizzes = project_all(dashboard_service.get_upcoming_quizzes(user_id), fields)
         
         return jsonify({
             'success': True,
@@ -60,8 +85,9 @@ def get_upcoming_quizzes():
 def get_user_progress():
     try:
         user_id = get_jwt_identity()
+        fields = parse_fieldset(request.args.get('fields'))
         
-        progress = dashboard_service.get_user_progress(user_id)
+        progress = dashboard_service.get_user_progress(user_id, fields)
         
         return jsonify({
             'success': True,
@@ -76,14 +102,20 @@ def get_user_progress():
 def get_recent_activity():
     try:
         user_id = get_jwt_identity()
+        fields = parse_fieldset(request.args.get('fields'))
+        
+        limit = request.args.get('limit', 10, type=int)
+        cursor = request.args.get('cursor')
         
-        activity = dashboard_service.get_recent_activity(user_id)
+        activity = dashboard_service.get_recent_activity(user_id, limit, cursor, fields)
         
         return jsonify({
             'success': True,
             'data': activity
         }), 200
         
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': str(e)}), 500
 
@@ -92,8 +124,9 @@ def get_recent_activity():
 def get_achievements():
     try:
         user_id = get_jwt_identity()
+        fields = parse_fieldset(request.args.get('fields'))
         
-        achievements = dashboard_service.get_user_achievements(user_id)
+        achievements = project_all(dashboard_service.get_user_achievements(user_id), fields)
         
         return jsonify({
             'success': True,
@@ -108,8 +141,9 @@ def get_achievements():
 def get_recommendations():
     try:
         user_id = get_jwt_identity()
+        fields = parse_fieldset(request.args.get('fields'))
         
-        recommendations = dashboard_service.get_course_recommendations(user_id)
+        recommendations = project_all(dashboard_service.get_course_recommendations(user_id), fields)
         
         return jsonify({
             'success': True,
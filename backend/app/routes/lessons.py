@@ -1,10 +1,13 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.analytics_service import AnalyticsService
+from app.services.course_service import CourseService, MAX_SYNC_EVENTS
 from app.models import db
+from app.utils.decorators import validate_json
 
 lessons_bp = Blueprint('lessons', __name__)
 analytics_service = AnalyticsService()
+course_service = CourseService()
 
 @lessons_bp.route('/completed/summary', methods=['GET'])
 @jwt_required()
@@ -27,3 +30,21 @@ def completed_lessons_list():
     except Exception as e:
         db.session.rollback()
         return jsonify({'message': str(e)}), 500
+
+@lessons_bp.route('/sync', methods=['POST'])
+@jwt_required()
+@validate_json(['events'])
+def sync_completions():
+    try:
+        user_id = get_jwt_identity()
+        events = request.get_json()['events']
+        if not isinstance(events, list):
+            return jsonify({'message': 'events must be an array'}), 400
+        if len(events) > MAX_SYNC_EVENTS:
+            return jsonify({'message': f'At most {MAX_SYNC_EVENTS} events can be synced at once'}), 400
+        
+        result = course_service.sync_lesson_completions(user_id, events)
+        return jsonify({'success': True, 'data': result}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': str(e)}), 500
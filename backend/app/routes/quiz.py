@@ -2,7 +2,10 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import Quiz, Question, QuizAttempt, QuizAnswer, Course, db
 from app.services.quiz_service import QuizService
-from app.utils.decorators import validate_json
+from app.utils.decorators import validate_json, conditional_get
+from app.utils.fieldsets import parse_fieldset
+from app.utils.validators import parse_iso_datetime
+from datetime import timezone
 
 quiz_bp = Blueprint('quiz', __name__)
 quiz_service = QuizService()
@@ -34,12 +37,49 @@ def generate_quiz():
 
 @quiz_bp.route('/<quiz_id>', methods=['GET'])
 @jwt_required()
+@conditional_get(quiz_service.get_quiz_version)
 def get_quiz(quiz_id):
     try:
         quiz = quiz_service.get_quiz_by_id(quiz_id)
         if not quiz:
             return jsonify({'message': 'Quiz not found'}), 404
         
+        fields = parse_fieldset(request.args.get('fields'))
+        include = parse_fieldset(request.args.get('include'))
+        
+        return jsonify({
+            'success': True,
+            'data': quiz.to_dict(fields=fields, include=include)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'message': str(e)}), 500
+
+@quiz_bp.route('/<quiz_id>/schedule', methods=['PUT'])
+@jwt_required()
+@validate_json([])
+def schedule_quiz(quiz_id):
+    try:
+        user_id = get_jwt_identity()
+        data = request.get_json()
+        # null is allowed and unschedules the quiz, so check presence rather than truthiness
+        if 'scheduledAt' not in data:
+            return jsonify({'message': 'Missing required fields: scheduledAt'}), 400
+        value = data['scheduledAt']
+        
+        scheduled_at = None
+        if value is not None:
+            try:
+                scheduled_at = parse_iso_datetime(value)
+            except (TypeError, ValueError):
+                return jsonify({'message': 'scheduledAt must be an ISO 8601 timestamp'}), 400
+            if scheduled_at.tzinfo is not None:
+                scheduled_at = scheduled_at.astimezone(timezone.utc).replace(tzinfo=None)
+        
+        quiz = quiz_service.schedule_quiz(user_id, quiz_id, scheduled_at)
+        if not quiz:
+            return jsonify({'message': 'Quiz not found'}), 404
+        
         return jsonify({
             'success': True,
             'data': quiz.to_dict()
@@ -73,8 +113,10 @@ def submit_quiz(quiz_id):
 def get_quiz_attempts(quiz_id):
     try:
         user_id = get_jwt_identity()
+        fields = parse_fieldset(request.args.get('fields'))
+        include = parse_fieldset(request.args.get('include'))
         
-        attempts = quiz_service.get_user_attempts(user_id, quiz_id)
+        attempts = quiz_service.get_user_attempts(user_id, quiz_id, fields, include)
         
         return jsonify({
             'success': True,
@@ -90,13 +132,13 @@ def get_quiz_attempt(quiz_id, attempt_id):
     try:
         user_id = get_jwt_identity()
         
-        attempt = quiz_service.get_attempt_by_id(user_id, attempt_id)
+        attempt = quiz_service.get_attempt_review(user_id, quiz_id, attempt_id)
         if not attempt:
             return jsonify({'message': 'Attempt not found'}), 404
         
         return jsonify({
             'success': True,
-            'data': attempt.to_dict()
+            'data': attempt
         }), 200
         
     except Exception as e:
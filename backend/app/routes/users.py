@@ -2,13 +2,15 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import User, db
 from app.services.user_service import UserService
-from app.utils.decorators import validate_json
+from app.utils.decorators import validate_json, conditional_get
+from app.utils.fieldsets import parse_fieldset
 
 users_bp = Blueprint('users', __name__)
 user_service = UserService()
 
 @users_bp.route('/profile', methods=['GET'])
 @jwt_required()
+@conditional_get(lambda: user_service.get_profile_version(get_jwt_identity()))
 def get_profile():
     try:
         user_id = get_jwt_identity()
@@ -161,12 +163,18 @@ def get_user_activity():
     try:
         user_id = get_jwt_identity()
         
-        activity = user_service.get_user_activity(user_id)
+        limit = request.args.get('limit', 20, type=int)
+        cursor = request.args.get('cursor')
+        fields = parse_fieldset(request.args.get('fields'))
+        
+        activity = user_service.get_user_activity(user_id, limit, cursor, fields)
         
         return jsonify({
             'success': True,
             'data': activity
         }), 200
         
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': str(e)}), 500
@@ -0,0 +1,150 @@
+"""Badges awarded from learning events.
+
+Rules are declarative. Each one names the event type that can trigger it and
+a condition:
+
+- ``count``: a counter in the user's stats snapshot reaches ``at_least``
+- ``quiz_score``: a submitted attempt scores at least ``at_least``
+- ``course_completed``: every lesson of the event's course is complete
+
+The engine subscribes to the activity log and evaluates a flushed batch with
+a few set-based queries. It only checks rules the batch's event types can
+trigger and the users haven't earned yet. Earned badges are stored in
+``user_achievements``, so reading them is one primary-key range scan.
+"""
+from datetime import datetime
+
+from sqlalchemy import func, select, tuple_
+
+from app import db
+from app.models import Lesson, Progress, QuizAttempt, UserAchievement, UserStats
+from app.services.activity_service import ENROLLED, LESSON_COMPLETED, QUIZ_SUBMITTED
+from app.utils.upsert import insert_ignoring_conflicts
+
+ACHIEVEMENTS = [
+    {'code': 'first_enrollment', 'title': 'Getting Started', 'description': 'Enroll in your first course',
+     'on': ENROLLED, 'rule': {'count': 'enrolled_courses', 'at_least': 1}},
+    {'code': 'explorer', 'title': 'Explorer', 'description': 'Enroll in 5 courses',
+     'on': ENROLLED, 'rule': {'count': 'enrolled_courses', 'at_least': 5}},
+    {'code': 'first_lesson', 'title': 'First Steps', 'description': 'Complete your first lesson',
+     'on': LESSON_COMPLETED, 'rule': {'count': 'lessons_completed', 'at_least': 1}},
+    {'code': 'lessons_10', 'title': 'Dedicated Learner', 'description': 'Complete 10 lessons',
+     'on': LESSON_COMPLETED, 'rule': {'count': 'lessons_completed', 'at_least': 10}},
+    {'code': 'lessons_50', 'title': 'Knowledge Seeker', 'description': 'Complete 50 lessons',
+     'on': LESSON_COMPLETED, 'rule': {'count': 'lessons_completed', 'at_least': 50}},
+    {'code': 'course_complete', 'title': 'Finisher', 'description': 'Complete every lesson of a course',
+     'on': LESSON_COMPLETED, 'rule': {'course_completed': True}},
+    {'code': 'perfect_quiz', 'title': 'Perfectionist', 'description': 'Score 100% on a quiz',
+     'on': QUIZ_SUBMITTED, 'rule': {'quiz_score': True, 'at_least': 100}},
+]
+
+ACHIEVEMENTS_BY_CODE = {achievement['code']: achievement for achievement in ACHIEVEMENTS}
+TRIGGERS = {achievement['on'] for achievement in ACHIEVEMENTS}
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def init_achievements(app):
+    app.extensions['activity_log'].subscribe(AchievementService().process)
+
+
+class AchievementService:
+    def get_user_achievements(self, user_id):
+        """Earned badges, newest first"""
+        earned = db.session.execute(
+            select(UserAchievement.code, UserAchievement.earned_at)
+            .where(UserAchievement.user_id == user_id)
+        ).all()
+        badges = [{
+            'id': code,
+            'title': ACHIEVEMENTS_BY_CODE[code]['title'],
+            'description': ACHIEVEMENTS_BY_CODE[code]['description'],
+            'earnedAt': earned_at
+        } for code, earned_at in earned if code in ACHIEVEMENTS_BY_CODE]
+        return sorted(badges, key=lambda badge: (badge['earnedAt'], badge['id']), reverse=True)
+
+    def process(self, events):
+        """Evaluate the rules a batch of events can trigger; returns the awarded (user_id, code) pairs"""
+        events = [event for event in events if event['type'] in TRIGGERS]
+        if not events:
+            return []
+        user_ids = list({event['user_id'] for event in events})
+
+        earned = set(db.session.execute(
+            select(UserAchievement.user_id, UserAchievement.code).where(UserAchievement.user_id.in_(user_ids))
+        ).all())
+        # (user, rule) pairs still open for this batch
+        candidates = {
+            (event['user_id'], a['code']): a for event in events for a in ACHIEVEMENTS
+            if a['on'] == event['type'] and (event['user_id'], a['code']) not in earned
+        }
+        if not candidates:
+            return []
+
+        stats = {}
+        if any('count' in a['rule'] for a in candidates.values()):
+            stats = {row.user_id: row for row in UserStats.query.filter(
+                UserStats.user_id.in_(list({user_id for user_id, _ in candidates})))}
+        completed_courses = self._completed_courses({
+            (event['user_id'], event['course_id']) for event in events
+            if event['type'] == LESSON_COMPLETED and (event['user_id'], 'course_complete') in candidates
+        })
+
+        awards = set()
+        for event in events:
+            for a in ACHIEVEMENTS:
+                key = (event['user_id'], a['code'])
+                if key in candidates and key not in awards and self._satisfied(a['rule'], event, stats, completed_courses):
+                    awards.add(key)
+
+        if awards:
+            now = datetime.utcnow()
+            db.session.execute(insert_ignoring_conflicts(UserAchievement, [
+                {'user_id': user_id, 'code': code, 'earned_at': now} for user_id, code in sorted(awards)
+            ], ['user_id', 'code']))
+            db.session.commit()
+        return sorted(awards)
+
+    def backfill(self):
+        """Award badges for history recorded before the engine existed (or missed by it); returns awards"""
+        awarded = 0
+        user_ids = db.session.scalars(select(UserStats.user_id).order_by(UserStats.user_id)).all()
+        for start in range(0, len(user_ids), BACKFILL_BATCH_SIZE):
+            batch = user_ids[start:start + BACKFILL_BATCH_SIZE]
+            # Replay one synthetic event per fact the rules look at
+            events = [{'user_id': user_id, 'type': ENROLLED} for user_id in batch]
+            events += [{'user_id': user_id, 'type': LESSON_COMPLETED, 'course_id': course_id}
+                       for user_id, course_id in db.session.execute(
+                           select(Progress.user_id, Progress.course_id)
+                           .where(Progress.user_id.in_(batch), Progress.completed_lessons > 0))]
+            events += [{'user_id': user_id, 'type': QUIZ_SUBMITTED, 'data': {'score': score}}
+                       for user_id, score in db.session.execute(
+                           select(QuizAttempt.user_id, func.max(QuizAttempt.score))
+                           .where(QuizAttempt.user_id.in_(batch)).group_by(QuizAttempt.user_id))]
+            awarded += len(self.process(events))
+        return awarded
+
+    @staticmethod
+    def _satisfied(rule, event, stats, completed_courses):
+        if 'count' in rule:
+            snapshot = stats.get(event['user_id'])
+            return snapshot is not None and getattr(snapshot, rule['count']) >= rule['at_least']
+        if 'quiz_score' in rule:
+            return ((event.get('data') or {}).get('score') or 0) >= rule['at_least']
+        if 'course_completed' in rule:
+            return (event['user_id'], event.get('course_id')) in completed_courses
+        return False
+
+    @staticmethod
+    def _completed_courses(pairs):
+        """(user_id, course_id) pairs whose progress covers every lesson of the course"""
+        if not pairs:
+            return set()
+        lesson_count = select(func.count(Lesson.id)).where(Lesson.course_id == Progress.course_id).scalar_subquery()
+        return set(db.session.execute(
+            select(Progress.user_id, Progress.course_id).where(
+                tuple_(Progress.user_id, Progress.course_id).in_(list(pairs)),
+                lesson_count > 0,
+                Progress.completed_lessons >= lesson_count,
+            )
+        ).all())
@@ -0,0 +1,163 @@
+"""Learning-event log behind the activity feeds.
+
+Services call ``get_activity_log().record(...)`` after their transaction
+commits. Events are buffered in memory and a background thread writes them
+in batches with a single multi-row INSERT, so recording never adds a
+statement to the request. Subscribers, such as the achievements engine, get
+each batch after it is written. The log is best-effort: events still buffered
+when a process is killed are lost, and a failed batch is logged and dropped.
+"""
+import atexit
+import base64
+import json
+import logging
+import threading
+import uuid
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import insert, tuple_
+
+from app import db
+from app.models import LearningEvent
+
+logger = logging.getLogger(__name__)
+
+ENROLLED = 'enrolled'
+LESSON_COMPLETED = 'lesson_completed'
+QUIZ_SUBMITTED = 'quiz_submitted'
+PROFILE_UPDATED = 'profile_updated'
+
+MAX_ACTIVITY_LIMIT = 100
+
+
+class ActivityLog:
+    def __init__(self, app, batch_size=500, flush_interval=1.0, max_buffer=50000):
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._subscribers = []
+
+    def subscribe(self, handler):
+        """Call handler(events) with every batch after it is written"""
+        self._subscribers.append(handler)
+
+    def record(self, user_id, type, course_id=None, subject_id=None, data=None):
+        self.record_many([{'user_id': user_id, 'type': type, 'course_id': course_id,
+                           'subject_id': subject_id, 'data': data}])
+
+    def record_many(self, events):
+        """Queue events for the next batch; never touches the database"""
+        now = datetime.utcnow()
+        rows = [{'id': str(uuid.uuid4()), 'course_id': None, 'subject_id': None, 'data': None,
+                 'created_at': now, **event} for event in events]
+        with self._lock:
+            self._buffer.extend(rows)
+            dropped = len(self._buffer) - self.max_buffer
+            if dropped > 0:
+                # The database is not keeping up; shed the oldest events instead of growing forever
+                del self._buffer[:dropped]
+                logger.warning('Activity log buffer full, dropped %d events', dropped)
+            full = len(self._buffer) >= self.batch_size
+        self._ensure_flusher()
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        """Write every buffered event; returns how many were written"""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+            with self.app.app_context():
+                try:
+                    # render_nulls keeps rows with empty optional columns in the same batch
+                    statement = insert(LearningEvent).execution_options(render_nulls=True)
+                    for start in range(0, len(rows), self.batch_size):
+                        db.session.execute(statement, rows[start:start + self.batch_size])
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    logger.exception('Dropped %d activity events', len(rows))
+                    return 0
+                for handler in self._subscribers:
+                    try:
+                        handler(rows)
+                    except Exception:
+                        db.session.rollback()
+                        logger.exception('Activity subscriber %r failed', handler)
+            return len(rows)
+
+    def pending(self):
+        with self._lock:
+            return len(self._buffer)
+
+    def _ensure_flusher(self):
+        # Started on first use so CLI commands and migrations don't spawn threads;
+        # a zero interval disables background writes (callers flush explicitly)
+        if self._thread is not None or not self.flush_interval:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='activity-log', daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+def init_activity_log(app):
+    app.extensions['activity_log'] = ActivityLog(
+        app,
+        batch_size=app.config.get('ACTIVITY_LOG_BATCH_SIZE', 500),
+        flush_interval=app.config.get('ACTIVITY_LOG_FLUSH_INTERVAL', 1.0),
+    )
+
+
+def get_activity_log():
+    return current_app.extensions['activity_log']
+
+
+class ActivityService:
+    def get_user_activity(self, user_id, limit=20, cursor=None, fields=None):
+        """A page of the user's events, newest first, after an opaque cursor"""
+        limit = max(1, min(limit, MAX_ACTIVITY_LIMIT))
+        query = LearningEvent.query.filter_by(user_id=user_id)
+
+        if cursor:
+            created_at, event_id = self._decode_cursor(cursor)
+            query = query.filter(tuple_(LearningEvent.created_at, LearningEvent.id) < tuple_(created_at, event_id))
+
+        rows = query.order_by(LearningEvent.created_at.desc(), LearningEvent.id.desc()).limit(limit + 1).all()
+        events = rows[:limit]
+
+        return {
+            'items': [event.to_dict(fields=fields) for event in events],
+            'limit': limit,
+            'nextCursor': self._encode_cursor(events[-1]) if len(rows) > limit else None
+        }
+
+    @staticmethod
+    def _encode_cursor(event):
+        payload = json.dumps([event.created_at.isoformat(), event.id]).encode('utf-8')
+        return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def _decode_cursor(cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            created_at, event_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            return datetime.fromisoformat(created_at), event_id
+        except (ValueError, TypeError, UnicodeError):
+            raise ValueError('Invalid cursor')
@@ -1,26 +1,29 @@
 from typing import Dict, List
-from sqlalchemy import func
+from sqlalchemy import case, func, true
 from datetime import datetime
 from app.models import LessonCompletion, Progress, Course, Lesson, Enrollment, db
 
 class AnalyticsService:
     def completed_lessons_summary(self, user_id: str) -> Dict:
-        total_completed = db.session.query(func.count(LessonCompletion.id)) \
-            .filter(LessonCompletion.user_id == user_id).scalar() or 0
+        # Both tables are aggregated to one row each and joined, so the summary is a single round-trip
+        completions = db.session.query(
+            func.count(LessonCompletion.id).label('total'),
+            func.avg(LessonCompletion.score).label('avg_score'),
+            func.coalesce(func.sum(LessonCompletion.time_spent_minutes), 0).label('minutes'),
+        ).filter(LessonCompletion.user_id == user_id).subquery()
+        progress = db.session.query(
+            func.coalesce(func.sum(Progress.completed_lessons), 0).label('total'),
+            func.coalesce(func.avg(Progress.average_score), 0).label('avg_score'),
+        ).filter(Progress.user_id == user_id).subquery()
 
-        # If no granular completions recorded yet, fall back to Progress sum
-        if total_completed == 0:
-            total_completed = db.session.query(func.coalesce(func.sum(Progress.completed_lessons), 0)) \
-                .filter(Progress.user_id == user_id).scalar() or 0
+        # If no granular completions recorded yet, fall back to Progress
+        row = db.session.query(
+            case((completions.c.total > 0, completions.c.total), else_=progress.c.total),
+            func.coalesce(completions.c.avg_score, progress.c.avg_score),
+            completions.c.minutes,
+        ).select_from(completions).outerjoin(progress, true()).one()
+        total_completed, avg_score, total_minutes = (value or 0 for value in row)
 
-        avg_score = db.session.query(func.avg(LessonCompletion.score)) \
-            .filter(LessonCompletion.user_id == user_id, LessonCompletion.score.isnot(None)).scalar()
-        if avg_score is None:
-            avg_score = db.session.query(func.coalesce(func.avg(Progress.average_score), 0)) \
-                .filter(Progress.user_id == user_id).scalar() or 0
-
-        total_minutes = db.session.query(func.coalesce(func.sum(LessonCompletion.time_spent_minutes), 0)) \
-            .filter(LessonCompletion.user_id == user_id).scalar() or 0
         # Heuristic if not tracked
         if total_minutes == 0 and total_completed:
             total_minutes = int(total_completed * 18)
@@ -1,17 +1,59 @@
-from app.models import Course, Lesson, Enrollment, Progress, User, db
-from sqlalchemy import func
+from app.models import Course, CourseCounterShard, Lesson, LessonCompletion, Quiz, Enrollment, Progress, User, db
+from app.services.activity_service import ENROLLED, LESSON_COMPLETED, get_activity_log
+from app.services.dashboard_service import quiz_feed_user_tag, upcoming_quizzes_cache_tag
+from app.services.facet_index import get_facet_index
+from app.services.search_index import SearchIndex
+from app.services.user_stats_service import UserStatsService
+from app.utils.cache import get_cache
+from app.utils.fieldsets import wants, wants_relation
+from app.utils.upsert import insert_ignoring_conflicts
+from app.utils.validators import parse_iso_datetime, validate_completion_event, validate_lesson_data
+from flask import current_app
+from sqlalchemy import case, func, insert, select, text, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload, undefer
+import base64
+import json
+import random
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
+
+MAX_LESSON_IMPORT = 1000
+MAX_BULK_ENROLLMENT = 10000
+MAX_SYNC_EVENTS = 500
+ENROLLMENT_BATCH_SIZE = 1000
+
+def catalog_cache_tag(category=None, difficulty=None):
+    """Tag for cached catalog pages listed under a category/difficulty filter"""
+    return f'catalog:{category or "*"}:{difficulty or "*"}'
+
+def course_cache_tag(course_id):
+    """Tag for cached responses that embed a course"""
+    return f'course:{course_id}'
+
+def course_version_columns():
+    """Version columns correlated with Course: lessons, enrollment counter and shards, instructor"""
+    lessons = select(Lesson).where(Lesson.course_id == Course.id)
+    # Enrollment changes bypass Course.updated_at, so the counter itself is part of the version
+    shard_deltas = select(func.coalesce(func.sum(CourseCounterShard.enrollment_delta), 0)) \
+        .where(CourseCounterShard.course_id == Course.id)
+    return [
+        Course.updated_at,
+        lessons.with_only_columns(func.count(Lesson.id)).scalar_subquery(),
+        lessons.with_only_columns(func.max(Lesson.updated_at)).scalar_subquery(),
+        Course.enrollment_count,
+        shard_deltas.scalar_subquery(),
+        select(User.updated_at).where(User.id == Course.instructor_id).scalar_subquery(),
+    ]
 
 class CourseService:
-    def get_courses(self, page=1, limit=10, category=None, difficulty=None):
+    def __init__(self):
+        self.search_index = SearchIndex()
+        self.user_stats = UserStatsService()
+    
+    def get_courses(self, page=1, limit=10, category=None, difficulty=None, fields=None, include=None):
         """Get paginated list of courses"""
-        query = Course.query.filter_by(is_published=True)
-        
-        if category:
-            query = query.filter_by(category=category)
-        if difficulty:
-            query = query.filter_by(difficulty=difficulty)
+        query = self._catalog_query(category, difficulty, fields, include)
         
         courses = query.paginate(
             page=page, 
@@ -20,53 +62,262 @@ class CourseService:
         )
         
         return {
-            'items': [course.to_dict() for course in courses.items],
+            'items': self._serialize_catalog(courses.items, fields, include),
             'total': courses.total,
             'page': page,
             'limit': limit,
             'totalPages': courses.pages
         }
     
+    def get_courses_keyset(self, limit=10, cursor=None, category=None, difficulty=None,
+                           fields=None, include=None, count=None):
+        """Get a page of courses after an opaque cursor (newest first)"""
+        query = self._catalog_query(category, difficulty, fields, include)
+        
+        if cursor:
+            created_at, course_id = self._decode_cursor(cursor)
+            # Row-value comparison lets the (is_published, created_at, id) index drive the seek
+            query = query.filter(tuple_(Course.created_at, Course.id) < tuple_(created_at, course_id))
+        
+        rows = query.order_by(Course.created_at.desc(), Course.id.desc()).limit(limit + 1).all()
+        courses = rows[:limit]
+        
+        result = {
+            'items': self._serialize_catalog(courses, fields, include),
+            'limit': limit,
+            'nextCursor': self._encode_cursor(courses[-1]) if len(rows) > limit else None
+        }
+        if count == 'exact':
+            result['total'] = self._catalog_query(category, difficulty).count()
+        elif count == 'estimated':
+            result['total'] = self._estimated_course_count(category, difficulty)
+        
+        return result
+    
+    def _catalog_query(self, category=None, difficulty=None, fields=None, include=None):
+        query = Course.query.filter_by(is_published=True)
+        
+        if category:
+            query = query.filter_by(category=category)
+        if difficulty:
+            query = query.filter_by(difficulty=difficulty)
+        
+        # Only preload what the requested projection will actually serialize
+        if wants_relation(fields, include, 'instructor'):
+            query = query.options(selectinload(Course.instructor))
+        if wants(fields, 'enrolledStudents'):
+            query = query.options(selectinload(Course.counter_shards))
+        
+        return query
+    
+    def _estimated_course_count(self, category=None, difficulty=None):
+        """Planner row estimate on Postgres; exact count elsewhere or when filtered"""
+        if db.engine.dialect.name == 'postgresql' and not category and not difficulty:
+            estimate = db.session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'courses'")
+            ).scalar()
+            # reltuples is -1 until the table has been analyzed
+            if estimate is not None and estimate >= 0:
+                return int(estimate)
+        return self._catalog_query(category, difficulty).count()
+    
+    @staticmethod
+    def _encode_cursor(course):
+        payload = json.dumps([course.created_at.isoformat(), course.id]).encode('utf-8')
+        return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+    
+    @staticmethod
+    def _decode_cursor(cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            created_at, course_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            return datetime.fromisoformat(created_at), course_id
+        except (ValueError, TypeError, UnicodeError):
+            raise ValueError('Invalid cursor')
+    
+    def _serialize_catalog(self, courses, fields=None, include=None):
+        """Serialize a page of courses with a fixed number of queries"""
+        if not courses:
+            return []
+        
+        course_ids = [course.id for course in courses]
+        
+        # One lesson query for the whole page, grouped per course in Python
+        lessons_by_course = {course_id: [] for course_id in course_ids}
+        if wants_relation(fields, include, 'lessons'):
+            lessons = Lesson.query.options(*Lesson.outline_options()).filter(Lesson.course_id.in_(course_ids)).order_by(
+                Lesson.course_id, Lesson.order
+            )
+            for lesson in lessons:
+                lessons_by_course[lesson.course_id].append(lesson)
+        
+        return [
+            course.to_dict(fields=fields, include=include, lessons=lessons_by_course[course.id])
+            for course in courses
+        ]
+    
+    def search_courses(self, query, page=1, limit=10, fields=None, include=None):
+        """Ranked full-text search over published courses and their lessons"""
+        hits, total = self.search_index.search(query, limit=limit, offset=(max(page, 1) - 1) * limit)
+        courses = self._catalog_query(fields=fields, include=include).filter(
+            Course.id.in_([course_id for course_id, _ in hits])
+        ).all() if hits else []
+        
+        by_id = {str(course.id): course for course in courses}
+        ranked = [(by_id[course_id], snippet) for course_id, snippet in hits if course_id in by_id]
+        items = self._serialize_catalog([course for course, _ in ranked], fields, include)
+        for item, (_, snippet) in zip(items, ranked):
+            item['snippet'] = snippet
+        
+        return {
+            'items': items,
+            'total': total,
+            'page': page,
+            'limit': limit,
+            'totalPages': (total + limit - 1) // limit if limit else 0
+        }
+    
     def get_course_by_id(self, course_id):
         """Get course by ID"""
         return Course.query.get(course_id)
     
+    def get_lesson(self, course_id, lesson_id):
+        """Get a lesson of a course, including its content"""
+        return Lesson.query.options(undefer(Lesson.content)).filter_by(
+            id=lesson_id,
+            course_id=course_id
+        ).first()
+    
+    def get_course_version(self, course_id):
+        """Everything the course payload embeds, from one query, for conditional GETs"""
+        return db.session.execute(select(*course_version_columns()).where(Course.id == course_id)).first()
+    
     def enroll_user(self, user_id, course_id):
         """Enroll user in course"""
+        return self.enroll_users(course_id, [user_id]) is not None
+    
+    def enroll_users(self, course_id, user_ids):
+        """Enroll many users at once; existing enrollments are left untouched"""
         course = Course.query.get(course_id)
         if not course:
-            return False
+            return None
         
-        # Check if already enrolled
-        existing_enrollment = Enrollment.query.filter_by(
+        user_ids = list(dict.fromkeys(user_ids))
+        known = set()
+        for start in range(0, len(user_ids), ENROLLMENT_BATCH_SIZE):
+            batch = user_ids[start:start + ENROLLMENT_BATCH_SIZE]
+            known.update(db.session.scalars(select(User.id).where(User.id.in_(batch))))
+        unknown = [user_id for user_id in user_ids if user_id not in known]
+        user_ids = [user_id for user_id in user_ids if user_id in known]
+        
+        # Totals are the same for every new student, so count them once
+        total_lessons, total_quizzes = db.session.execute(select(
+            select(func.count(Lesson.id)).where(Lesson.course_id == course_id).scalar_subquery(),
+            select(func.count(Quiz.id)).where(Quiz.course_id == course_id).scalar_subquery(),
+        )).one()
+        
+        enrolled = []
+        now = datetime.utcnow()
+        for start in range(0, len(user_ids), ENROLLMENT_BATCH_SIZE):
+            batch = user_ids[start:start + ENROLLMENT_BATCH_SIZE]
+            inserted = db.session.scalars(insert_ignoring_conflicts(Enrollment, [
+                {'id': str(uuid.uuid4()), 'user_id': user_id, 'course_id': course_id, 'enrolled_at': now}
+                for user_id in batch
+            ], ['user_id', 'course_id']).returning(Enrollment.user_id)).all()
+            if not inserted:
+                continue
+            db.session.execute(insert_ignoring_conflicts(Progress, [
+                {'id': str(uuid.uuid4()), 'user_id': user_id, 'course_id': course_id,
+                 'total_lessons': total_lessons, 'total_quizzes': total_quizzes,
+                 'last_accessed_at': now, 'created_at': now, 'updated_at': now}
+                for user_id in inserted
+            ], ['user_id', 'course_id']))
+            self.user_stats.bump(inserted, enrolled_courses=1)
+            enrolled.extend(inserted)
+        
+        if enrolled:
+            self._bump_enrollment_count(course, len(enrolled))
+        db.session.commit()
+        get_activity_log().record_many([
+            {'user_id': user_id, 'type': ENROLLED, 'course_id': course_id} for user_id in enrolled
+        ])
+        if enrolled:
+            self._invalidate_enrollment_caches(course_id, enrolled)
+        
+        return {
+            'enrolled': len(enrolled),
+            'alreadyEnrolled': len(user_ids) - len(enrolled),
+            'unknownUsers': unknown
+        }
+    
+    def unenroll_user(self, user_id, course_id):
+        """Remove user from course"""
+        enrollment = Enrollment.query.filter_by(
             user_id=user_id, 
             course_id=course_id
         ).first()
         
-        if existing_enrollment:
-            return True
+        if not enrollment:
+            return False
         
-        # Create enrollment
-        enrollment = Enrollment(
-            id=str(uuid.uuid4()),
-            user_id=user_id,
-            course_id=course_id
-        )
+        progress = Progress.query.filter_by(user_id=user_id, course_id=course_id)
+        completed = progress.with_entities(func.coalesce(func.sum(Progress.completed_lessons), 0)).scalar()
+        progress.delete(synchronize_session=False)
+        # Completions go with the progress they fed, so a re-enrolled student can complete lessons again
+        LessonCompletion.query.filter_by(user_id=user_id, course_id=course_id).delete(synchronize_session=False)
+        db.session.delete(enrollment)
+        self.user_stats.bump([user_id], enrolled_courses=-1, lessons_completed=-completed)
+        self._bump_enrollment_count(enrollment.course, -1)
+        db.session.commit()
+        self._invalidate_enrollment_caches(course_id, [user_id])
         
-        # Create progress record
-        progress = Progress(
-            id=str(uuid.uuid4()),
-            user_id=user_id,
-            course_id=course_id,
-            total_lessons=course.lessons.count(),
-            total_quizzes=course.quizzes.count()
+        return True
+    
+    def _bump_enrollment_count(self, course, delta):
+        """Apply an enrollment delta to the course counter inside the current transaction"""
+        threshold = current_app.config.get('HOT_COURSE_ENROLLMENT_THRESHOLD', 1000)
+        if (course.enrollment_count or 0) < threshold:
+            # Counter writes are not content edits, so updated_at is left alone
+            Course.query.filter_by(id=course.id).update(
+                {Course.enrollment_count: Course.enrollment_count + delta, Course.updated_at: Course.updated_at},
+                synchronize_session=False
+            )
+            return
+        
+        # Hot course: spread writers over shard rows so they don't queue on the course row
+        shard = random.randrange(current_app.config.get('ENROLLMENT_COUNTER_SHARDS', 16))
+        shard_query = CourseCounterShard.query.filter_by(course_id=course.id, shard=shard)
+        if shard_query.update(
+            {CourseCounterShard.enrollment_delta: CourseCounterShard.enrollment_delta + delta},
+            synchronize_session=False
+        ):
+            return
+        
+        try:
+            with db.session.begin_nested():
+                db.session.add(CourseCounterShard(course_id=course.id, shard=shard, enrollment_delta=delta))
+        except IntegrityError:
+            # Another writer created the shard first
+            shard_query.update(
+                {CourseCounterShard.enrollment_delta: CourseCounterShard.enrollment_delta + delta},
+                synchronize_session=False
+            )
+    
+    def reconcile_enrollment_counts(self):
+        """Recompute every course counter from enrollments and fold the shards"""
+        actual = (
+            select(func.count(Enrollment.id))
+            .where(Enrollment.course_id == Course.id)
+            .scalar_subquery()
         )
-        
-        db.session.add(enrollment)
-        db.session.add(progress)
+        updated = Course.query.update(
+            {Course.enrollment_count: actual, Course.updated_at: Course.updated_at},
+            synchronize_session=False
+        )
+        CourseCounterShard.query.delete(synchronize_session=False)
         db.session.commit()
         
-        return True
+        return updated
     
     def get_user_progress(self, user_id, course_id):
         """Get user progress for a course"""
@@ -77,21 +328,115 @@ class CourseService:
     
     def mark_lesson_complete(self, user_id, course_id, lesson_id):
         """Mark lesson as complete for user"""
-        progress = Progress.query.filter_by(
-            user_id=user_id, 
-            course_id=course_id
+        return self.complete_lesson(user_id, course_id, lesson_id) is not None
+    
+    def complete_lesson(self, user_id, course_id, lesson_id, time_spent_minutes=0, score=None):
+        """Record a lesson completion once; retries return the existing completion"""
+        # The lesson must belong to the course and the user must be enrolled in it
+        enrolled = db.session.execute(
+            select(Progress.id)
+            .join(Lesson, Lesson.course_id == Progress.course_id)
+            .where(Progress.user_id == user_id, Progress.course_id == course_id, Lesson.id == lesson_id)
         ).first()
+        if not enrolled:
+            return None
         
-        if not progress:
-            return False
-        
-        # Update progress
-        progress.completed_lessons += 1
-        progress.last_accessed_at = datetime.utcnow()
+        inserted = self._record_completions(user_id, [{
+            'lesson_id': lesson_id,
+            'course_id': course_id,
+            'time_spent_minutes': time_spent_minutes,
+            'score': score,
+            'completed_at': datetime.utcnow()
+        }])
+        db.session.commit()
+        self._log_completions(user_id, inserted)
         
+        return LessonCompletion.query.filter_by(user_id=user_id, lesson_id=lesson_id).first()
+    
+    def sync_lesson_completions(self, user_id, events):
+        """Apply a batch of offline completion events; already recorded lessons are skipped"""
+        errors, by_lesson = [], {}
+        now = datetime.utcnow()
+        for index, event in enumerate(events):
+            result = validate_completion_event(event) if isinstance(event, dict) else {
+                'is_valid': False, 'errors': ['Event must be an object']
+            }
+            if not result['is_valid']:
+                errors.append({'index': index, 'errors': result['errors']})
+                continue
+            completed_at = self._utc_naive(event.get('completedAt')) or now
+            # Replays can repeat a lesson; the earliest completion wins
+            current = by_lesson.get(event['lessonId'])
+            if current is None or completed_at < current[1]['completed_at']:
+                by_lesson[event['lessonId']] = (index, {
+                    'lesson_id': event['lessonId'],
+                    'time_spent_minutes': event.get('timeSpentMinutes', 0),
+                    'score': event.get('score'),
+                    'completed_at': min(completed_at, now)
+                })
+        
+        # Lessons of courses the user is enrolled in, in one query
+        course_of = dict(db.session.execute(
+            select(Lesson.id, Lesson.course_id)
+            .join(Progress, Progress.course_id == Lesson.course_id)
+            .where(Progress.user_id == user_id, Lesson.id.in_(list(by_lesson)))
+        ).all()) if by_lesson else {}
+        
+        rows = []
+        for lesson_id, (index, row) in by_lesson.items():
+            if lesson_id not in course_of:
+                errors.append({'index': index, 'errors': ['Lesson not found']})
+                continue
+            rows.append({**row, 'course_id': course_of[lesson_id]})
+        
+        applied = self._record_completions(user_id, rows) if rows else []
         db.session.commit()
+        self._log_completions(user_id, applied)
         
-        return True
+        errors.sort(key=lambda error: error['index'])
+        applied_ids = {lesson_id for lesson_id, _ in applied}
+        return {
+            'applied': sorted(applied_ids),
+            'duplicates': sorted(row['lesson_id'] for row in rows if row['lesson_id'] not in applied_ids),
+            'errors': errors
+        }
+    
+    def _record_completions(self, user_id, rows):
+        """Insert completions that don't exist yet and bump progress for them with one UPDATE"""
+        inserted = db.session.execute(insert_ignoring_conflicts(LessonCompletion, [
+            {'id': str(uuid.uuid4()), 'user_id': user_id, **row} for row in rows
+        ], ['user_id', 'lesson_id']).returning(LessonCompletion.lesson_id, LessonCompletion.course_id)).all()
+        
+        # Only new completions move progress, and the increment happens in the database
+        new_per_course = {}
+        for _, course_id in inserted:
+            new_per_course[course_id] = new_per_course.get(course_id, 0) + 1
+        if new_per_course:
+            Progress.query.filter(
+                Progress.user_id == user_id,
+                Progress.course_id.in_(list(new_per_course))
+            ).update({
+                Progress.completed_lessons: Progress.completed_lessons + case(new_per_course, value=Progress.course_id, else_=0),
+                Progress.last_accessed_at: datetime.utcnow()
+            }, synchronize_session=False)
+            self.user_stats.bump([user_id], lessons_completed=sum(new_per_course.values()))
+        return inserted
+    
+    @staticmethod
+    def _log_completions(user_id, inserted):
+        get_activity_log().record_many([
+            {'user_id': user_id, 'type': LESSON_COMPLETED, 'course_id': course_id, 'subject_id': lesson_id}
+            for lesson_id, course_id in inserted
+        ])
+    
+    @staticmethod
+    def _utc_naive(value):
+        if value is None:
+            return None
+        parsed = parse_iso_datetime(value)
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
     
     def create_course(self, instructor_id, data):
         """Create a new course"""
@@ -105,7 +450,10 @@ class CourseService:
         )
         
         db.session.add(course)
+        self.search_index.index_course(course.id)
         db.session.commit()
+        get_facet_index().update(course.id, *self._listing_state(course))
+        self._invalidate_course_cache(course.id, self._listing_state(course))
         
         return course
     
@@ -119,13 +467,22 @@ class CourseService:
         if not course:
             return None
         
+        before = self._listing_state(course)
         for key, value in data.items():
             if hasattr(course, key):
                 setattr(course, key, value)
         
         course.updated_at = datetime.utcnow()
+        self.search_index.index_course(course.id)
         db.session.commit()
         
+        after = self._listing_state(course)
+        if after != before:
+            get_facet_index().update(course.id, *after)
+        # Pages only shift when the course enters or leaves a listing; otherwise just
+        # the entries that embed it are stale
+        self._invalidate_course_cache(course.id, *([] if after == before else [before, after]))
+        
         return course
     
     def delete_course(self, instructor_id, course_id):
@@ -138,8 +495,12 @@ class CourseService:
         if not course:
             return False
         
+        state = self._listing_state(course)
         db.session.delete(course)
+        self.search_index.remove_course(course_id)
         db.session.commit()
+        get_facet_index().remove(course_id)
+        self._invalidate_course_cache(course_id, state)
         
         return True
     
@@ -164,10 +525,64 @@ class CourseService:
         )
         
         db.session.add(lesson)
+        self.search_index.index_course(course_id)
         db.session.commit()
+        self._invalidate_course_cache(course_id)
         
         return lesson
     
+    def import_lessons(self, instructor_id, course_id, lessons_data):
+        """Validate and insert many lessons in one statement; invalid rows are reported, not inserted"""
+        course = Course.query.filter_by(
+            id=course_id, 
+            instructor_id=instructor_id
+        ).first()
+        
+        if not course:
+            return None
+        
+        valid, errors = [], []
+        for index, item in enumerate(lessons_data):
+            if not isinstance(item, dict):
+                errors.append({'index': index, 'errors': ['Lesson must be an object']})
+                continue
+            # Rows without an explicit order keep their position in the array
+            data = {**item, 'order': item.get('order', index)}
+            result = validate_lesson_data(data)
+            if result['is_valid']:
+                valid.append((data['order'], index, data))
+            else:
+                errors.append({'index': index, 'errors': result['errors']})
+        
+        # Append after the existing lessons, numbering contiguously in the requested order
+        next_order = (db.session.query(func.max(Lesson.order)).filter(Lesson.course_id == course_id).scalar() or 0) + 1
+        now = datetime.utcnow()
+        rows, created = [], []
+        for position, (_, index, data) in enumerate(sorted(valid, key=lambda row: row[:2])):
+            row = {
+                'id': str(uuid.uuid4()),
+                'title': data['title'],
+                'description': data['description'],
+                'content': data['content'],
+                'video_url': data.get('videoUrl'),
+                'duration': data['duration'],
+                'order': next_order + position,
+                'course_id': course_id,
+                'created_at': now,
+                'updated_at': now
+            }
+            rows.append(row)
+            created.append({'index': index, 'id': row['id'], 'order': row['order']})
+        
+        if rows:
+            db.session.execute(insert(Lesson), rows)
+            self.search_index.index_course(course_id)
+            db.session.commit()
+            self._invalidate_course_cache(course_id)
+        
+        created.sort(key=lambda row: row['index'])
+        return {'created': created, 'errors': errors}
+    
     def update_lesson(self, instructor_id, course_id, lesson_id, data):
         """Update lesson"""
         lesson = Lesson.query.join(Course).filter(
@@ -184,7 +599,9 @@ class CourseService:
                 setattr(lesson, key, value)
         
         lesson.updated_at = datetime.utcnow()
+        self.search_index.index_course(course_id)
         db.session.commit()
+        self._invalidate_course_cache(course_id)
         
         return lesson
     
@@ -200,6 +617,34 @@ class CourseService:
             return False
         
         db.session.delete(lesson)
+        # a removed lesson leaves no timestamp behind, so move the course's Last-Modified instead
+        lesson.course.updated_at = datetime.utcnow()
+        self.search_index.index_course(course_id)
         db.session.commit()
+        self._invalidate_course_cache(course_id)
         
         return True
+    
+    @staticmethod
+    def _listing_state(course):
+        return (bool(course.is_published), course.category, course.difficulty)
+    
+    def _invalidate_course_cache(self, course_id, *listing_states):
+        """Drop cached responses embedding the course (including its students' quiz feeds), plus
+        every catalog filter whose listing it joined or left (given as (published, category, difficulty) states)"""
+        tags = {course_cache_tag(course_id), upcoming_quizzes_cache_tag(course_id)}
+        for published, category, difficulty in listing_states:
+            if published:
+                tags.update(
+                    catalog_cache_tag(c, d)
+                    for c in (None, category)
+                    for d in (None, difficulty)
+                )
+        get_cache().invalidate_tags(tags)
+    
+    @staticmethod
+    def _invalidate_enrollment_caches(course_id, user_ids):
+        """Enrollment changes move enrolledStudents wherever the course is embedded, and the users' quiz feeds.
+        Catalog pages are tagged with every course they list, so the course tag reaches exactly those pages"""
+        tags = {course_cache_tag(course_id)} | {quiz_feed_user_tag(user_id) for user_id in user_ids}
+        get_cache().invalidate_tags(tags)
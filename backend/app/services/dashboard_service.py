@@ -1,102 +1,250 @@
-from app.models import Course, Quiz, Enrollment, Progress, User, db
-from sqlalchemy import func, desc
+from app.models import Course, Lesson, Quiz, Enrollment, Progress, User, db
+from app.services.achievement_service import AchievementService
+from app.services.activity_service import ActivityService
+from app.services.recommendation_service import RecommendationService
+from app.services.user_stats_service import UserStatsService
+from app.utils.cache import get_cache
+from app.utils.fieldsets import project, wants
+from sqlalchemy import and_, func, desc, or_, select
+from sqlalchemy.orm import aliased
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from flask import current_app
 from datetime import datetime, timedelta
+import json
+import logging
+import time
 import uuid
 
+logger = logging.getLogger(__name__)
+
+# Summary section -> DashboardService method computing it for a user
+SUMMARY_SECTIONS = {
+    'metrics': 'get_user_metrics',
+    'courses': 'get_user_courses',
+    'quizzes': 'get_upcoming_quizzes',
+    'progress': 'get_user_progress',
+    'recentActivity': 'get_recent_activity',
+    'achievements': 'get_user_achievements',
+    'recommendations': 'get_course_recommendations',
+}
+
+
+UPCOMING_QUIZ_LIMIT = 5
+
+
+def upcoming_quizzes_cache_tag(course_id):
+    """Tag for cached quiz feeds of students enrolled in the course"""
+    return f'upcoming-quizzes:course:{course_id}'
+
+
+def quiz_feed_user_tag(user_id):
+    """Tag for the user's cached quiz feed, dropped when their enrollments change"""
+    return f'upcoming-quizzes:user:{user_id}'
+
+
+def init_dashboard_executor(app):
+    # Bounded so slow or stuck sections can't pile up threads (or pool connections). Every worker
+    # holds a connection while it runs, so at most half the SQLAlchemy pool is given to the summary
+    # and the rest stays free for request threads.
+    options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}
+    pool_capacity = options.get('pool_size', 5) + options.get('max_overflow', 10)
+    workers = app.config.get('DASHBOARD_SUMMARY_WORKERS', 4)
+    if workers > max(pool_capacity // 2, 1):
+        logger.warning('DASHBOARD_SUMMARY_WORKERS=%d exceeds half the connection pool (%d); using %d',
+                       workers, pool_capacity, max(pool_capacity // 2, 1))
+        workers = max(pool_capacity // 2, 1)
+    app.extensions['dashboard_executor'] = ThreadPoolExecutor(
+        max_workers=workers,
+        thread_name_prefix='dashboard-summary',
+    )
+
 class DashboardService:
+    def __init__(self):
+        self.user_stats = UserStatsService()
+        self.activity = ActivityService()
+        self.recommendations = RecommendationService()
+        self.achievements = AchievementService()
+    
     def get_user_metrics(self, user_id):
-        """Get dashboard metrics for user"""
-        # Get enrolled courses count
-        enrolled_courses = Enrollment.query.filter_by(user_id=user_id).count()
-        
-        # Get completed lessons count
-        completed_lessons = db.session.query(func.sum(Progress.completed_lessons)).filter_by(user_id=user_id).scalar() or 0
+        """Get dashboard metrics for user from their stats snapshot"""
+        return self.user_stats.get_metrics(user_id)
+    
+    def get_user_courses(self, user_id, fields=None):
+        """Get user's enrolled courses with progress, in a single query"""
+        instructor = aliased(User)
+        enrolled = select(Enrollment.course_id).where(Enrollment.user_id == user_id)
+        lesson_totals = select(Lesson.course_id, func.count(Lesson.id).label('total')) \
+            .where(Lesson.course_id.in_(enrolled)) \
+            .group_by(Lesson.course_id) \
+            .subquery()
+        # First lesson past the user's progress in each enrolled course: number the remaining
+        # lessons per course with ROW_NUMBER() and join the first one
+        course_progress = aliased(Progress)
+        next_lessons = select(
+            Lesson.course_id,
+            Lesson.title,
+            func.row_number().over(partition_by=Lesson.course_id, order_by=(Lesson.order, Lesson.id)).label('position'),
+        ).outerjoin(course_progress, and_(course_progress.course_id == Lesson.course_id,
+                                          course_progress.user_id == user_id)) \
+            .where(
+                Lesson.course_id.in_(enrolled),
+                or_(course_progress.id.is_(None), Lesson.order > course_progress.completed_lessons),
+            ).subquery()
         
-        # Get quizzes taken count
-        quizzes_taken = db.session.query(func.count(Quiz.id)).join(Enrollment).filter(
-            Enrollment.user_id == user_id
-        ).scalar() or 0
+        # Unrequested columns are left out of the query entirely
+        columns = [Course.id, Course.title, Progress.id.label('progress_id'), Progress.completed_lessons]
+        if wants(fields, 'instructor'):
+            columns += [instructor.first_name, instructor.last_name]
+        if wants(fields, 'totalLessons'):
+            columns.append(func.coalesce(lesson_totals.c.total, 0).label('total_lessons'))
+        if wants(fields, 'nextLesson'):
+            columns.append(next_lessons.c.title.label('next_lesson'))
         
-        # Get average score
-        average_score = db.session.query(func.avg(Progress.average_score)).filter_by(user_id=user_id).scalar() or 0
+        query = select(*columns).select_from(Enrollment) \
+            .join(Course, Course.id == Enrollment.course_id) \
+            .outerjoin(Progress, and_(Progress.user_id == Enrollment.user_id, Progress.course_id == Course.id)) \
+            .where(Enrollment.user_id == user_id) \
+            .order_by(Enrollment.enrolled_at, Course.id)
+        if wants(fields, 'instructor'):
+            query = query.join(instructor, instructor.id == Course.instructor_id)
+        if wants(fields, 'totalLessons'):
+            query = query.outerjoin(lesson_totals, lesson_totals.c.course_id == Course.id)
+        if wants(fields, 'nextLesson'):
+            query = query.outerjoin(next_lessons, and_(next_lessons.c.course_id == Course.id,
+                                                       next_lessons.c.position == 1))
         
-        return {
-            'enrolledCourses': enrolled_courses,
-            'lessonsCompleted': completed_lessons,
-            'quizzesTaken': quizzes_taken,
-            'averageScore': round(average_score, 1)
-        }
+        return [project({
+            'id': row.id,
+            'title': row.title,
+            'instructor': lambda: f"{row.first_name} {row.last_name}",
+            'completedLessons': row.completed_lessons or 0,
+            'totalLessons': lambda: row.total_lessons,
+            'nextLesson': lambda: self._next_lesson_title(row),
+            'color': self._get_course_color(row.id)
+        }, fields) for row in db.session.execute(query)]
     
-    def get_user_courses(self, user_id):
-        """Get user's enrolled courses with progress"""
-        courses = db.session.query(Course).join(Enrollment).filter(
-            Enrollment.user_id == user_id
-        ).all()
+    def get_summary(self, user_id, sections=None):
+        """Compute dashboard sections concurrently; sections that fail or time out come back as None.
+
+        At most DASHBOARD_SUMMARY_MAX_INFLIGHT sections of one request occupy workers at a time, so
+        concurrent summaries share the pool. Cancellation is best-effort: a section that already
+        started keeps its worker (and connection) after timing out until it returns, and still
+        counts against the request's limit, so one slow request can't take over the pool.
+        """
+        app = current_app._get_current_object()
+        executor = app.extensions['dashboard_executor']
+        default_timeout = app.config.get('DASHBOARD_SECTION_TIMEOUT', 2.0)
+        timeouts = app.config.get('DASHBOARD_SECTION_TIMEOUTS') or {}
+        max_inflight = max(app.config.get('DASHBOARD_SUMMARY_MAX_INFLIGHT', 2), 1)
+        
+        # Every section gets its own budget, counted from the start of the request
+        started = time.monotonic()
+        deadlines = {name: started + timeouts.get(name, default_timeout)
+                     for name in SUMMARY_SECTIONS if wants(sections, name)}
+        pending = list(deadlines)
+        running, abandoned = {}, set()
+        data, errors = {}, {}
         
-        course_data = []
-        for course in courses:
-            progress = Progress.query.filter_by(
-                user_id=user_id, 
-                course_id=course.id
-            ).first()
+        def timed_out(name):
+            data[name], errors[name] = None, 'timeout'
+        
+        while pending or running:
+            now = time.monotonic()
+            for name in [name for name in pending if deadlines[name] <= now]:
+                pending.remove(name)
+                timed_out(name)
+            abandoned = {future for future in abandoned if not future.done()}
+            while pending and len(running) + len(abandoned) < max_inflight:
+                name = pending.pop(0)
+                running[executor.submit(self._run_section, app, SUMMARY_SECTIONS[name], user_id)] = name
+            if not running:
+                if not pending:
+                    break
+                # Only abandoned sections hold this request's slots; wait for one to free up
+                wait(abandoned, timeout=max(min(deadlines[n] for n in pending) - now, 0),
+                     return_when=FIRST_COMPLETED)
+                continue
             
-            course_data.append({
-                'id': course.id,
-                'title': course.title,
-                'instructor': f"{course.instructor.first_name} {course.instructor.last_name}",
-                'completedLessons': progress.completed_lessons if progress else 0,
-                'totalLessons': course.lessons.count(),
-                'nextLesson': self._get_next_lesson(course, progress),
-                'color': self._get_course_color(course.id)
-            })
+            waiting = [deadlines[name] for name in running.values()] + [deadlines[name] for name in pending]
+            done, _ = wait(running, timeout=max(min(waiting) - now, 0), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    data[name] = future.result()
+                except Exception:
+                    logger.exception('Dashboard section %s failed', name)
+                    data[name], errors[name] = None, 'error'
+            now = time.monotonic()
+            for future, name in list(running.items()):
+                if deadlines[name] <= now:
+                    del running[future]
+                    if not future.cancel():
+                        abandoned.add(future)
+                    timed_out(name)
         
-        return course_data
+        data = {name: data[name] for name in deadlines}
+        return {'data': data, 'errors': errors, 'partial': bool(errors)}
+    
+    def _run_section(self, app, method, user_id):
+        # A fresh app context gives the worker its own session and connection,
+        # released when the context is torn down
+        with app.app_context():
+            return getattr(self, method)(user_id)
     
     def get_upcoming_quizzes(self, user_id):
-        """Get upcoming quizzes for user"""
-        quizzes = db.session.query(Quiz).join(Course).join(Enrollment).filter(
-            Enrollment.user_id == user_id,
-            Quiz.scheduled_at > datetime.utcnow()
-        ).order_by(Quiz.scheduled_at).limit(5).all()
+        """Get upcoming quizzes for user, cached briefly per user"""
+        cache = get_cache()
+        key = f'upcoming-quizzes:{user_id}'
+        cached = cache.get(key)
+        if cached is not None:
+            return json.loads(cached)
+        
+        course_ids = db.session.scalars(select(Enrollment.course_id).where(Enrollment.user_id == user_id)).all()
+        quizzes = []
+        if course_ids:
+            # One seek per course on the (course_id, scheduled_at) index
+            quizzes = [{
+                'id': row.id,
+                'title': row.title,
+                'course': row.course,
+                'scheduledAt': row.scheduled_at.isoformat()
+            } for row in db.session.execute(
+                select(Quiz.id, Quiz.title, Quiz.scheduled_at, Course.title.label('course'))
+                .join(Course, Course.id == Quiz.course_id)
+                .where(Quiz.course_id.in_(course_ids), Quiz.scheduled_at > datetime.utcnow())
+                .order_by(Quiz.scheduled_at, Quiz.id)
+                .limit(UPCOMING_QUIZ_LIMIT)
+            )]
         
-        return [{
-            'id': quiz.id,
-            'title': quiz.title,
-            'course': quiz.course.title,
-            'scheduledAt': quiz.scheduled_at.isoformat() if quiz.scheduled_at else None
-        } for quiz in quizzes]
+        # The short TTL also retires quizzes whose start time has passed
+        cache.set(key, json.dumps(quizzes).encode('utf-8'),
+                  ttl=current_app.config.get('UPCOMING_QUIZ_CACHE_TTL', 60),
+                  tags=[quiz_feed_user_tag(user_id)] + [upcoming_quizzes_cache_tag(c) for c in course_ids])
+        return quizzes
     
-    def get_user_progress(self, user_id):
+    def get_user_progress(self, user_id, fields=None):
         """Get detailed user progress"""
         progress_records = Progress.query.filter_by(user_id=user_id).all()
         
-        return [progress.to_dict() for progress in progress_records]
+        return [progress.to_dict(fields=fields) for progress in progress_records]
     
-    def get_recent_activity(self, user_id):
-        """Get recent user activity"""
-        # This would typically include recent lessons completed, quizzes taken, etc.
-        return []
+    def get_recent_activity(self, user_id, limit=10, cursor=None, fields=None):
+        """Get recent user activity from the learning-event log"""
+        return self.activity.get_user_activity(user_id, limit, cursor, fields)
     
     def get_user_achievements(self, user_id):
-        """Get user achievements"""
-        # This would typically include badges, certificates, etc.
-        return []
+        """Get the badges the user has earned"""
+        return self.achievements.get_user_achievements(user_id)
     
     def get_course_recommendations(self, user_id):
-        """Get course recommendations for user"""
-        # This would typically use ML to recommend courses
-        return []
+        """Get course recommendations for user from the precomputed course neighbours"""
+        return self.recommendations.get_recommendations(user_id)
     
-    def _get_next_lesson(self, course, progress):
-        """Get next lesson for course"""
-        if not progress:
-            return course.lessons.order_by(Lesson.order).first().title if course.lessons.count() > 0 else "No lessons"
-        
-        next_lesson = course.lessons.filter(
-            Lesson.order > progress.completed_lessons
-        ).order_by(Lesson.order).first()
-        
-        return next_lesson.title if next_lesson else "Course Complete"
+    @staticmethod
+    def _next_lesson_title(row):
+        if row.next_lesson:
+            return row.next_lesson
+        return "No lessons" if row.progress_id is None else "Course Complete"
     
     def _get_course_color(self, course_id):
         """Get color for course based on ID"""
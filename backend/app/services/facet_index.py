@@ -0,0 +1,121 @@
+"""In-memory facet index over published courses.
+
+Each published course owns a bit position; every (facet, value) pair keeps an
+integer bitmask of the courses that have it. Combined filters are bitwise ANDs
+and counts are popcounts, so facet requests never reach the database.
+
+CourseService updates the index of the process that handled the write; other
+worker processes pick changes up when their copy exceeds FACET_INDEX_MAX_AGE.
+"""
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import select
+
+from app import db
+from app.models import Course
+
+FACETS = ('category', 'difficulty')
+
+
+def _popcount(mask):
+    return bin(mask).count('1')
+
+
+class FacetIndex:
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._loaded_at = None
+        self._reset()
+
+    def _reset(self):
+        self._slots = {}  # course_id -> bit position
+        self._values = {}  # course_id -> {facet: value}
+        self._free = []  # positions released by removed courses
+        self._next_slot = 0
+        self._live = 0  # mask of every indexed course
+        self._bitsets = {facet: {} for facet in FACETS}
+
+    def rebuild(self):
+        with self._lock:
+            rows = db.session.execute(
+                select(Course.id, Course.category, Course.difficulty).where(Course.is_published.is_(True))
+            ).all()
+            self._reset()
+            for course_id, category, difficulty in rows:
+                self._add(str(course_id), {'category': category, 'difficulty': difficulty})
+            self._loaded_at = time.monotonic()
+
+    def update(self, course_id, published, category, difficulty):
+        """Reflect a course's current listing state"""
+        with self._lock:
+            if self._loaded_at is None:
+                return  # the first read loads everything
+            self._discard(str(course_id))
+            if published:
+                self._add(str(course_id), {'category': category, 'difficulty': difficulty})
+
+    def remove(self, course_id):
+        with self._lock:
+            self._discard(str(course_id))
+
+    def counts(self, category=None, difficulty=None):
+        """Matching total plus per-value counts; each facet is counted under the other facets' filters"""
+        filters = {'category': category, 'difficulty': difficulty}
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at > self.max_age:
+                self.rebuild()
+
+            def matching(skip=None):
+                mask = self._live
+                for facet, value in filters.items():
+                    if value and facet != skip:
+                        mask &= self._bitsets[facet].get(value, 0)
+                return mask
+
+            facets = {}
+            for facet in FACETS:
+                scope = matching(skip=facet)
+                facets[facet] = {
+                    value: _popcount(bits & scope)
+                    for value, bits in sorted(self._bitsets[facet].items())
+                }
+            return {'total': _popcount(matching()), 'facets': facets}
+
+    def _add(self, course_id, values):
+        slot = self._free.pop() if self._free else self._next_slot
+        if slot == self._next_slot:
+            self._next_slot += 1
+        bit = 1 << slot
+        self._slots[course_id] = slot
+        self._values[course_id] = values
+        self._live |= bit
+        for facet, value in values.items():
+            if value is not None:
+                self._bitsets[facet][value] = self._bitsets[facet].get(value, 0) | bit
+
+    def _discard(self, course_id):
+        slot = self._slots.pop(course_id, None)
+        if slot is None:
+            return
+        bit = 1 << slot
+        self._live &= ~bit
+        for facet, value in self._values.pop(course_id).items():
+            if value is None:
+                continue
+            remaining = self._bitsets[facet][value] & ~bit
+            if remaining:
+                self._bitsets[facet][value] = remaining
+            else:
+                del self._bitsets[facet][value]
+        self._free.append(slot)
+
+
+def init_facet_index(app):
+    app.extensions['facet_index'] = FacetIndex(max_age=app.config.get('FACET_INDEX_MAX_AGE', 300))
+
+
+def get_facet_index():
+    return current_app.extensions['facet_index']
@@ -1,11 +1,20 @@
 from app.models import Quiz, Question, Course, Lesson, QuizAttempt, QuizAnswer, Enrollment, Progress, db
+from app.services.activity_service import QUIZ_SUBMITTED, get_activity_log
 from app.services.ai_service import AIService
+from app.services.course_service import course_version_columns
+from app.services.dashboard_service import upcoming_quizzes_cache_tag
+from app.services.user_stats_service import UserStatsService
+from app.utils.cache import get_cache
+from app.utils.fieldsets import project_all
+from sqlalchemy import func, select
+from sqlalchemy.orm import undefer
 from datetime import datetime
 import uuid
 
 class QuizService:
     def __init__(self):
         self.ai_service = AIService()
+        self.user_stats = UserStatsService()
     
     def generate_quiz(self, course_id, lesson_ids, difficulty, question_type, number_of_questions):
         """Generate quiz using AI"""
@@ -14,7 +23,7 @@ class QuizService:
             return None
         
         # Get lesson content
-        lessons = Lesson.query.filter(Lesson.id.in_(lesson_ids)).all()
+        lessons = Lesson.query.options(undefer(Lesson.content)).filter(Lesson.id.in_(lesson_ids)).all()
         lesson_content = " ".join([lesson.content for lesson in lessons])
         
         # Generate questions using AI
@@ -55,6 +64,21 @@ class QuizService:
             db.session.add(question)
         
         db.session.commit()
+        get_cache().invalidate_tags([upcoming_quizzes_cache_tag(course_id)])
+        
+        return quiz
+
+    def schedule_quiz(self, instructor_id, quiz_id, scheduled_at):
+        """Set or clear the quiz start time (naive UTC); only the course instructor may"""
+        quiz = Quiz.query.join(Course, Course.id == Quiz.course_id) \
+            .filter(Quiz.id == quiz_id, Course.instructor_id == instructor_id).first()
+        if not quiz:
+            return None
+        
+        quiz.scheduled_at = scheduled_at
+        db.session.commit()
+        # Only feeds of students in this course can change
+        get_cache().invalidate_tags([upcoming_quizzes_cache_tag(quiz.course_id)])
         
         return quiz
 
@@ -62,6 +86,18 @@ class QuizService:
     def get_quiz_by_id(self, quiz_id: str):
         return Quiz.query.get(quiz_id)
 
+    def get_quiz_version(self, quiz_id: str):
+        """Quiz and question timestamps plus question count and the embedded course's version"""
+        questions = select(Question).where(Question.quiz_id == Quiz.id)
+        return db.session.execute(
+            select(
+                Quiz.updated_at,
+                questions.with_only_columns(func.count(Question.id)).scalar_subquery(),
+                questions.with_only_columns(func.max(Question.updated_at)).scalar_subquery(),
+                *course_version_columns(),
+            ).select_from(Quiz).outerjoin(Course, Course.id == Quiz.course_id).where(Quiz.id == quiz_id)
+        ).first()
+
     def get_quiz_questions(self, quiz_id: str):
         quiz = Quiz.query.get(quiz_id)
         return [q.to_dict() for q in quiz.questions.order_by(Question.id.asc()).all()] if quiz else []
@@ -110,16 +146,79 @@ class QuizService:
                 attempt_id=attempt.id,
             ))
         attempt.score = round((correct / total) * 100.0, 2) if total else 0.0
+        self.user_stats.bump([user_id], quizzes_taken=1, quiz_score_total=attempt.score)
         db.session.commit()
+        get_activity_log().record(user_id, QUIZ_SUBMITTED, course_id=quiz.course_id, subject_id=quiz_id,
+                                  data={'score': attempt.score})
         return attempt
 
-    def get_user_attempts(self, user_id: str, quiz_id: str):
-        attempts = QuizAttempt.query.filter_by(user_id=user_id, quiz_id=quiz_id).order_by(QuizAttempt.completed_at.desc()).all()
-        return [a.to_dict() for a in attempts]
+    def get_user_attempts(self, user_id: str, quiz_id: str, fields=None, include=None):
+        # Explicit includes still go through the model serializers; the default is the review read model
+        if include is not None:
+            attempts = QuizAttempt.query.filter_by(user_id=user_id, quiz_id=quiz_id).order_by(QuizAttempt.completed_at.desc()).all()
+            return [a.to_dict(fields=fields, include=include) for a in attempts]
+        reviews = self._load_attempt_reviews(QuizAttempt.user_id == user_id, QuizAttempt.quiz_id == quiz_id)
+        return project_all(reviews, fields)
 
     def get_attempt_by_id(self, user_id: str, attempt_id: str):
         return QuizAttempt.query.filter_by(id=attempt_id, user_id=user_id).first()
 
+    def get_attempt_review(self, user_id: str, quiz_id: str, attempt_id: str):
+        reviews = self._load_attempt_reviews(
+            QuizAttempt.id == attempt_id,
+            QuizAttempt.user_id == user_id,
+            QuizAttempt.quiz_id == quiz_id,
+        )
+        return reviews[0] if reviews else None
+
+    def _load_attempt_reviews(self, *criteria) -> list:
+        """Attempts with their answers and questions, fetched in a single joined query"""
+        rows = db.session.query(
+            QuizAttempt.id,
+            QuizAttempt.quiz_id,
+            QuizAttempt.score,
+            QuizAttempt.total_points,
+            QuizAttempt.completed_at,
+            QuizAnswer.id.label('answer_id'),
+            QuizAnswer.question_id,
+            QuizAnswer.answer,
+            QuizAnswer.is_correct,
+            QuizAnswer.points,
+            Question.text,
+            Question.options,
+            Question.explanation,
+        ).outerjoin(QuizAnswer, QuizAnswer.attempt_id == QuizAttempt.id) \
+            .outerjoin(Question, Question.id == QuizAnswer.question_id) \
+            .filter(*criteria) \
+            .order_by(QuizAttempt.completed_at.desc(), QuizAttempt.id, QuizAnswer.question_id, QuizAnswer.id) \
+            .all()
+
+        reviews = {}
+        for row in rows:
+            review = reviews.get(row.id)
+            if review is None:
+                review = reviews[row.id] = {
+                    'id': row.id,
+                    'quizId': row.quiz_id,
+                    'score': row.score,
+                    'totalPoints': row.total_points,
+                    'completedAt': row.completed_at,
+                    'answers': [],
+                }
+            if row.answer_id is None:
+                continue
+            review['answers'].append({
+                'id': row.answer_id,
+                'questionId': row.question_id,
+                'question': row.text,
+                'options': row.options,
+                'answer': row.answer,
+                'isCorrect': row.is_correct,
+                'points': row.points,
+                'explanation': row.explanation,
+            })
+        return list(reviews.values())
+
     # --- User history & statistics for analytics pages ---
     def get_user_quiz_history(self, user_id: str):
         # Build history from attempts if exist, otherwise fabricate from progress
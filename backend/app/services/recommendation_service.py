@@ -0,0 +1,146 @@
+"""Item-item course recommendations from co-enrollment.
+
+An offline job (``flask build-recommendations``) builds a sparse user x course
+matrix. Each enrollment weighs 1 + log(1 + lessons completed in the course).
+The job takes the cosine similarity between course columns and stores each
+course's top-K neighbours in ``course_similarities``. Requests only merge the
+stored neighbours of the user's courses.
+
+The similarity step uses SciPy sparse matrices (NumPy and SciPy are in
+requirements.txt). An equivalent pure-Python computation covers installs
+without them.
+"""
+import math
+from datetime import datetime
+
+from sqlalchemy import and_, func, insert, select
+
+from app import db
+from app.models import Course, CourseSimilarity, Enrollment, LessonCompletion
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # pragma: no cover - optional dependency
+    np = sparse = None
+
+DEFAULT_TOP_K = 20
+INSERT_BATCH_SIZE = 5000
+SCORE_DIGITS = 6  # rounding keeps both implementations' rankings identical
+
+
+class RecommendationService:
+    def build(self, top_k=DEFAULT_TOP_K, use_scipy=None):
+        """Recompute every course's neighbours and replace the table; returns the number of rows"""
+        interactions = self._load_interactions()
+        if use_scipy is None:
+            use_scipy = sparse is not None
+        compute = self._neighbours_scipy if use_scipy else self._neighbours_python
+        neighbours = compute(interactions, top_k)
+
+        now = datetime.utcnow()
+        rows = [
+            {'course_id': course_id, 'similar_course_id': similar_id, 'score': score,
+             'rank': rank, 'computed_at': now}
+            for course_id, ranked in neighbours.items()
+            for rank, (similar_id, score) in enumerate(ranked, start=1)
+        ]
+        # Readers see the old neighbours until the new set commits
+        CourseSimilarity.query.delete(synchronize_session=False)
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            db.session.execute(insert(CourseSimilarity), rows[start:start + INSERT_BATCH_SIZE])
+        db.session.commit()
+
+        return len(rows)
+
+    def get_recommendations(self, user_id, limit=5):
+        """Published courses most similar to the user's enrollments, excluding those"""
+        enrolled = select(Enrollment.course_id).where(Enrollment.user_id == user_id)
+        score = func.sum(CourseSimilarity.score).label('score')
+        candidates = select(CourseSimilarity.similar_course_id, score) \
+            .where(CourseSimilarity.course_id.in_(enrolled), CourseSimilarity.similar_course_id.not_in(enrolled)) \
+            .group_by(CourseSimilarity.similar_course_id) \
+            .subquery()
+
+        rows = db.session.execute(
+            select(Course.id, Course.title, Course.description, Course.category, Course.difficulty,
+                   candidates.c.score)
+            .join(candidates, candidates.c.similar_course_id == Course.id)
+            .where(Course.is_published.is_(True))
+            .order_by(candidates.c.score.desc(), Course.id)
+            .limit(limit)
+        ).all()
+
+        return [{
+            'id': row.id,
+            'title': row.title,
+            'description': row.description,
+            'category': row.category,
+            'difficulty': row.difficulty,
+            'score': round(row.score, 4)
+        } for row in rows]
+
+    def _load_interactions(self):
+        """(user_id, course_id, weight) for every enrollment"""
+        completed = select(func.count(LessonCompletion.id)).where(and_(
+            LessonCompletion.user_id == Enrollment.user_id,
+            LessonCompletion.course_id == Enrollment.course_id,
+        )).scalar_subquery()
+        rows = db.session.execute(select(Enrollment.user_id, Enrollment.course_id, completed)).all()
+        return [(user_id, course_id, 1.0 + math.log1p(count)) for user_id, course_id, count in rows]
+
+    @staticmethod
+    def _top_k(scored, top_k):
+        ranked = sorted(((round(score, SCORE_DIGITS), course_id) for course_id, score in scored if score > 0),
+                        key=lambda item: (-item[0], item[1]))
+        return [(course_id, score) for score, course_id in ranked[:top_k]]
+
+    def _neighbours_scipy(self, interactions, top_k):
+        if not interactions:
+            return {}
+        users = {user_id: i for i, user_id in enumerate(dict.fromkeys(u for u, _, _ in interactions))}
+        course_ids = list(dict.fromkeys(c for _, c, _ in interactions))
+        courses = {course_id: i for i, course_id in enumerate(course_ids)}
+
+        matrix = sparse.csr_matrix((
+            np.array([w for _, _, w in interactions]),
+            (np.array([users[u] for u, _, _ in interactions]), np.array([courses[c] for _, c, _ in interactions])),
+        ), shape=(len(users), len(courses)))
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+        normalized = matrix @ sparse.diags(1.0 / norms)
+        similarity = (normalized.T @ normalized).tocsr()
+        similarity.setdiag(0)
+        similarity.eliminate_zeros()
+
+        neighbours = {}
+        for i, course_id in enumerate(course_ids):
+            start, end = similarity.indptr[i], similarity.indptr[i + 1]
+            scored = zip((course_ids[j] for j in similarity.indices[start:end]), similarity.data[start:end].tolist())
+            ranked = self._top_k(scored, top_k)
+            if ranked:
+                neighbours[course_id] = ranked
+        return neighbours
+
+    def _neighbours_python(self, interactions, top_k):
+        by_user, squared = {}, {}
+        for user_id, course_id, weight in interactions:
+            by_user.setdefault(user_id, []).append((course_id, weight))
+            squared[course_id] = squared.get(course_id, 0.0) + weight * weight
+
+        # Sparse X^T X: only pairs of courses that share a student are ever touched
+        dots = {}
+        for courses in by_user.values():
+            for a, wa in courses:
+                row = dots.setdefault(a, {})
+                for b, wb in courses:
+                    if a != b:
+                        row[b] = row.get(b, 0.0) + wa * wb
+
+        neighbours = {}
+        for course_id, row in dots.items():
+            norm = math.sqrt(squared[course_id])
+            ranked = self._top_k(((other, dot / (norm * math.sqrt(squared[other]))) for other, dot in row.items()),
+                                 top_k)
+            if ranked:
+                neighbours[course_id] = ranked
+        return neighbours
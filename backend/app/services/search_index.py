@@ -0,0 +1,141 @@
+"""Full-text index over course titles, descriptions and lesson text.
+
+One document per course lives in ``course_search``: an FTS5 virtual table on
+SQLite, and a table with a weighted, generated ``tsvector`` column and a GIN
+index on Postgres. Documents are rewritten per course inside the same
+transaction as the course or lesson write, so the index never lags the data.
+"""
+import re
+
+from sqlalchemy import event, select, text
+
+from app import db
+from app.models import Course, Lesson
+
+SEARCH_TABLE = 'course_search'
+
+SNIPPET_START, SNIPPET_END = '<mark>', '</mark>'
+
+_CREATE_DDL = {
+    'sqlite': [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+        "course_id UNINDEXED, published UNINDEXED, title, description, lessons, "
+        "tokenize = 'porter unicode61')",
+    ],
+    'postgresql': [
+        f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+        "course_id varchar(36) PRIMARY KEY, "
+        "published boolean NOT NULL DEFAULT false, "
+        "title text, description text, lessons text, "
+        "document tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(lessons, '')), 'C')) STORED)",
+        f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)",
+    ],
+}
+
+
+@event.listens_for(db.metadata, 'after_create')
+def _create_search_table(target, connection, **kw):
+    # create_all() (tests, benchmarks) gets the index too; deployments use the migration
+    for statement in _CREATE_DDL.get(connection.dialect.name, []):
+        connection.execute(text(statement))
+
+
+@event.listens_for(db.metadata, 'before_drop')
+def _drop_search_table(target, connection, **kw):
+    if connection.dialect.name in _CREATE_DDL:
+        connection.execute(text(f'DROP TABLE IF EXISTS {SEARCH_TABLE}'))
+
+
+class SearchIndex:
+    def index_course(self, course_id):
+        """Rewrite the course's document from the current (flushed) rows"""
+        db.session.flush()
+        course = db.session.execute(
+            select(Course.title, Course.description, Course.is_published).where(Course.id == course_id)
+        ).first()
+        if course is None:
+            return self.remove_course(course_id)
+
+        lessons = db.session.execute(
+            select(Lesson.title, Lesson.content).where(Lesson.course_id == course_id).order_by(Lesson.order)
+        ).all()
+        self.remove_course(course_id)
+        db.session.execute(text(
+            f'INSERT INTO {SEARCH_TABLE} (course_id, published, title, description, lessons) '
+            'VALUES (:course_id, :published, :title, :description, :lessons)'
+        ), {
+            'course_id': str(course_id),
+            'published': bool(course.is_published),
+            'title': course.title,
+            'description': course.description or '',
+            'lessons': '\n'.join(f'{title}\n{content or ""}' for title, content in lessons),
+        })
+
+    def remove_course(self, course_id):
+        db.session.execute(text(f'DELETE FROM {SEARCH_TABLE} WHERE course_id = :course_id'),
+                           {'course_id': str(course_id)})
+
+    def rebuild(self):
+        """Re-index every course; returns the number of documents"""
+        db.session.execute(text(f'DELETE FROM {SEARCH_TABLE}'))
+        course_ids = db.session.scalars(select(Course.id)).all()
+        for course_id in course_ids:
+            self.index_course(course_id)
+        db.session.commit()
+        return len(course_ids)
+
+    def search(self, query, limit=10, offset=0):
+        """Ranked (course_id, snippet) hits among published courses, best first, plus the total"""
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'sqlite':
+            return self._search_sqlite(query, limit, offset)
+        if dialect == 'postgresql':
+            return self._search_postgresql(query, limit, offset)
+        raise ValueError(f'Full-text search is not supported on {dialect}')
+
+    def _search_sqlite(self, query, limit, offset):
+        match = self._fts5_query(query)
+        if not match:
+            return [], 0
+        params = {'match': match, 'limit': limit, 'offset': offset}
+        # bm25 weights: title > description > lessons (course_id/published are unindexed)
+        rows = db.session.execute(text(
+            f"SELECT course_id, snippet({SEARCH_TABLE}, -1, :start, :end, '…', 16) "
+            f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match AND published = 1 "
+            f"ORDER BY bm25({SEARCH_TABLE}, 0, 0, 10.0, 4.0, 1.0), course_id LIMIT :limit OFFSET :offset"
+        ), {**params, 'start': SNIPPET_START, 'end': SNIPPET_END}).all()
+        total = db.session.execute(text(
+            f'SELECT count(*) FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :match AND published = 1'
+        ), params).scalar()
+        return [tuple(row) for row in rows], total
+
+    def _search_postgresql(self, query, limit, offset):
+        params = {'query': query, 'limit': limit, 'offset': offset}
+        # Headlines are expensive, so only the page of hits gets one
+        rows = db.session.execute(text(
+            "SELECT hits.course_id, ts_headline('english', concat_ws(' ', hits.title, hits.description, hits.lessons), "
+            "websearch_to_tsquery('english', :query), :options) "
+            "FROM (SELECT course_id, title, description, lessons, "
+            "ts_rank_cd(document, websearch_to_tsquery('english', :query)) AS rank "
+            f"FROM {SEARCH_TABLE} WHERE published AND document @@ websearch_to_tsquery('english', :query) "
+            "ORDER BY rank DESC, course_id LIMIT :limit OFFSET :offset) AS hits "
+            "ORDER BY hits.rank DESC, hits.course_id"
+        ), {**params, 'options': f'StartSel={SNIPPET_START}, StopSel={SNIPPET_END}, MaxWords=24, MinWords=8'}).all()
+        total = db.session.execute(text(
+            f"SELECT count(*) FROM {SEARCH_TABLE} "
+            "WHERE published AND document @@ websearch_to_tsquery('english', :query)"
+        ), params).scalar()
+        return [tuple(row) for row in rows], total
+
+    @staticmethod
+    def _fts5_query(query):
+        # Quote every term so user input can't inject FTS5 syntax; the last term matches as a prefix
+        terms = re.findall(r'\w+', query or '')
+        if not terms:
+            return ''
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += '*'
+        return ' '.join(quoted)
@@ -1,5 +1,9 @@
-from app.models import User, db
+from app.models import Course, User, db
+from app.services.activity_service import ActivityService, PROFILE_UPDATED, get_activity_log
+from app.services.course_service import course_cache_tag
 from app.services.file_service import FileService
+from app.utils.cache import get_cache
+from sqlalchemy import select
 from datetime import datetime
 import uuid
 
@@ -8,18 +12,28 @@ class UserService:
         """Get user by ID"""
         return User.query.get(user_id)
     
+    def get_profile_version(self, user_id):
+        """Profile identity and timestamp, for conditional GETs"""
+        return db.session.execute(
+            select(User.id, User.updated_at).where(User.id == user_id)
+        ).first()
+    
     def update_user_profile(self, user_id, data):
         """Update user profile"""
         user = User.query.get(user_id)
         if not user:
             return None
         
+        changed = []
         for key, value in data.items():
             if hasattr(user, key):
                 setattr(user, key, value)
+                changed.append(key)
         
         user.updated_at = datetime.utcnow()
         db.session.commit()
+        self._invalidate_taught_courses(user_id)
+        get_activity_log().record(user_id, PROFILE_UPDATED, data={'fields': changed})
         
         return user
     
@@ -35,9 +49,18 @@ class UserService:
         user.avatar = avatar_url
         user.updated_at = datetime.utcnow()
         db.session.commit()
+        self._invalidate_taught_courses(user_id)
+        get_activity_log().record(user_id, PROFILE_UPDATED, data={'fields': ['avatar']})
         
         return avatar_url
     
+    @staticmethod
+    def _invalidate_taught_courses(user_id):
+        """Cached course and catalog bodies embed the instructor, so drop those of the user's courses"""
+        course_ids = db.session.scalars(select(Course.id).where(Course.instructor_id == user_id)).all()
+        if course_ids:
+            get_cache().invalidate_tags([course_cache_tag(course_id) for course_id in course_ids])
+    
     def change_password(self, user_id, current_password, new_password):
         """Change user password"""
         user = User.query.get(user_id)
@@ -77,7 +100,6 @@ class UserService:
         # This would typically update a notifications table
         return True
     
-    def get_user_activity(self, user_id):
-        """Get user activity"""
-        # This would typically query an activity log table
-        return []
+    def get_user_activity(self, user_id, limit=20, cursor=None, fields=None):
+        """Get a page of user activity, newest first"""
+        return ActivityService().get_user_activity(user_id, limit, cursor, fields)
@@ -0,0 +1,60 @@
+from app.models import Enrollment, Progress, QuizAttempt, User, UserStats, db
+from app.utils.upsert import insert_ignoring_conflicts
+from sqlalchemy import func, literal, select
+from datetime import datetime
+
+class UserStatsService:
+    def bump(self, user_ids, **deltas):
+        """Add deltas to the users' snapshots inside the current transaction"""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        
+        # Make sure the rows exist, then increment in the database so concurrent writers don't lose updates
+        db.session.execute(insert_ignoring_conflicts(UserStats, [
+            {'user_id': user_id} for user_id in user_ids
+        ], ['user_id']))
+        UserStats.query.filter(UserStats.user_id.in_(user_ids)).update({
+            **{getattr(UserStats, column): getattr(UserStats, column) + delta for column, delta in deltas.items()},
+            UserStats.updated_at: datetime.utcnow()
+        }, synchronize_session=False)
+    
+    def get_metrics(self, user_id):
+        """Dashboard metrics from the user's snapshot"""
+        stats = db.session.get(UserStats, user_id)
+        if stats is None:
+            # First read for a user the backfill didn't cover
+            self.reconcile([user_id])
+            stats = db.session.get(UserStats, user_id)
+        if stats is None:  # unknown user
+            stats = UserStats(enrolled_courses=0, lessons_completed=0, quizzes_taken=0, quiz_score_total=0)
+        return stats.to_metrics()
+    
+    def reconcile(self, user_ids=None):
+        """Recompute snapshots from the source tables (every user by default) to correct drift"""
+        missing = select(User.id, literal(0), literal(0), literal(0), literal(0.0)).where(
+            ~select(UserStats.user_id).where(UserStats.user_id == User.id).exists()
+        )
+        if user_ids is not None:
+            missing = missing.where(User.id.in_(user_ids))
+        db.session.execute(UserStats.__table__.insert().from_select(
+            ['user_id', 'enrolled_courses', 'lessons_completed', 'quizzes_taken', 'quiz_score_total'], missing
+        ))
+        
+        query = UserStats.query
+        if user_ids is not None:
+            query = query.filter(UserStats.user_id.in_(user_ids))
+        attempts = select(QuizAttempt.id).where(QuizAttempt.user_id == UserStats.user_id)
+        updated = query.update({
+            UserStats.enrolled_courses: select(func.count(Enrollment.id))
+                .where(Enrollment.user_id == UserStats.user_id).scalar_subquery(),
+            UserStats.lessons_completed: select(func.coalesce(func.sum(Progress.completed_lessons), 0))
+                .where(Progress.user_id == UserStats.user_id).scalar_subquery(),
+            UserStats.quizzes_taken: attempts.with_only_columns(func.count(QuizAttempt.id)).scalar_subquery(),
+            UserStats.quiz_score_total: attempts.with_only_columns(func.coalesce(func.sum(QuizAttempt.score), 0))
+                .scalar_subquery(),
+            UserStats.updated_at: datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+        
+        return updated
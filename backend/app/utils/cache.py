@@ -0,0 +1,208 @@
+"""Pluggable response cache with tag-based invalidation.
+
+Backends share one small interface (get / set / delete / invalidate_tags / clear):
+
+- ``LRUCache``: in-process, bounded, per-entry TTL.
+- ``RedisCache``: shared between workers; talks to any redis-py compatible
+  client. ``LocalRedis`` is an in-memory stand-in used when the redis package
+  is not installed (local development and tests).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
+
+class LRUCache:
+    def __init__(self, max_entries=1024, default_ttl=300):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value, tags)
+        self._tags = {}  # tag -> set of keys
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl=None, tags=()):
+        expires_at = time.monotonic() + (ttl or self.default_ttl)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (expires_at, value, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_tags(self, tags):
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, set()):
+                    if key in self._entries:
+                        self._remove(key)
+                        removed += 1
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class LocalRedis:
+    """Minimal in-memory stand-in for the redis-py calls RedisCache makes"""
+
+    def __init__(self):
+        self._values = {}  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def _live(self, key):
+        entry = self._values.get(key)
+        if entry is not None and entry[0] is not None and entry[0] <= time.monotonic():
+            del self._values[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key)
+            return entry[1] if entry else None
+
+    def setex(self, key, ttl, value):
+        with self._lock:
+            self._values[key] = (time.monotonic() + ttl, value)
+
+    def sadd(self, key, *members):
+        with self._lock:
+            entry = self._live(key)
+            members_set = entry[1] if entry else set()
+            members_set.update(members)
+            self._values[key] = (entry[0] if entry else None, members_set)
+
+    def smembers(self, key):
+        with self._lock:
+            entry = self._live(key)
+            return set(entry[1]) if entry else set()
+
+    def expire(self, key, ttl):
+        with self._lock:
+            entry = self._live(key)
+            if entry:
+                self._values[key] = (time.monotonic() + ttl, entry[1])
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(1 for key in keys if self._values.pop(key, None) is not None)
+
+    def flushdb(self):
+        with self._lock:
+            self._values.clear()
+
+
+class RedisCache:
+    def __init__(self, client, default_ttl=300, prefix='neuralearn:cache:'):
+        self.client = client
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl=None, tags=()):
+        ttl = ttl or self.default_ttl
+        self.client.setex(self.prefix + key, ttl, value)
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            self.client.sadd(tag_key, self.prefix + key)
+            self.client.expire(tag_key, ttl)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def invalidate_tags(self, tags):
+        removed = 0
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            keys = self.client.smembers(tag_key)
+            if keys:
+                removed += self.client.delete(*keys)
+            self.client.delete(tag_key)
+        return removed
+
+    def clear(self):
+        if hasattr(self.client, 'flushdb'):
+            self.client.flushdb()
+
+    def _tag_key(self, tag):
+        return f'{self.prefix}tag:{tag}'
+
+
+class NullCache:
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl=None, tags=()):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def invalidate_tags(self, tags):
+        return 0
+
+    def clear(self):
+        pass
+
+
+def create_cache(config):
+    backend = (config.get('CACHE_BACKEND') or 'memory').lower()
+    ttl = config.get('CACHE_DEFAULT_TTL', 300)
+    if backend == 'memory':
+        return LRUCache(max_entries=config.get('CACHE_MAX_ENTRIES', 1024), default_ttl=ttl)
+    if backend == 'redis':
+        if redis is not None and config.get('REDIS_URL'):
+            client = redis.Redis.from_url(config['REDIS_URL'])
+        else:
+            client = LocalRedis()
+        return RedisCache(client, default_ttl=ttl)
+    if backend == 'none':
+        return NullCache()
+    raise ValueError(f'Unknown cache backend: {backend}')
+
+
+def init_cache(app):
+    app.extensions['cache'] = create_cache(app.config)
+
+
+def get_cache():
+    return current_app.extensions.get('cache') or NullCache()
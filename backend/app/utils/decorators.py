@@ -1,7 +1,12 @@
+import hashlib
+from datetime import datetime, timezone
+from decimal import Decimal
 from functools import wraps
-from flask import request, jsonify
+from urllib.parse import urlencode
+from flask import request, jsonify, current_app, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import User
+from app.utils.cache import get_cache
 
 def validate_json(required_fields):
     """Decorator to validate required JSON fields"""
@@ -137,13 +142,83 @@ def handle_errors(f):
             return jsonify({'message': 'Internal server error'}), 500
     return decorated_function
 
-def cache_response(ttl=300):
-    """Decorator to cache response (placeholder)"""
+def cache_response(ttl=None, tags=None):
+    """Decorator to cache successful GET responses, keyed by endpoint, view args and query string.
+
+    `ttl` defaults to CACHE_DEFAULT_TTL; `tags(view_args, query_args, payload)` names the
+    entries so writes can invalidate them.
+    """
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            # In a real implementation, you would use Redis or similar
-            # to cache responses
-            return f(*args, **kwargs)
+            if request.method != 'GET':
+                return f(*args, **kwargs)
+            
+            cache = get_cache()
+            key = _response_cache_key(request.endpoint, kwargs, request.args)
+            body = cache.get(key)
+            if body is not None:
+                response = current_app.response_class(body, status=200, mimetype='application/json')
+                response.headers['X-Cache'] = 'HIT'
+                return response
+            
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                entry_tags = tags(kwargs, request.args, response.get_json(silent=True)) if tags else ()
+                cache.set(key, response.get_data(), ttl, entry_tags)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return decorated_function
+    return decorator
+
+def _response_cache_key(endpoint, view_args, query_args):
+    params = sorted(query_args.items(multi=True))
+    return f'{endpoint}:{sorted(view_args.items())}:{urlencode(params)}'
+
+def conditional_get(version):
+    """Decorator adding a weak ETag and Last-Modified to GET responses and answering 304 when unchanged.
+
+    `version(**view_args)` returns a tuple of values that change with the resource (timestamps,
+    counts) from one cheap query, or None when it does not exist; the view only runs on a mismatch.
+    Last-Modified is only sent when the version has no counts.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            parts = version(**kwargs)
+            if parts is None:
+                return f(*args, **kwargs)
+            
+            # The query string selects fields/includes, so it is part of the representation
+            digest = hashlib.sha1(f'{tuple(parts)!r}|{request.query_string.decode()}'.encode()).hexdigest()
+            timestamps = [p for p in parts if isinstance(p, datetime)]
+            # Counters (lesson counts, enrollment totals) change without moving a timestamp, so when the
+            # version has any, only the ETag is a safe validator and If-Modified-Since is not honoured
+            has_counters = any(isinstance(p, (int, float, Decimal)) and not isinstance(p, bool) for p in parts)
+            last_modified = None
+            if timestamps and not has_counters:
+                last_modified = max(timestamps).replace(tzinfo=timezone.utc, microsecond=0)
+            
+            if _not_modified(digest, last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(digest, weak=True)
+            if last_modified:
+                response.last_modified = last_modified
+            return response
         return decorated_function
     return decorator
+
+def _not_modified(etag, last_modified):
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    since = request.if_modified_since
+    if since and last_modified:
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified <= since
+    return False
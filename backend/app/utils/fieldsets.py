@@ -0,0 +1,49 @@
+from typing import Dict, Iterable, Optional, Set
+
+
+def parse_fieldset(value: Optional[str]) -> Optional[Set[str]]:
+    """Parse a comma separated `fields`/`include` query value (None when absent)"""
+    if value is None:
+        return None
+    return {part.strip() for part in value.split(',') if part.strip()}
+
+
+def nested_include(include: Optional[Set[str]], name: str) -> Optional[Set[str]]:
+    """Includes for a nested relationship: the dotted children of `name`"""
+    if include is None:
+        return None
+    prefix = f'{name}.'
+    return {path[len(prefix):] for path in include if path.startswith(prefix)}
+
+
+def wants(selection: Optional[Set[str]], key: str) -> bool:
+    """Whether `key` is requested (no selection means everything)"""
+    return selection is None or key in selection
+
+
+def wants_relation(fields: Optional[Set[str]], include: Optional[Set[str]], key: str) -> bool:
+    """Whether relationship `key` is embedded: named in `include` or `fields`.
+
+    With neither given everything is embedded; a `fields` selection alone leaves out
+    the relationships it doesn't name.
+    """
+    if include is None and fields is None:
+        return True
+    return key in (include or ()) or key in (fields or ())
+
+
+def project(item: Dict, fields: Optional[Set[str]]) -> Dict:
+    """Keep only the requested keys (`id` is always kept).
+
+    Callable values are evaluated only when their key survives the projection,
+    so expensive attributes can be passed as lambdas.
+    """
+    return {
+        key: value() if callable(value) else value
+        for key, value in item.items()
+        if key == 'id' or wants(fields, key)
+    }
+
+
+def project_all(items: Iterable[Dict], fields: Optional[Set[str]]):
+    return [project(item, fields) for item in items]
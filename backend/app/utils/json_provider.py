@@ -0,0 +1,70 @@
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Stdlib json with ISO 8601 timestamps so its output matches the orjson provider"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, (datetime, date)):
+            return o.isoformat()
+        if isinstance(o, uuid.UUID):
+            return str(o)
+        if isinstance(o, Decimal):
+            return str(o)
+        return DefaultJSONProvider.default(o)
+
+
+class OrjsonJSONProvider(StdlibJSONProvider):
+    """orjson-backed provider; datetimes and UUIDs are encoded natively in C"""
+
+    def dumps(self, obj, **kwargs):
+        return self._encode(obj, indent=bool(kwargs.get('indent'))).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Skip the bytes -> str -> bytes round trip of the default implementation
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._encode(obj, indent=indent) + b'\n', mimetype=self.mimetype)
+
+    def _encode(self, obj, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+
+JSON_PROVIDERS = {
+    'stdlib': StdlibJSONProvider,
+    'orjson': OrjsonJSONProvider,
+}
+
+
+def get_json_provider_class(name=None):
+    """Resolve a provider by name, falling back to stdlib when orjson is unavailable"""
+    name = (name or 'orjson').lower()
+    if name == 'orjson' and orjson is None:
+        name = 'stdlib'
+    if name not in JSON_PROVIDERS:
+        raise ValueError(f'Unknown JSON provider: {name}')
+    return JSON_PROVIDERS[name]
+
+
+def install_json_provider(app):
+    provider_class = get_json_provider_class(app.config.get('JSON_PROVIDER'))
+    app.json_provider_class = provider_class
+    app.json = provider_class(app)
@@ -0,0 +1,23 @@
+"""Dialect-aware INSERT ... ON CONFLICT DO NOTHING.
+
+Postgres and SQLite (3.24+) share the same syntax; both return only the rows
+actually inserted from RETURNING, so callers can tell new rows from existing ones.
+"""
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import db
+
+_DIALECT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def insert_ignoring_conflicts(model, rows, conflict_columns):
+    """Build a multi-row insert of `rows` that skips rows conflicting on `conflict_columns`"""
+    dialect = db.session.get_bind().dialect.name
+    try:
+        dialect_insert = _DIALECT_INSERTS[dialect]
+    except KeyError:
+        raise ValueError(f'INSERT ... ON CONFLICT is not supported on {dialect}')
+    return dialect_insert(model).values(rows).on_conflict_do_nothing(index_elements=conflict_columns)
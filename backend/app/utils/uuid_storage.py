@@ -0,0 +1,138 @@
+"""Batched, resumable conversion of string UUID keys to compact native storage.
+
+SQLite rewrites values in place (TEXT -> 16-byte BLOB) a batch at a time; rows
+still holding text are picked up again on the next run. Postgres backfills a
+shadow ``uuid`` column in batches and then swaps all columns in one short
+transaction, recreating keys, indexes and foreign keys from the model metadata.
+"""
+import uuid
+
+from sqlalchemy import UniqueConstraint, inspect, text
+from sqlalchemy.schema import AddConstraint, CreateIndex
+
+from app.models.types import UUIDString
+
+SHADOW_SUFFIX = '__uuid'
+
+
+def uuid_columns(metadata):
+    """(table, column) pairs declared with UUIDString, parents first"""
+    return [
+        (table, column)
+        for table in metadata.sorted_tables
+        for column in table.columns
+        if isinstance(column.type, UUIDString)
+    ]
+
+
+def convert_to_compact_uuids(engine, metadata, batch_size=5000, log=print):
+    """Convert every UUIDString column; safe to re-run after an interruption"""
+    if engine.dialect.name == 'sqlite':
+        return _convert_sqlite(engine, metadata, batch_size, log)
+    if engine.dialect.name == 'postgresql':
+        return _convert_postgresql(engine, metadata, batch_size, log)
+    raise ValueError(f'Compact UUID storage is not supported on {engine.dialect.name}')
+
+
+def _convert_sqlite(engine, metadata, batch_size, log):
+    converted = 0
+    for table, column in uuid_columns(metadata):
+        select_batch = text(
+            f'SELECT rowid, "{column.name}" FROM "{table.name}" '
+            f'WHERE typeof("{column.name}") = \'text\' LIMIT :limit'
+        )
+        update_row = text(f'UPDATE "{table.name}" SET "{column.name}" = :value WHERE rowid = :rowid')
+        while True:
+            # One transaction per batch keeps locks short and makes progress durable
+            with engine.begin() as conn:
+                rows = conn.execute(select_batch, {'limit': batch_size}).fetchall()
+                if not rows:
+                    break
+                conn.execute(update_row, [
+                    {'value': _uuid_bytes(table, column, value), 'rowid': rowid}
+                    for rowid, value in rows
+                ])
+            converted += len(rows)
+            log(f'{table.name}.{column.name}: converted {len(rows)} rows')
+    return converted
+
+
+def _convert_postgresql(engine, metadata, batch_size, log):
+    columns = [
+        (table, column) for table, column in uuid_columns(metadata)
+        if _pg_column_type(engine, table.name, column.name) != 'uuid'
+    ]
+    if not columns:
+        return 0
+
+    converted = 0
+    for table, column in columns:
+        shadow = column.name + SHADOW_SUFFIX
+        with engine.begin() as conn:
+            conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN IF NOT EXISTS "{shadow}" uuid'))
+        backfill = text(
+            f'UPDATE "{table.name}" SET "{shadow}" = "{column.name}"::uuid WHERE ctid IN ('
+            f'SELECT ctid FROM "{table.name}" WHERE "{shadow}" IS NULL AND "{column.name}" IS NOT NULL '
+            f'LIMIT :limit)'
+        )
+        while True:
+            with engine.begin() as conn:
+                count = conn.execute(backfill, {'limit': batch_size}).rowcount
+            if not count:
+                break
+            converted += count
+            log(f'{table.name}.{column.name}: backfilled {count} rows')
+
+    _swap_postgresql_columns(engine, metadata, columns, log)
+    return converted
+
+
+def _swap_postgresql_columns(engine, metadata, columns, log):
+    affected = {(table.name, column.name) for table, column in columns}
+    tables = {table.name: table for table, _ in columns}
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in metadata.sorted_tables:
+            for fk in inspector.get_foreign_keys(table.name):
+                conn.execute(text(f'ALTER TABLE "{table.name}" DROP CONSTRAINT "{fk["name"]}"'))
+
+        # CASCADE drops the primary keys, unique constraints and indexes on the old columns
+        for table, column in columns:
+            shadow = column.name + SHADOW_SUFFIX
+            conn.execute(text(f'ALTER TABLE "{table.name}" DROP COLUMN "{column.name}" CASCADE'))
+            conn.execute(text(f'ALTER TABLE "{table.name}" RENAME COLUMN "{shadow}" TO "{column.name}"'))
+            if not column.nullable:
+                conn.execute(text(f'ALTER TABLE "{table.name}" ALTER COLUMN "{column.name}" SET NOT NULL'))
+
+        def touches(table, cols):
+            return any((table.name, c.name) in affected for c in cols)
+
+        for table in tables.values():
+            if touches(table, table.primary_key.columns):
+                conn.execute(AddConstraint(table.primary_key))
+            for constraint in table.constraints:
+                if isinstance(constraint, UniqueConstraint) and touches(table, constraint.columns):
+                    conn.execute(AddConstraint(constraint))
+            for index in table.indexes:
+                if touches(table, index.columns):
+                    conn.execute(CreateIndex(index))
+
+        for table in metadata.sorted_tables:
+            for fk in table.foreign_key_constraints:
+                conn.execute(AddConstraint(fk))
+    log(f'Swapped {len(columns)} columns to native uuid')
+
+
+def _pg_column_type(engine, table_name, column_name):
+    with engine.connect() as conn:
+        return conn.execute(text(
+            'SELECT data_type FROM information_schema.columns '
+            'WHERE table_name = :table AND column_name = :column'
+        ), {'table': table_name, 'column': column_name}).scalar()
+
+
+def _uuid_bytes(table, column, value):
+    try:
+        return uuid.UUID(value).bytes
+    except ValueError:
+        raise ValueError(f'{table.name}.{column.name} holds a non-UUID value: {value!r}')
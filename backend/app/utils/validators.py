@@ -1,4 +1,5 @@
 import re
+from datetime import datetime
 from typing import Dict, List
 
 def validate_email(email: str) -> bool:
@@ -81,19 +82,25 @@ def validate_lesson_data(data: Dict) -> Dict[str, any]:
     """Validate lesson data"""
     errors = []
     
-    if not data.get('title') or len(data['title'].strip()) < 3:
-        errors.append('Title must be at least 3 characters long')
+    # Imported rows come straight from JSON, so check types before touching string methods
+    for key, label, minimum in (('title', 'Title', 3), ('description', 'Description', 10), ('content', 'Content', 20)):
+        value = data.get(key)
+        if value is not None and not isinstance(value, str):
+            errors.append(f'{label} must be a string')
+        elif not value or len(value.strip()) < minimum:
+            errors.append(f'{label} must be at least {minimum} characters long')
     
-    if not data.get('description') or len(data['description'].strip()) < 10:
-        errors.append('Description must be at least 10 characters long')
+    if isinstance(data.get('title'), str) and len(data['title']) > 200:
+        errors.append('Title must be at most 200 characters long')
     
-    if not data.get('content') or len(data['content'].strip()) < 20:
-        errors.append('Content must be at least 20 characters long')
+    video_url = data.get('videoUrl')
+    if video_url is not None and (not isinstance(video_url, str) or len(video_url) > 255):
+        errors.append('Video URL must be a string of at most 255 characters')
     
-    if not isinstance(data.get('duration'), int) or data['duration'] < 1:
+    if not isinstance(data.get('duration'), int) or isinstance(data['duration'], bool) or data['duration'] < 1:
         errors.append('Duration must be a positive integer')
     
-    if not isinstance(data.get('order'), int) or data['order'] < 0:
+    if not isinstance(data.get('order'), int) or isinstance(data['order'], bool) or data['order'] < 0:
         errors.append('Order must be a non-negative integer')
     
     return {
@@ -151,3 +158,36 @@ def validate_question_data(data: Dict) -> Dict[str, any]:
         'is_valid': len(errors) == 0,
         'errors': errors
     }
+
+def validate_completion_event(data: Dict) -> Dict[str, any]:
+    """Validate an offline lesson completion event"""
+    errors = []
+    
+    if not isinstance(data.get('lessonId'), str) or not data['lessonId']:
+        errors.append('lessonId is required')
+    
+    completed_at = data.get('completedAt')
+    if completed_at is not None:
+        try:
+            parse_iso_datetime(completed_at)
+        except (TypeError, ValueError, AttributeError):
+            errors.append('completedAt must be an ISO 8601 timestamp')
+    
+    minutes = data.get('timeSpentMinutes', 0)
+    if not isinstance(minutes, int) or isinstance(minutes, bool) or minutes < 0:
+        errors.append('timeSpentMinutes must be a non-negative integer')
+    
+    score = data.get('score')
+    if score is not None and (not isinstance(score, (int, float)) or isinstance(score, bool) or not 0 <= score <= 100):
+        errors.append('Score must be between 0 and 100')
+    
+    return {
+        'is_valid': len(errors) == 0,
+        'errors': errors
+    }
+
+def parse_iso_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, including the 'Z' suffix fromisoformat rejects before Python 3.11"""
+    if value.endswith(('Z', 'z')):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
@@ -0,0 +1,105 @@
+"""Latency of the completed-lessons summary: the old five aggregate queries vs one statement.
+
+Seeds a learner with 10k lesson completions (plus progress snapshots) and
+times `AnalyticsService.completed_lessons_summary` against the previous
+query-per-figure implementation. SQLite in memory has no network round-trip,
+so the gap is larger against a remote PostgreSQL; the statement count is
+printed alongside.
+
+Usage (from backend/):
+    python benchmarks/bench_completed_summary.py [--completions 10000] [--repeat 50]
+"""
+import argparse
+import os
+import sys
+import timeit
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
+
+from sqlalchemy import event, func, insert
+
+from app import create_app, db
+from app.models import User, Course, Lesson, Progress, LessonCompletion
+from app.services.analytics_service import AnalyticsService
+
+LESSONS_PER_COURSE = 100
+USER_ID = 'bench-learner'
+
+
+def five_queries(user_id):
+    """The summary as it was computed before, one aggregate per figure"""
+    total_completed = db.session.query(func.count(LessonCompletion.id)) \
+        .filter(LessonCompletion.user_id == user_id).scalar() or 0
+    if total_completed == 0:
+        total_completed = db.session.query(func.coalesce(func.sum(Progress.completed_lessons), 0)) \
+            .filter(Progress.user_id == user_id).scalar() or 0
+    avg_score = db.session.query(func.avg(LessonCompletion.score)) \
+        .filter(LessonCompletion.user_id == user_id, LessonCompletion.score.isnot(None)).scalar()
+    if avg_score is None:
+        avg_score = db.session.query(func.coalesce(func.avg(Progress.average_score), 0)) \
+            .filter(Progress.user_id == user_id).scalar() or 0
+    total_minutes = db.session.query(func.coalesce(func.sum(LessonCompletion.time_spent_minutes), 0)) \
+        .filter(LessonCompletion.user_id == user_id).scalar() or 0
+    return int(total_completed), round(float(avg_score), 1), total_minutes
+
+
+def seed(n_completions):
+    now = datetime.utcnow()
+    n_courses = -(-n_completions // LESSONS_PER_COURSE)
+    db.session.execute(insert(User), [{'id': USER_ID, 'email': 'bench-learner@example.com', 'password_hash': 'x',
+                                       'first_name': 'Bench', 'last_name': 'Learner', 'role': 'student'}])
+    courses = [{'id': str(uuid.uuid4()), 'title': f'C{i}', 'instructor_id': USER_ID, 'created_at': now,
+                'updated_at': now} for i in range(n_courses)]
+    lessons = [{'id': str(uuid.uuid4()), 'title': f'L{o}', 'course_id': c['id'], 'order': o, 'created_at': now,
+                'updated_at': now} for c in courses for o in range(LESSONS_PER_COURSE)]
+    progress = [{'id': str(uuid.uuid4()), 'user_id': USER_ID, 'course_id': c['id'],
+                 'completed_lessons': LESSONS_PER_COURSE, 'average_score': 75, 'last_accessed_at': now,
+                 'created_at': now, 'updated_at': now} for c in courses]
+    completions = [{'id': str(uuid.uuid4()), 'user_id': USER_ID, 'course_id': lesson['course_id'],
+                    'lesson_id': lesson['id'], 'time_spent_minutes': 12, 'score': i % 101, 'completed_at': now}
+                   for i, lesson in enumerate(lessons[:n_completions])]
+    for model, rows in [(Course, courses), (Lesson, lessons), (Progress, progress), (LessonCompletion, completions)]:
+        db.session.execute(insert(model), rows)
+    db.session.commit()
+
+
+def count_statements(fn):
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        fn()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    return len(statements)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--completions', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed(args.completions)
+        variants = {
+            'five queries': lambda: five_queries(USER_ID),
+            'one statement': lambda: AnalyticsService().completed_lessons_summary(USER_ID),
+        }
+        print(f'{"summary":<16}{"statements":>12}{"ms/op":>10}')
+        timings = {}
+        for name, fn in variants.items():
+            fn()  # warm up
+            timings[name] = min(timeit.repeat(fn, number=1, repeat=args.repeat)) * 1000
+            print(f'{name:<16}{count_statements(fn):>12}{timings[name]:>10.3f}')
+        print(f'{"speedup":<16}{"":>12}{timings["five queries"] / timings["one statement"]:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
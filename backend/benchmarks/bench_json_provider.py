@@ -0,0 +1,78 @@
+"""Compare the stdlib and orjson providers on real API payloads.
+
+Usage (from backend/):
+    python benchmarks/bench_json_provider.py [--courses 200] [--attempts 500] [--repeat 200]
+"""
+import argparse
+import os
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
+
+from app import create_app, db
+from app.models import User, Course, Lesson, Quiz, QuizAttempt
+from app.services.course_service import CourseService
+from app.services.quiz_service import QuizService
+from app.utils.json_provider import OrjsonJSONProvider, StdlibJSONProvider
+
+
+def seed(n_courses, n_attempts):
+    instructor = User(id=str(uuid.uuid4()), email='bench-instructor@example.com', first_name='Bench', last_name='Instructor', role='instructor')
+    instructor.set_password('pw')
+    student = User(id=str(uuid.uuid4()), email='bench-student@example.com', first_name='Bench', last_name='Student')
+    student.set_password('pw')
+    db.session.add_all([instructor, student])
+    courses = []
+    for i in range(n_courses):
+        course = Course(id=str(uuid.uuid4()), title=f'Course {i}', description='Benchmark course ' * 5,
+                        instructor_id=instructor.id, category='Bench', difficulty='beginner', is_published=True)
+        courses.append(course)
+        db.session.add(course)
+        for order in range(5):
+            db.session.add(Lesson(id=str(uuid.uuid4()), title=f'Lesson {order}', description='Lesson description',
+                                  content='Lesson content ' * 40, duration=15, order=order, course_id=course.id))
+    quizzes = [Quiz(id=str(uuid.uuid4()), title=f'Quiz {i}', course_id=c.id) for i, c in enumerate(courses)]
+    db.session.add_all(quizzes)
+    start = datetime.utcnow()
+    for i in range(n_attempts):
+        db.session.add(QuizAttempt(id=str(uuid.uuid4()), user_id=student.id, quiz_id=quizzes[i % len(quizzes)].id,
+                                   score=75.0, total_points=10, completed_at=start - timedelta(minutes=i)))
+    db.session.commit()
+    return student.id
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--courses', type=int, default=200)
+    parser.add_argument('--attempts', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        student_id = seed(args.courses, args.attempts)
+        payloads = {
+            'course catalog': {'success': True, 'data': CourseService().get_courses(page=1, limit=args.courses)},
+            'quiz history': {'success': True, 'data': QuizService().get_user_quiz_history(student_id)},
+        }
+        providers = {'stdlib': StdlibJSONProvider(app), 'orjson': OrjsonJSONProvider(app)}
+
+        print(f'{"payload":<16}{"provider":<10}{"bytes":>10}{"ms/op":>10}')
+        for name, payload in payloads.items():
+            timings = {}
+            for provider_name, provider in providers.items():
+                size = len(provider.response(payload).get_data())
+                seconds = timeit.timeit(lambda: provider.response(payload), number=args.repeat)
+                timings[provider_name] = seconds / args.repeat * 1000
+                print(f'{name:<16}{provider_name:<10}{size:>10}{timings[provider_name]:>10.3f}')
+            print(f'{name:<16}{"speedup":<10}{"":>10}{timings["stdlib"] / timings["orjson"]:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
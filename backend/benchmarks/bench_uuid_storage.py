@@ -0,0 +1,113 @@
+"""Index size and join latency before/after converting UUID keys to 16-byte storage.
+
+Builds a SQLite database with string UUID keys, measures, runs the same
+batched conversion as `flask compact-uuids`, VACUUMs and measures again.
+
+Usage (from backend/):
+    python benchmarks/bench_uuid_storage.py [--users 5000] [--courses 200] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import timeit
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+DB_PATH = Path(tempfile.mkdtemp()) / 'uuid_bench.db'
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+
+from sqlalchemy import insert, text
+
+from app import create_app, db
+from app.models import User, Course, Quiz, Question, QuizAttempt, QuizAnswer, Enrollment, Progress
+from app.utils.uuid_storage import convert_to_compact_uuids
+
+TABLES = ['enrollments', 'progress', 'quiz_attempts', 'quiz_answers']
+JOINS = {
+    'enrollments x progress': (
+        'SELECT count(*) FROM enrollments e JOIN progress p '
+        'ON p.user_id = e.user_id AND p.course_id = e.course_id'
+    ),
+    'quiz_answers x quiz_attempts': (
+        'SELECT count(*) FROM quiz_answers a JOIN quiz_attempts t ON t.id = a.attempt_id'
+    ),
+}
+
+
+def new_id():
+    return str(uuid.uuid4())
+
+
+def seed(n_users, n_courses):
+    now = datetime.utcnow()
+    users = [{'id': new_id(), 'email': f'b{i}@example.com', 'password_hash': 'x', 'first_name': 'B',
+              'last_name': str(i), 'role': 'student'} for i in range(n_users)]
+    courses = [{'id': new_id(), 'title': f'C{i}', 'instructor_id': users[0]['id'], 'created_at': now,
+                'updated_at': now} for i in range(n_courses)]
+    quizzes = [{'id': new_id(), 'title': 'Q', 'course_id': c['id'], 'created_at': now, 'updated_at': now} for c in courses]
+    questions = [{'id': new_id(), 'text': 'q', 'type': 'short_answer', 'correct_answer': 'a', 'quiz_id': q['id'],
+                  'created_at': now, 'updated_at': now} for q in quizzes for _ in range(3)]
+    enrollments, progress, attempts, answers = [], [], [], []
+    for user in users:
+        for course_index in random.sample(range(n_courses), 3):
+            course, quiz = courses[course_index], quizzes[course_index]
+            enrollments.append({'id': new_id(), 'user_id': user['id'], 'course_id': course['id'], 'enrolled_at': now})
+            progress.append({'id': new_id(), 'user_id': user['id'], 'course_id': course['id'], 'completed_lessons': 1,
+                             'last_accessed_at': now, 'created_at': now, 'updated_at': now})
+            attempt = {'id': new_id(), 'user_id': user['id'], 'quiz_id': quiz['id'], 'score': 50,
+                       'completed_at': now, 'created_at': now}
+            attempts.append(attempt)
+            answers.extend({'id': new_id(), 'question_id': q['id'], 'answer': 'a', 'attempt_id': attempt['id']}
+                           for q in questions[course_index * 3:course_index * 3 + 3])
+    for model, rows in [(User, users), (Course, courses), (Quiz, quizzes), (Question, questions),
+                        (Enrollment, enrollments), (Progress, progress), (QuizAttempt, attempts), (QuizAnswer, answers)]:
+        db.session.execute(insert(model), rows)
+    db.session.commit()
+
+
+def measure(repeat):
+    with db.engine.connect() as conn:
+        sizes = dict(conn.execute(text(
+            'SELECT m.tbl_name, SUM(s.pgsize) FROM dbstat s JOIN sqlite_master m ON m.name = s.name '
+            "WHERE m.type = 'index' GROUP BY m.tbl_name"
+        )).fetchall())
+        latencies = {
+            name: min(timeit.repeat(lambda: conn.execute(text(sql)).scalar(), number=1, repeat=repeat)) * 1000
+            for name, sql in JOINS.items()
+        }
+    return {table: sizes.get(table, 0) for table in TABLES}, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--courses', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed(args.users, args.courses)
+        before = measure(args.repeat)
+        convert_to_compact_uuids(db.engine, db.metadata, batch_size=5000, log=lambda message: None)
+        with db.engine.connect() as conn:
+            conn.exec_driver_sql('VACUUM')
+        after = measure(args.repeat)
+
+    print(f'{"index size (KiB)":<32}{"string(36)":>12}{"blob(16)":>12}{"change":>10}')
+    for table in TABLES:
+        b, a = before[0][table] / 1024, after[0][table] / 1024
+        print(f'{table:<32}{b:>12.0f}{a:>12.0f}{(a - b) / b * 100:>9.0f}%')
+    print(f'{"join latency (ms)":<32}{"string(36)":>12}{"blob(16)":>12}{"change":>10}')
+    for name in JOINS:
+        b, a = before[1][name], after[1][name]
+        print(f'{name:<32}{b:>12.1f}{a:>12.1f}{(a - b) / b * 100:>9.0f}%')
+
+
+if __name__ == '__main__':
+    main()
@@ -12,6 +12,20 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = False
     JWT_REFRESH_TOKEN_EXPIRES = False
     HUGGINGFACE_API_KEY = os.environ.get('HUGGINGFACE_API_KEY')
+    HOT_COURSE_ENROLLMENT_THRESHOLD = int(os.environ.get('HOT_COURSE_ENROLLMENT_THRESHOLD', 1000))
+    ENROLLMENT_COUNTER_SHARDS = int(os.environ.get('ENROLLMENT_COUNTER_SHARDS', 16))
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'orjson')
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    CACHE_DEFAULT_TTL = int(os.environ.get('CACHE_DEFAULT_TTL', 300))
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 1024))
+    REDIS_URL = os.environ.get('REDIS_URL')
+    FACET_INDEX_MAX_AGE = int(os.environ.get('FACET_INDEX_MAX_AGE', 300))
+    DASHBOARD_SUMMARY_WORKERS = int(os.environ.get('DASHBOARD_SUMMARY_WORKERS', 4))
+    DASHBOARD_SECTION_TIMEOUT = float(os.environ.get('DASHBOARD_SECTION_TIMEOUT', 2.0))
+    DASHBOARD_SUMMARY_MAX_INFLIGHT = int(os.environ.get('DASHBOARD_SUMMARY_MAX_INFLIGHT', 2))
+    ACTIVITY_LOG_BATCH_SIZE = int(os.environ.get('ACTIVITY_LOG_BATCH_SIZE', 500))
+    ACTIVITY_LOG_FLUSH_INTERVAL = float(os.environ.get('ACTIVITY_LOG_FLUSH_INTERVAL', 1.0))
+    UPCOMING_QUIZ_CACHE_TTL = int(os.environ.get('UPCOMING_QUIZ_CACHE_TTL', 60))
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or 'uploads'
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # 16MB
 
@@ -0,0 +1,56 @@
+# Backend migrations/script.py.mako
+"""add unique lesson completion
+
+Revision ID: 2b7e9c4d6f18
+Revises: 5a1c8e3f7d20
+Create Date: 2026-10-18 14:05:12.318840
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2b7e9c4d6f18'
+down_revision = '5a1c8e3f7d20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Each duplicate completion also bumped progress, so take the extra rows back off first
+    duplicates = (
+        '(SELECT COUNT(*) - COUNT(DISTINCT lesson_completions.lesson_id) FROM lesson_completions '
+        'WHERE lesson_completions.user_id = progress.user_id '
+        'AND lesson_completions.course_id = progress.course_id)'
+    )
+    op.execute(
+        f'UPDATE progress SET completed_lessons = CASE WHEN completed_lessons > {duplicates} '
+        f'THEN completed_lessons - {duplicates} ELSE 0 END '
+        f'WHERE {duplicates} > 0'
+    )
+
+    # Retried completion requests may have recorded the same lesson twice; keep one row per pair
+    op.execute(
+        'DELETE FROM lesson_completions WHERE EXISTS ('
+        'SELECT 1 FROM lesson_completions AS other '
+        'WHERE other.user_id = lesson_completions.user_id '
+        'AND other.lesson_id = lesson_completions.lesson_id '
+        'AND other.id < lesson_completions.id)'
+    )
+    with op.batch_alter_table('lesson_completions', schema=None) as batch_op:
+        batch_op.create_unique_constraint('unique_lesson_completion', ['user_id', 'lesson_id'])
+
+    # user_stats is created (and backfilled from progress) by a later revision; recompute it
+    # here only where it already exists
+    if 'user_stats' in sa.inspect(op.get_bind()).get_table_names():
+        op.execute(
+            'UPDATE user_stats SET lessons_completed = ('
+            'SELECT COALESCE(SUM(progress.completed_lessons), 0) FROM progress '
+            'WHERE progress.user_id = user_stats.user_id)'
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('lesson_completions', schema=None) as batch_op:
+        batch_op.drop_constraint('unique_lesson_completion', type_='unique')
@@ -0,0 +1,42 @@
+# Backend migrations/script.py.mako
+"""add course enrollment counters
+
+Revision ID: 3c7d9a1e5b42
+Revises: fb01ac6db073
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c7d9a1e5b42'
+down_revision = 'fb01ac6db073'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('enrollment_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.create_table('course_counter_shards',
+    sa.Column('course_id', sa.String(length=36), nullable=False),
+    sa.Column('shard', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('enrollment_delta', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ),
+    sa.PrimaryKeyConstraint('course_id', 'shard')
+    )
+
+    # Backfill from existing enrollments
+    op.execute(
+        'UPDATE courses SET enrollment_count = '
+        '(SELECT COUNT(*) FROM enrollments WHERE enrollments.course_id = courses.id)'
+    )
+
+
+def downgrade():
+    op.drop_table('course_counter_shards')
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.drop_column('enrollment_count')
@@ -0,0 +1,28 @@
+# Backend migrations/script.py.mako
+"""add course catalog keyset index
+
+Revision ID: 5a1c8e3f7d20
+Revises: 8e2f4b6d1a93
+Create Date: 2026-10-18 11:20:47.902315
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5a1c8e3f7d20'
+down_revision = '8e2f4b6d1a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index('ix_courses_published_created_id', 'courses', ['is_published', 'created_at', 'id'],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_courses_published_created_id', table_name='courses',
+                      postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,46 @@
+# Backend migrations/script.py.mako
+"""add user stats snapshots
+
+Revision ID: 6c3e8a2f9b14
+Revises: 9d4f1b7c2e65
+Create Date: 2026-10-18 17:05:31.402918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6c3e8a2f9b14'
+down_revision = '9d4f1b7c2e65'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('enrolled_courses', sa.Integer(), nullable=False),
+    sa.Column('lessons_completed', sa.Integer(), nullable=False),
+    sa.Column('quizzes_taken', sa.Integer(), nullable=False),
+    sa.Column('quiz_score_total', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Backfill a snapshot for every existing user
+    op.execute(
+        'INSERT INTO user_stats (user_id, enrolled_courses, lessons_completed, quizzes_taken, quiz_score_total, updated_at) '
+        'SELECT users.id, '
+        '(SELECT COUNT(*) FROM enrollments WHERE enrollments.user_id = users.id), '
+        '(SELECT COALESCE(SUM(completed_lessons), 0) FROM progress WHERE progress.user_id = users.id), '
+        '(SELECT COUNT(*) FROM quiz_attempts WHERE quiz_attempts.user_id = users.id), '
+        '(SELECT COALESCE(SUM(score), 0) FROM quiz_attempts WHERE quiz_attempts.user_id = users.id), '
+        'CURRENT_TIMESTAMP '
+        'FROM users'
+    )
+
+
+def downgrade():
+    op.drop_table('user_stats')
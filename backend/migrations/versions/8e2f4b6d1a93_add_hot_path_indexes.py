@@ -0,0 +1,42 @@
+# Backend migrations/script.py.mako
+"""add hot path indexes
+
+Revision ID: 8e2f4b6d1a93
+Revises: 3c7d9a1e5b42
+Create Date: 2026-10-18 10:02:11.530761
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8e2f4b6d1a93'
+down_revision = '3c7d9a1e5b42'
+branch_labels = None
+depends_on = None
+
+# enrollments.user_id and progress(user_id, course_id) are already covered by the
+# unique_enrollment / unique_progress constraints, so they get no extra index.
+INDEXES = [
+    ('ix_enrollments_course_id', 'enrollments', ['course_id']),
+    ('ix_lesson_completions_user_completed', 'lesson_completions', ['user_id', 'completed_at']),
+    ('ix_quiz_attempts_user_quiz_completed', 'quiz_attempts', ['user_id', 'quiz_id', 'completed_at']),
+    ('ix_quiz_answers_attempt_id', 'quiz_answers', ['attempt_id']),
+    ('ix_questions_quiz_id', 'questions', ['quiz_id']),
+    ('ix_lessons_course_id_order', 'lessons', ['course_id', 'order']),
+    ('ix_quizzes_scheduled_at', 'quizzes', ['scheduled_at']),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction on Postgres
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,60 @@
+# Backend migrations/script.py.mako
+"""add course search index
+
+Revision ID: 9d4f1b7c2e65
+Revises: 2b7e9c4d6f18
+Create Date: 2026-10-18 15:42:08.551274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4f1b7c2e65'
+down_revision = '2b7e9c4d6f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute(
+            "CREATE TABLE course_search ("
+            "course_id varchar(36) PRIMARY KEY, "
+            "published boolean NOT NULL DEFAULT false, "
+            "title text, description text, lessons text, "
+            "document tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(lessons, '')), 'C')) STORED)"
+        )
+        op.execute('CREATE INDEX ix_course_search_document ON course_search USING GIN (document)')
+        lessons = (
+            "SELECT string_agg(l.title || E'\\n' || coalesce(l.content, ''), E'\\n' ORDER BY l.\"order\") "
+            "FROM lessons l WHERE l.course_id = c.id"
+        )
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE course_search USING fts5("
+            "course_id UNINDEXED, published UNINDEXED, title, description, lessons, "
+            "tokenize = 'porter unicode61')"
+        )
+        lessons = (
+            "SELECT group_concat(l.title || char(10) || coalesce(l.content, ''), char(10)) "
+            "FROM lessons l WHERE l.course_id = c.id"
+        )
+    else:
+        return
+
+    # Backfill; afterwards the application keeps documents current on every course/lesson write
+    op.execute(
+        'INSERT INTO course_search (course_id, published, title, description, lessons) '
+        f"SELECT c.id, coalesce(c.is_published, false), c.title, coalesce(c.description, ''), "
+        f"coalesce(({lessons}), '') FROM courses c"
+    )
+
+
+def downgrade():
+    op.execute('DROP TABLE IF EXISTS course_search')
@@ -0,0 +1,34 @@
+# Backend migrations/script.py.mako
+"""add course similarities
+
+Revision ID: a8d2f5e1c734
+Revises: e4a7c1d9b352
+Create Date: 2026-10-18 19:40:12.885317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8d2f5e1c734'
+down_revision = 'e4a7c1d9b352'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('course_similarities',
+    sa.Column('course_id', sa.String(length=36), nullable=False),
+    sa.Column('similar_course_id', sa.String(length=36), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['similar_course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('course_id', 'similar_course_id')
+    )
+
+
+def downgrade():
+    op.drop_table('course_similarities')
@@ -0,0 +1,31 @@
+# Backend migrations/script.py.mako
+"""add user achievements
+
+Revision ID: c5b9e3a7d046
+Revises: a8d2f5e1c734
+Create Date: 2026-10-18 20:58:03.117642
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5b9e3a7d046'
+down_revision = 'a8d2f5e1c734'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_achievements',
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('code', sa.String(length=64), nullable=False),
+    sa.Column('earned_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'code')
+    )
+
+
+def downgrade():
+    op.drop_table('user_achievements')
@@ -0,0 +1,38 @@
+# Backend migrations/script.py.mako
+"""add learning events
+
+Revision ID: e4a7c1d9b352
+Revises: 6c3e8a2f9b14
+Create Date: 2026-10-18 18:21:47.630155
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a7c1d9b352'
+down_revision = '6c3e8a2f9b14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('learning_events',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('type', sa.String(length=32), nullable=False),
+    sa.Column('course_id', sa.String(length=36), nullable=True),
+    sa.Column('subject_id', sa.String(length=36), nullable=True),
+    sa.Column('data', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_learning_events_user_created', 'learning_events',
+                    ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_learning_events_user_created', table_name='learning_events')
+    op.drop_table('learning_events')
@@ -0,0 +1,34 @@
+# Backend migrations/script.py.mako
+"""index quizzes by course schedule
+
+Revision ID: f2c6a9d4e817
+Revises: c5b9e3a7d046
+Create Date: 2026-10-18 21:47:26.390512
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c6a9d4e817'
+down_revision = 'c5b9e3a7d046'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The upcoming-quiz feed seeks per enrolled course, which the old
+    # scheduled_at-only index cannot serve
+    with op.get_context().autocommit_block():
+        op.create_index('ix_quizzes_course_scheduled', 'quizzes', ['course_id', 'scheduled_at'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_quizzes_scheduled_at', table_name='quizzes',
+                      postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index('ix_quizzes_scheduled_at', 'quizzes', ['scheduled_at'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_quizzes_course_scheduled', table_name='quizzes',
+                      postgresql_concurrently=True, if_exists=True)
@@ -3,6 +3,7 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 import pytest
+from sqlalchemy import event
 from app import create_app, db
 from flask_jwt_extended import create_access_token
 from app.models import User, Course, Lesson, Enrollment, Progress, LessonCompletion
@@ -11,6 +12,8 @@ from app.models import User, Course, Lesson, Enrollment, Progress, LessonComplet
 def app():
     os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
     os.environ['JWT_SECRET_KEY'] = 'test-secret'
+    # the in-memory database is one shared connection, so tests flush the activity log themselves
+    os.environ['ACTIVITY_LOG_FLUSH_INTERVAL'] = '0'
     flask_app = create_app()
     flask_app.config['TESTING'] = True
     with flask_app.app_context():
@@ -19,10 +22,29 @@ def app():
         db.session.remove()
         db.drop_all()
 
+@pytest.fixture(autouse=True)
+def clear_response_cache(app):
+    # tests seed rows directly, bypassing the service-level invalidation
+    app.extensions['cache'].clear()
+
 @pytest.fixture()
 def client(app):
     return app.test_client()
 
+@pytest.fixture()
+def query_counter(app):
+    # records every SQL statement sent to the engine while the test runs
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _record)
+    yield statements
+    event.remove(engine, 'before_cursor_execute', _record)
+
 @pytest.fixture()
 def auth_headers(app):
     with app.app_context():
@@ -67,8 +89,13 @@ def seed_basic_data(app):
 def seed_completions(app, seed_basic_data):
     with app.app_context():
         l1, l2 = seed_basic_data['lessons']
-        lc1 = LessonCompletion(user_id='u1', course_id='c1', lesson_id=l1.id, time_spent_minutes=14, score=90)
-        lc2 = LessonCompletion(user_id='u1', course_id='c1', lesson_id=l2.id, time_spent_minutes=21, score=86)
-        db.session.add_all([lc1, lc2])
+        # completions are unique per user and lesson, so reuse rows left by earlier tests
+        completions = []
+        for lesson, minutes, score in [(l1, 14, 90), (l2, 21, 86)]:
+            lc = LessonCompletion.query.filter_by(user_id='u1', lesson_id=lesson.id).first()
+            if not lc:
+                lc = LessonCompletion(user_id='u1', course_id='c1', lesson_id=lesson.id, time_spent_minutes=minutes, score=score)
+                db.session.add(lc)
+            completions.append(lc)
         db.session.commit()
-        yield [lc1, lc2]
+        yield completions
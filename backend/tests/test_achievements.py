@@ -0,0 +1,79 @@
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import db
+from app.models import Course, Lesson, Question, Quiz, User, UserAchievement
+from app.services.achievement_service import AchievementService
+from app.services.activity_service import get_activity_log
+from app.services.course_service import CourseService
+from app.services.quiz_service import QuizService
+
+
+@pytest.fixture()
+def achiever(app):
+    with app.app_context():
+        if not User.query.get('ac-inst'):
+            db.session.add(User(id='ac-inst', email='ac-inst@example.com', first_name='I', last_name='I',
+                                role='instructor', password_hash='x'))
+            db.session.add(Course(id='ac-c1', title='Badges', description='d', instructor_id='ac-inst',
+                                  difficulty='beginner', category='AI'))
+            for order in (1, 2):
+                db.session.add(Lesson(id=f'ac-l{order}', title=f'L{order}', course_id='ac-c1', order=order))
+            db.session.add(Quiz(id='ac-q1', title='Q', course_id='ac-c1'))
+            for n in range(2):
+                db.session.add(Question(id=f'ac-q1-{n}', text='Question', type='short_answer', correct_answer='a',
+                                        quiz_id='ac-q1'))
+        n = User.query.filter(User.id.like('ac-u%')).count()
+        user_id = f'ac-u{n}'
+        db.session.add(User(id=user_id, email=f'{user_id}@example.com', first_name='S', last_name='S',
+                            role='student', password_hash='x'))
+        db.session.commit()
+        get_activity_log().flush()
+        yield user_id
+
+
+def _codes(user_id):
+    return {row.code for row in UserAchievement.query.filter_by(user_id=user_id)}
+
+
+def test_badges_follow_learning_events(app, achiever):
+    with app.app_context():
+        courses, log = CourseService(), get_activity_log()
+        courses.enroll_user(achiever, 'ac-c1')
+        courses.complete_lesson(achiever, 'ac-c1', 'ac-l1')
+        assert _codes(achiever) == set()  # nothing until the batch is written
+        log.flush()
+        assert _codes(achiever) == {'first_enrollment', 'first_lesson'}
+
+        QuizService().submit_quiz_attempt(achiever, 'ac-q1', [{'questionId': 'ac-q1-0', 'answer': 'a'}])
+        courses.complete_lesson(achiever, 'ac-c1', 'ac-l2')
+        log.flush()
+        assert _codes(achiever) == {'first_enrollment', 'first_lesson', 'course_complete'}
+
+        QuizService().submit_quiz_attempt(achiever, 'ac-q1', [{'questionId': f'ac-q1-{n}', 'answer': 'a'}
+                                                              for n in range(2)])
+        log.flush()
+        assert 'perfect_quiz' in _codes(achiever)
+
+
+def test_earned_badges_are_not_reevaluated(app, achiever, query_counter):
+    with app.app_context():
+        CourseService().enroll_user(achiever, 'ac-c1')
+        get_activity_log().flush()
+        del query_counter[:]
+        assert AchievementService().process([{'user_id': achiever, 'type': 'enrolled'}]) == []
+        # only the lookup of earned badges; 'explorer' is still open so stats are read too
+        assert len(query_counter) == 2
+
+
+def test_achievements_endpoint_and_backfill(app, client, achiever):
+    with app.app_context():
+        CourseService().enroll_user(achiever, 'ac-c1')
+        # history the engine never saw, e.g. from before it was deployed
+        get_activity_log()._buffer.clear()
+        assert _codes(achiever) == set()
+        assert AchievementService().backfill() >= 1
+        token = create_access_token(identity=achiever)
+    r = client.get('/api/dashboard/achievements', headers={'Authorization': f'Bearer {token}'})
+    assert r.status_code == 200
+    assert [(a['id'], a['title']) for a in r.get_json()['data']] == [('first_enrollment', 'Getting Started')]
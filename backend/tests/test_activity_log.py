@@ -0,0 +1,92 @@
+import time
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import db
+from app.models import Course, LearningEvent, Lesson, Question, Quiz, User
+from app.services.activity_service import ActivityLog, get_activity_log
+from app.services.course_service import CourseService
+from app.services.quiz_service import QuizService
+from app.services.user_service import UserService
+
+
+@pytest.fixture()
+def learner(app):
+    with app.app_context():
+        if not User.query.get('al-inst'):
+            db.session.add(User(id='al-inst', email='al-inst@example.com', first_name='I', last_name='I',
+                                role='instructor', password_hash='x'))
+            db.session.add(Course(id='al-c1', title='Activity', description='d', instructor_id='al-inst',
+                                  difficulty='beginner', category='AI'))
+            db.session.add(Lesson(id='al-l1', title='L1', course_id='al-c1', order=1))
+            db.session.add(Quiz(id='al-q1', title='Q', course_id='al-c1'))
+            db.session.add(Question(id='al-q1-0', text='Question', type='short_answer', correct_answer='a',
+                                    quiz_id='al-q1'))
+        n = User.query.filter(User.id.like('al-u%')).count()
+        user_id = f'al-u{n}'
+        db.session.add(User(id=user_id, email=f'{user_id}@example.com', first_name='S', last_name='S',
+                            role='student', password_hash='x'))
+        db.session.commit()
+        yield user_id
+
+
+def _headers(app, user_id):
+    with app.app_context():
+        return {'Authorization': f'Bearer {create_access_token(identity=user_id)}'}
+
+
+def test_recording_is_buffered_and_flushed_in_one_insert(app, learner, query_counter):
+    with app.app_context():
+        log = get_activity_log()
+        log.flush()
+        del query_counter[:]
+        CourseService().enroll_user(learner, 'al-c1')
+        writes = [s for s in query_counter if 'learning_events' in s]
+        assert writes == [] and log.pending() == 1
+
+        CourseService().complete_lesson(learner, 'al-c1', 'al-l1')
+        QuizService().submit_quiz_attempt(learner, 'al-q1', [{'questionId': 'al-q1-0', 'answer': 'a'}])
+        UserService().update_user_profile(learner, {'avatar': 'a.png'})
+        del query_counter[:]
+        assert log.flush() == 4
+        assert len([s for s in query_counter if s.lstrip().startswith('INSERT INTO learning_events')]) == 1
+
+        events = LearningEvent.query.filter_by(user_id=learner).order_by(LearningEvent.created_at).all()
+        assert [e.type for e in events] == ['enrolled', 'lesson_completed', 'quiz_submitted', 'profile_updated']
+        assert events[1].subject_id == 'al-l1' and events[2].data == {'score': 100.0}
+
+
+def test_activity_endpoints_page_with_a_cursor(app, client, learner):
+    with app.app_context():
+        get_activity_log().record_many([{'user_id': learner, 'type': 'lesson_completed', 'course_id': 'al-c1',
+                                         'subject_id': f'al-l{i}'} for i in range(5)])
+        get_activity_log().flush()
+    headers = _headers(app, learner)
+
+    seen, cursor = [], ''
+    while cursor is not None:
+        r = client.get(f'/api/user/activity?limit=2&cursor={cursor}', headers=headers)
+        assert r.status_code == 200
+        page = r.get_json()['data']
+        assert len(page['items']) <= 2
+        seen += [item['id'] for item in page['items']]
+        cursor = page['nextCursor']
+    assert len(seen) == len(set(seen)) == 5
+
+    r = client.get('/api/dashboard/recent-activity?fields=type', headers=headers)
+    items = r.get_json()['data']['items']
+    assert [item['id'] for item in items] == seen
+    assert all(set(item) == {'id', 'type'} for item in items)
+    assert client.get('/api/user/activity?cursor=bogus', headers=headers).status_code == 400
+
+
+def test_background_writer_flushes_on_its_own(app, learner):
+    log = ActivityLog(app, batch_size=2, flush_interval=30)
+    with app.app_context():
+        log.record_many([{'user_id': learner, 'type': 'enrolled'} for _ in range(2)])  # full batch wakes the writer
+        deadline = time.monotonic() + 5
+        while log.pending() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        assert LearningEvent.query.filter_by(user_id=learner, type='enrolled').count() == 2
@@ -0,0 +1,67 @@
+import pytest
+
+from app import db
+from app.models import Quiz, Question
+from app.services.quiz_service import QuizService
+
+
+@pytest.fixture()
+def seed_review_quiz(app, seed_basic_data):
+    with app.app_context():
+        if not Quiz.query.get('rv-q1'):
+            db.session.add(Quiz(id='rv-q1', title='Review Quiz', course_id='c1'))
+            for i in range(3):
+                db.session.add(Question(id=f'rv-qq{i}', text=f'Question {i}', type='multiple_choice', options=['a', 'b'],
+                                        correct_answer='a', explanation=f'Because {i}', quiz_id='rv-q1'))
+            db.session.commit()
+        yield 'rv-q1'
+
+
+def submit(app, quiz_id):
+    with app.app_context():
+        attempt = QuizService().submit_quiz_attempt('u1', quiz_id, [
+            {'questionId': 'rv-qq0', 'answer': 'a'},
+            {'questionId': 'rv-qq1', 'answer': 'b'},
+            {'questionId': 'rv-qq2', 'answer': 'a'},
+        ])
+        return attempt.id
+
+
+def test_attempt_review_single_query(app, seed_review_quiz, query_counter):
+    attempt_id = submit(app, seed_review_quiz)
+    with app.app_context():
+        db.session.expunge_all()
+        del query_counter[:]
+        review = QuizService().get_attempt_review('u1', seed_review_quiz, attempt_id)
+        assert len(query_counter) == 1
+    assert review['id'] == attempt_id
+    # answers follow the quiz's question order, not their random ids
+    assert [a['questionId'] for a in review['answers']] == ['rv-qq0', 'rv-qq1', 'rv-qq2']
+    answer = next(a for a in review['answers'] if a['questionId'] == 'rv-qq1')
+    assert answer['question'] == 'Question 1'
+    assert answer['options'] == ['a', 'b']
+    assert answer['answer'] == 'b' and answer['isCorrect'] is False
+    assert answer['explanation'] == 'Because 1'
+    assert 'user' not in review and 'quiz' not in review
+
+
+def test_attempt_list_uses_bounded_queries(app, seed_review_quiz, query_counter):
+    submit(app, seed_review_quiz)
+    submit(app, seed_review_quiz)
+    with app.app_context():
+        db.session.expunge_all()
+        del query_counter[:]
+        attempts = QuizService().get_user_attempts('u1', seed_review_quiz)
+        assert len(query_counter) == 1
+    assert len(attempts) >= 2
+    assert all(len(a['answers']) == 3 for a in attempts)
+
+
+def test_attempt_review_routes(client, app, auth_headers, seed_review_quiz):
+    attempt_id = submit(app, seed_review_quiz)
+    r = client.get(f'/api/quiz/{seed_review_quiz}/attempts/{attempt_id}', headers=auth_headers)
+    assert r.status_code == 200
+    assert len(r.get_json()['data']['answers']) == 3
+    assert client.get(f'/api/quiz/other-quiz/attempts/{attempt_id}', headers=auth_headers).status_code == 404
+    r2 = client.get(f'/api/quiz/{seed_review_quiz}/attempts?include=quiz', headers=auth_headers)
+    assert all('quiz' in a for a in r2.get_json()['data'])
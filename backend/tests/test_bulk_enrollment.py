@@ -0,0 +1,67 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert
+
+from app import db
+from app.models import Course, Enrollment, Lesson, Progress, Quiz, User
+from app.services.course_service import CourseService
+
+N_STUDENTS = 60
+
+
+@pytest.fixture()
+def cohort(app):
+    with app.app_context():
+        if not Course.query.get('be-c1'):
+            db.session.execute(insert(User), [
+                {'id': f'be-u{i}', 'email': f'be-u{i}@example.com', 'password_hash': 'x',
+                 'first_name': 'B', 'last_name': str(i), 'role': 'student'} for i in range(N_STUDENTS)
+            ])
+            admin = User(id='be-admin', email='be-admin@example.com', first_name='A', last_name='D', role='admin')
+            admin.set_password('pass')
+            db.session.add(admin)
+            db.session.add(Course(id='be-c1', title='Cohort Course', description='d', instructor_id='be-admin'))
+            db.session.add_all([Lesson(id=f'be-l{i}', title=f'L{i}', course_id='be-c1', order=i) for i in range(3)])
+            db.session.add(Quiz(id='be-q1', title='Q', course_id='be-c1'))
+            db.session.commit()
+        yield [f'be-u{i}' for i in range(N_STUDENTS)]
+
+
+def test_enroll_users_inserts_once_per_batch(app, cohort, query_counter):
+    with app.app_context():
+        cs = CourseService()
+        cs.enroll_user(cohort[0], 'be-c1')
+        del query_counter[:]
+        result = cs.enroll_users('be-c1', cohort + cohort[:5] + ['be-missing'])
+        assert result == {'enrolled': N_STUDENTS - 1, 'alreadyEnrolled': 1, 'unknownUsers': ['be-missing']}
+        # course, known users, totals, enrollments, progress, stats rows + increment, counter
+        assert len([s for s in query_counter if s.lstrip().upper().startswith(('SELECT', 'INSERT', 'UPDATE'))]) == 8
+
+        assert Enrollment.query.filter_by(course_id='be-c1').count() == N_STUDENTS
+        progress = Progress.query.filter_by(course_id='be-c1').all()
+        assert len(progress) == N_STUDENTS
+        assert {(p.total_lessons, p.total_quizzes, p.completed_lessons) for p in progress} == {(3, 1, 0)}
+        assert Course.query.get('be-c1').enrolled_students == N_STUDENTS
+
+        again = cs.enroll_users('be-c1', cohort)
+        assert again['enrolled'] == 0 and again['alreadyEnrolled'] == N_STUDENTS
+        assert cs.enroll_users('missing-course', cohort) is None
+
+
+def test_bulk_enroll_route(client, app, cohort):
+    headers = {'Authorization': f'Bearer {create_access_token(identity="be-admin")}'}
+    r = client.post('/api/courses/be-c1/enrollments/bulk', json={'userIds': cohort[:10]}, headers=headers)
+    assert r.status_code == 200
+    assert r.get_json()['data']['enrolled'] + r.get_json()['data']['alreadyEnrolled'] == 10
+    assert client.post('/api/courses/be-c1/enrollments/bulk', json={'userIds': 'be-u1'},
+                       headers=headers).status_code == 400
+    assert client.post('/api/courses/nope/enrollments/bulk', json={'userIds': ['be-u1']},
+                       headers=headers).status_code == 404
+
+
+def test_single_enroll_route_reports_duplicates(client, app, cohort):
+    with app.app_context():
+        CourseService().unenroll_user('be-u50', 'be-c1')
+    headers = {'Authorization': f'Bearer {create_access_token(identity="be-u50")}'}
+    assert client.post('/api/courses/be-c1/enroll', headers=headers).status_code == 200
+    assert client.post('/api/courses/be-c1/enroll', headers=headers).status_code == 400
@@ -0,0 +1,153 @@
+import pytest
+
+from app import db
+from app.models import Course, User
+from app.services.course_service import CourseService, catalog_cache_tag
+from app.utils import cache as cache_module
+from app.utils.cache import LRUCache, LocalRedis, RedisCache, create_cache, get_cache
+
+
+@pytest.fixture()
+def seed_cached_catalog(app):
+    with app.app_context():
+        if not User.query.get('cc-inst'):
+            db.session.add(User(id='cc-inst', email='cc-inst@example.com', first_name='C', last_name='C', role='instructor',
+                                password_hash='x'))
+            for i, category in enumerate(['cc-art', 'cc-art', 'cc-math']):
+                db.session.add(Course(id=f'cc-{i}', title=f'Cached {i}', description='d', instructor_id='cc-inst',
+                                      difficulty='beginner', category=category, is_published=True))
+            db.session.commit()
+        yield
+
+
+def test_lru_cache_ttl_eviction_and_tags(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, 'monotonic', lambda: now[0])
+    cache = LRUCache(max_entries=2, default_ttl=10)
+    cache.set('a', b'1', tags=['t1'])
+    cache.set('b', b'2', tags=['t1', 't2'])
+    assert cache.get('a') == b'1'
+    cache.set('c', b'3')  # evicts least recently used 'b'
+    assert cache.get('b') is None and cache.get('c') == b'3'
+    assert cache.invalidate_tags(['t1']) == 1
+    assert cache.get('a') is None
+    cache.set('d', b'4', ttl=5)
+    now[0] += 6
+    assert cache.get('d') is None and cache.get('c') == b'3'
+
+
+def test_redis_cache_with_local_stand_in():
+    cache = RedisCache(LocalRedis(), default_ttl=10)
+    cache.set('a', b'1', tags=['t1'])
+    cache.set('b', b'2', tags=['t2'])
+    assert cache.get('a') == b'1'
+    assert cache.invalidate_tags(['t1', 'missing']) == 1
+    assert cache.get('a') is None and cache.get('b') == b'2'
+    cache.clear()
+    assert cache.get('b') is None
+
+
+
+def test_enrollment_changes_evict_cached_counts(app, client, seed_cached_catalog):
+    art, math = '/api/courses/?category=cc-art', '/api/courses/?category=cc-math'
+    for url in (art, math, '/api/courses/cc-0'):
+        client.get(url)
+    with app.app_context():
+        if not User.query.get('cc-student'):
+            db.session.add(User(id='cc-student', email='cc-student@example.com', first_name='C', last_name='S',
+                                role='student', password_hash='x'))
+            db.session.commit()
+        before = client.get('/api/courses/cc-0').get_json()['data']['enrolledStudents']
+        # a catalog page that doesn't list the course survives
+        get_cache().set('unrelated-page', b'{}', tags=[catalog_cache_tag()])
+        CourseService().enroll_user('cc-student', 'cc-0')
+        assert get_cache().get('unrelated-page') == b'{}'
+        r = client.get('/api/courses/cc-0')
+        assert r.headers['X-Cache'] == 'MISS'
+        assert r.get_json()['data']['enrolledStudents'] == before + 1
+        assert client.get(art).headers['X-Cache'] == 'MISS'
+        assert client.get(math).headers['X-Cache'] == 'HIT'
+        CourseService().unenroll_user('cc-student', 'cc-0')
+        assert client.get('/api/courses/cc-0').get_json()['data']['enrolledStudents'] == before
+
+def test_create_cache_backends():
+    assert isinstance(create_cache({'CACHE_BACKEND': 'memory'}), LRUCache)
+    assert isinstance(create_cache({'CACHE_BACKEND': 'redis'}).client, LocalRedis)
+    assert create_cache({'CACHE_BACKEND': 'none'}).get('x') is None
+    with pytest.raises(ValueError):
+        create_cache({'CACHE_BACKEND': 'memcached'})
+
+
+def test_catalog_hits_skip_the_database(client, seed_cached_catalog, query_counter):
+    url = '/api/courses/?category=cc-art&limit=5'
+    first = client.get(url)
+    assert first.headers['X-Cache'] == 'MISS'
+    del query_counter[:]
+    second = client.get(url)
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.get_json() == first.get_json()
+    assert query_counter == []
+    # parameters are part of the key
+    assert client.get('/api/courses/?limit=5&category=cc-art').headers['X-Cache'] == 'HIT'
+    assert client.get('/api/courses/?category=cc-art&limit=4').headers['X-Cache'] == 'MISS'
+
+
+def test_course_update_invalidates_only_pages_embedding_it(app, client, seed_cached_catalog):
+    art, math = '/api/courses/?category=cc-art', '/api/courses/?category=cc-math'
+    for url in (art, math, '/api/courses/cc-0', '/api/courses/cc-2'):
+        client.get(url)
+    with app.app_context():
+        CourseService().update_course('cc-inst', 'cc-0', {'title': 'Renamed'})
+    assert client.get(math).headers['X-Cache'] == 'HIT'
+    assert client.get('/api/courses/cc-2').headers['X-Cache'] == 'HIT'
+    r = client.get(art)
+    assert r.headers['X-Cache'] == 'MISS'
+    assert 'Renamed' in {c['title'] for c in r.get_json()['data']['items']}
+    assert client.get('/api/courses/cc-0').get_json()['data']['title'] == 'Renamed'
+
+
+def test_listing_changes_invalidate_matching_filters(app, client, seed_cached_catalog):
+    art, math = '/api/courses/?category=cc-art', '/api/courses/?category=cc-math'
+    client.get(art)
+    client.get(math)
+    with app.app_context():
+        service = CourseService()
+        course = service.create_course('cc-inst', {'title': 'New', 'description': 'd',
+                                                   'difficulty': 'beginner', 'category': 'cc-math'})
+        # unpublished courses are not listed, so no catalog page changes
+        assert client.get(math).headers['X-Cache'] == 'HIT'
+        service.update_course('cc-inst', course.id, {'is_published': True})
+        assert client.get(art).headers['X-Cache'] == 'HIT'
+        r = client.get(math)
+        assert r.headers['X-Cache'] == 'MISS'
+        assert course.id in {c['id'] for c in r.get_json()['data']['items']}
+        service.delete_course('cc-inst', course.id)
+        assert client.get(math).headers['X-Cache'] == 'MISS'
+
+
+def test_lesson_writes_invalidate_their_course(app, client, seed_cached_catalog):
+    client.get('/api/courses/cc-1')
+    client.get('/api/courses/cc-2')
+    with app.app_context():
+        service = CourseService()
+        lesson = service.create_lesson('cc-inst', 'cc-1', {'title': 'L', 'description': 'd', 'content': 'c',
+                                                           'duration': 5, 'order': 1})
+        assert client.get('/api/courses/cc-2').headers['X-Cache'] == 'HIT'
+        r = client.get('/api/courses/cc-1')
+        assert r.headers['X-Cache'] == 'MISS'
+        assert [l['id'] for l in r.get_json()['data']['lessons']] == [lesson.id]
+        service.update_lesson('cc-inst', 'cc-1', lesson.id, {'title': 'L2'})
+        assert client.get('/api/courses/cc-1').get_json()['data']['lessons'][0]['title'] == 'L2'
+        service.delete_lesson('cc-inst', 'cc-1', lesson.id)
+        assert client.get('/api/courses/cc-1').get_json()['data']['lessons'] == []
+
+
+def test_instructor_profile_changes_evict_their_courses(app, client, seed_cached_catalog):
+    from app.services.user_service import UserService
+    url = '/api/courses/cc-0?include=instructor'
+    client.get(url)
+    # same app context (and session) as the requests, so they don't see a stale identity map
+    UserService().update_user_profile('cc-inst', {'first_name': 'Renamed'})
+    r = client.get(url)
+    assert r.headers['X-Cache'] == 'MISS'
+    assert r.get_json()['data']['instructor']['firstName'] == 'Renamed'
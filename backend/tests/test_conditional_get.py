@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+
+from app import db
+from app.models import Quiz, Question, User
+from app.services.course_service import CourseService
+
+
+def seed_quiz(app):
+    with app.app_context():
+        if not Quiz.query.get('cg-q1'):
+            db.session.add(Quiz(id='cg-q1', title='Conditional Quiz', course_id='c1'))
+            db.session.add(Question(id='cg-qq1', text='Q?', type='short_answer', correct_answer='a', quiz_id='cg-q1'))
+            db.session.commit()
+
+
+def test_course_etag_roundtrip(client, app, seed_basic_data, query_counter):
+    first = client.get('/api/courses/c1')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert etag.startswith('W/')
+
+    del query_counter[:]
+    r = client.get('/api/courses/c1', headers={'If-None-Match': etag})
+    assert r.status_code == 304 and r.data == b''
+    assert r.headers['ETag'] == etag
+    # one version query; no course, lesson or instructor loads
+    assert len(query_counter) == 1
+
+    # different fieldsets are different representations
+    assert client.get('/api/courses/c1?fields=title', headers={'If-None-Match': etag}).status_code == 200
+
+    with app.app_context():
+        CourseService().update_lesson('u1', 'c1', 'l1', {'title': 'Lesson 1 revised'})
+    r2 = client.get('/api/courses/c1', headers={'If-None-Match': etag})
+    assert r2.status_code == 200 and r2.headers['ETag'] != etag
+    with app.app_context():
+        CourseService().update_lesson('u1', 'c1', 'l1', {'title': 'Lesson 1'})
+
+
+def test_course_ignores_if_modified_since(client, app, seed_basic_data):
+    # enrollment counters change without moving a timestamp, so dates can't validate a course
+    r = client.get('/api/courses/c1')
+    assert 'Last-Modified' not in r.headers
+    later = 'Wed, 01 Jan 2100 00:00:00 GMT'
+    assert client.get('/api/courses/c1', headers={'If-Modified-Since': later}).status_code == 200
+
+
+def test_missing_course_is_not_conditional(client):
+    r = client.get('/api/courses/nope', headers={'If-None-Match': '*'})
+    assert r.status_code == 404 and 'ETag' not in r.headers
+
+
+def test_quiz_etag_tracks_questions(client, app, auth_headers, seed_basic_data):
+    seed_quiz(app)
+    etag = client.get('/api/quiz/cg-q1', headers=auth_headers).headers['ETag']
+    assert client.get('/api/quiz/cg-q1', headers={**auth_headers, 'If-None-Match': etag}).status_code == 304
+    with app.app_context():
+        db.session.add(Question(id='cg-qq2', text='Q2?', type='short_answer', correct_answer='b', quiz_id='cg-q1'))
+        db.session.commit()
+    assert client.get('/api/quiz/cg-q1', headers={**auth_headers, 'If-None-Match': etag}).status_code == 200
+
+
+def test_profile_if_modified_since(client, app, auth_headers):
+    last_modified = client.get('/api/user/profile', headers=auth_headers).headers['Last-Modified']
+    assert client.get('/api/user/profile', headers={**auth_headers, 'If-Modified-Since': last_modified}).status_code == 304
+    with app.app_context():
+        User.query.get('u1').updated_at = datetime.utcnow() + timedelta(seconds=5)
+        db.session.commit()
+    assert client.get('/api/user/profile', headers={**auth_headers, 'If-Modified-Since': last_modified}).status_code == 200
+
+
+def test_profile_etag(client, app, auth_headers):
+    etag = client.get('/api/user/profile', headers=auth_headers).headers['ETag']
+    assert client.get('/api/user/profile', headers={**auth_headers, 'If-None-Match': etag}).status_code == 304
+    with app.app_context():
+        User.query.get('u1').updated_at = datetime.utcnow() + timedelta(seconds=1)
+        db.session.commit()
+    assert client.get('/api/user/profile', headers={**auth_headers, 'If-None-Match': etag}).status_code == 200
+
+
+def test_course_etag_tracks_enrollment_counters(client, app, seed_basic_data):
+    from app.models import CourseCounterShard
+    etag = client.get('/api/courses/c1').headers['ETag']
+    with app.app_context():
+        if not User.query.get('cg-u1'):
+            db.session.add(User(id='cg-u1', email='cg-u1@example.com', first_name='C', last_name='G',
+                                role='student', password_hash='x'))
+            db.session.commit()
+        CourseService().enroll_user('cg-u1', 'c1')
+    r = client.get('/api/courses/c1', headers={'If-None-Match': etag})
+    assert r.status_code == 200
+    etag = r.headers['ETag']
+    # hot courses count enrollments in shard rows, which don't touch the course row either
+    with app.app_context():
+        shard = CourseCounterShard.query.get(('c1', 0)) or CourseCounterShard(course_id='c1', shard=0)
+        shard.enrollment_delta = (shard.enrollment_delta or 0) + 1
+        db.session.add(shard)
+        db.session.commit()
+    assert client.get('/api/courses/c1', headers={'If-None-Match': etag}).status_code == 200
+    with app.app_context():
+        CourseService().unenroll_user('cg-u1', 'c1')
+        shard = CourseCounterShard.query.get(('c1', 0))
+        shard.enrollment_delta -= 1
+        db.session.commit()
+
+
+def test_quiz_etag_tracks_embedded_course(client, app, auth_headers, seed_basic_data):
+    seed_quiz(app)
+    etag = client.get('/api/quiz/cg-q1', headers=auth_headers).headers['ETag']
+    with app.app_context():
+        CourseService().update_lesson('u1', 'c1', 'l2', {'title': 'Lesson 2 revised'})
+    assert client.get('/api/quiz/cg-q1', headers={**auth_headers, 'If-None-Match': etag}).status_code == 200
+    with app.app_context():
+        CourseService().update_lesson('u1', 'c1', 'l2', {'title': 'Lesson 2'})
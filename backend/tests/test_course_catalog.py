@@ -0,0 +1,90 @@
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.models import User, Course, Lesson
+from app.services.course_service import CourseService
+
+
+@pytest.fixture()
+def seed_catalog(app):
+    with app.app_context():
+        if not Course.query.filter_by(category='catalog-test').first():
+            instructor = User(id='cat-inst', email='cat-inst@example.com', first_name='Cat', last_name='Inst', role='instructor')
+            instructor.set_password('pw')
+            db.session.add(instructor)
+            for i in range(20):
+                db.session.add(Course(id=f'cat-{i}', title=f'Catalog {i}', description='desc', instructor_id='cat-inst',
+                                      difficulty='beginner', category='catalog-test', is_published=True))
+                for order in range(3):
+                    db.session.add(Lesson(id=f'cat-{i}-l{order}', title=f'L{order}', course_id=f'cat-{i}', order=order))
+            for i in range(5):
+                learner = User(id=f'cat-learner-{i}', email=f'cat-learner-{i}@example.com', first_name='L', last_name=str(i))
+                learner.set_password('pw')
+                db.session.add(learner)
+            db.session.commit()
+            for i in range(5):
+                CourseService().enroll_user(f'cat-learner-{i}', 'cat-0')
+        yield
+
+
+def test_catalog_payload_matches_to_dict(app, seed_catalog):
+    with app.app_context():
+        page = CourseService().get_courses(page=1, limit=20, category='catalog-test')
+        assert page['total'] == 20
+        by_id = {item['id']: item for item in page['items']}
+        assert by_id['cat-0']['enrolledStudents'] == 5
+        assert by_id['cat-1']['enrolledStudents'] == 0
+        assert [l['order'] for l in by_id['cat-0']['lessons']] == [0, 1, 2]
+        assert by_id['cat-0']['instructor']['id'] == 'cat-inst'
+        expected = Course.query.get('cat-0').to_dict()
+        assert by_id['cat-0']['enrolledStudents'] == expected['enrolledStudents']
+        assert len(by_id['cat-0']['lessons']) == len(expected['lessons'])
+
+
+def test_catalog_query_count_is_flat(app, seed_catalog, query_counter):
+    cs = CourseService()
+    with app.app_context():
+        cs.get_courses(page=1, limit=2, category='catalog-test')
+        small = len(query_counter)
+        db.session.expunge_all()
+        del query_counter[:]
+        cs.get_courses(page=1, limit=20, category='catalog-test')
+        large = len(query_counter)
+    assert small == large
+    assert large <= 5
+
+
+def test_keyset_pagination_walks_catalog(client, seed_catalog):
+    seen, cursor, pages = [], '', 0
+    while cursor is not None:
+        r = client.get(f'/api/courses/?category=catalog-test&limit=6&cursor={cursor}&fields=title&include=')
+        assert r.status_code == 200
+        data = r.get_json()['data']
+        assert 'total' not in data
+        seen.extend(item['id'] for item in data['items'])
+        cursor = data['nextCursor']
+        pages += 1
+    assert pages == 4
+    assert len(seen) == len(set(seen)) == 20
+
+
+def test_keyset_pagination_counts_and_bad_cursor(client, seed_catalog):
+    exact = client.get('/api/courses/?category=catalog-test&cursor=&count=exact').get_json()['data']
+    assert exact['total'] == 20
+    estimated = client.get('/api/courses/?category=catalog-test&cursor=&count=estimated').get_json()['data']
+    assert estimated['total'] == 20
+    assert client.get('/api/courses/?cursor=not-a-cursor').status_code == 400
+
+
+def test_keyset_page_is_index_seek(app, seed_catalog):
+    with app.app_context():
+        cs = CourseService()
+        cursor = cs.get_courses_keyset(limit=5, category='catalog-test')['nextCursor']
+        captured = []
+        record = lambda conn, cursor_, statement, parameters, context, many: captured.append((statement, parameters))
+        event.listen(db.engine, 'before_cursor_execute', record)
+        cs.get_courses_keyset(limit=5, cursor=cursor, include=set())
+        event.remove(db.engine, 'before_cursor_execute', record)
+        plan = db.session.connection().exec_driver_sql('EXPLAIN QUERY PLAN ' + captured[0][0], captured[0][1]).fetchall()
+    assert any('ix_courses_published_created_id' in row[-1] for row in plan)
@@ -0,0 +1,82 @@
+import pytest
+
+from app import db
+from app.models import Course, User
+from app.services.course_service import CourseService
+from app.services.facet_index import FacetIndex, get_facet_index
+
+
+@pytest.fixture()
+def seed_facet_catalog(app):
+    with app.app_context():
+        if not User.query.get('fc-inst'):
+            db.session.add(User(id='fc-inst', email='fc-inst@example.com', first_name='F', last_name='C', role='instructor',
+                                password_hash='x'))
+            rows = [('fc-art', 'beginner', True), ('fc-art', 'advanced', True), ('fc-math', 'beginner', True),
+                    ('fc-math', 'beginner', False)]
+            for i, (category, difficulty, published) in enumerate(rows):
+                db.session.add(Course(id=f'fc-{i}', title=f'Faceted {i}', description='d', instructor_id='fc-inst',
+                                      difficulty=difficulty, category=category, is_published=published))
+            db.session.commit()
+        # rows inserted directly bypass CourseService, so reload like a fresh worker would
+        get_facet_index().rebuild()
+        yield
+
+
+def _facets(client, **params):
+    r = client.get('/api/courses/facets', query_string=params)
+    assert r.status_code == 200
+    return r.get_json()['data']
+
+
+def test_facet_counts_apply_the_other_filters(client, seed_facet_catalog):
+    data = _facets(client)
+    assert data['facets']['category']['fc-art'] == 2
+    assert data['facets']['category']['fc-math'] == 1  # unpublished course is not counted
+
+    data = _facets(client, category='fc-art')
+    assert data['total'] == 2
+    # the category facet ignores its own filter so the UI can show alternatives
+    assert data['facets']['category']['fc-math'] == 1
+    assert data['facets']['difficulty'] == {'advanced': 1, 'beginner': 1}
+
+    data = _facets(client, category='fc-art', difficulty='beginner')
+    assert data['total'] == 1
+    assert data['facets']['category']['fc-art'] == 1
+    assert data['facets']['category']['fc-math'] == 1
+    assert _facets(client, category='fc-none')['total'] == 0
+
+
+def test_warm_facet_counts_skip_the_database(client, seed_facet_catalog, query_counter):
+    _facets(client, category='fc-math', difficulty='beginner')
+    assert query_counter == []
+
+
+def test_course_service_writes_update_the_index(app, client, seed_facet_catalog):
+    with app.app_context():
+        service = CourseService()
+        course = service.create_course('fc-inst', {'title': 'New', 'description': 'd',
+                                                   'difficulty': 'advanced', 'category': 'fc-math'})
+        assert _facets(client, category='fc-math')['total'] == 1
+        service.update_course('fc-inst', course.id, {'is_published': True})
+        assert _facets(client, category='fc-math')['facets']['difficulty'] == {'advanced': 1, 'beginner': 1}
+        service.update_course('fc-inst', course.id, {'category': 'fc-art'})
+        assert _facets(client, category='fc-math')['total'] == 1
+        assert _facets(client, category='fc-art')['total'] == 3
+        service.delete_course('fc-inst', course.id)
+        assert _facets(client, category='fc-art')['total'] == 2
+
+
+def test_stale_index_is_reloaded(app, seed_facet_catalog):
+    with app.app_context():
+        index = FacetIndex(max_age=60)
+        assert index.counts(category='fc-art')['total'] == 2
+        Course.query.get('fc-3').is_published = True
+        db.session.commit()
+        try:
+            assert index.counts(category='fc-math')['total'] == 1
+            index._loaded_at -= 61
+            assert index.counts(category='fc-math')['total'] == 2
+        finally:
+            Course.query.get('fc-3').is_published = False
+            db.session.commit()
@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy import text
+
+from app import db
+from app.models import User
+from app.services.course_service import CourseService
+from app.services.search_index import SearchIndex
+
+
+def make_course(cs, title, description, published=True):
+    course = cs.create_course('fts-inst', {'title': title, 'description': description,
+                                           'difficulty': 'beginner', 'category': 'fts'})
+    if published:
+        cs.update_course('fts-inst', course.id, {'is_published': True})
+    return course.id
+
+
+@pytest.fixture()
+def search_courses(app):
+    with app.app_context():
+        cs = CourseService()
+        if not User.query.get('fts-inst'):
+            db.session.add(User(id='fts-inst', email='fts-inst@example.com', password_hash='x',
+                                first_name='F', last_name='T', role='instructor'))
+            db.session.commit()
+            make_course(cs, 'Quantum Computing Basics', 'Qubits and gates for beginners')
+            mentioned = make_course(cs, 'Linear Algebra', 'Vectors and matrices')
+            cs.create_lesson('fts-inst', mentioned, {'title': 'Applications', 'description': 'd',
+                                                     'content': 'Matrices show up in quantum mechanics.',
+                                                     'duration': 5, 'order': 1})
+            make_course(cs, 'Quantum Secrets', 'Draft course', published=False)
+        yield cs
+
+
+def search(cs, query):
+    return cs.search_courses(query, fields={'title'}, include=set())
+
+
+def test_search_ranks_title_matches_first_and_hides_drafts(app, search_courses):
+    with app.app_context():
+        result = search(search_courses, 'quantum')
+        assert [i['title'] for i in result['items']] == ['Quantum Computing Basics', 'Linear Algebra']
+        assert result['total'] == 2
+        assert '<mark>Quantum</mark>' in result['items'][0]['snippet']
+        assert '<mark>quantum</mark>' in result['items'][1]['snippet']
+        # the last term matches as a prefix; FTS syntax in user input is treated as plain words
+        assert search(search_courses, 'qubi')['total'] == 1
+        assert search(search_courses, 'quantum" OR (NEAR')['total'] == 0
+        assert search(search_courses, '***')['total'] == 0
+
+
+def test_index_follows_course_and_lesson_writes(app, search_courses):
+    with app.app_context():
+        cs = search_courses
+        course_id = make_course(cs, 'Compilers', 'Parsing and code generation')
+        lesson = cs.create_lesson('fts-inst', course_id, {'title': 'Lexing', 'description': 'd',
+                                                          'content': 'Tokenizers turn characters into tokens',
+                                                          'duration': 5, 'order': 1})
+        assert search(cs, 'tokenizers')['total'] == 1
+        cs.update_lesson('fts-inst', course_id, lesson.id, {'content': 'Finite automata recognise lexemes'})
+        assert search(cs, 'tokenizers')['total'] == 0
+        assert search(cs, 'automata')['total'] == 1
+        cs.import_lessons('fts-inst', course_id, [{'title': 'Register allocation', 'description': 'A long description',
+                                                   'content': 'Graph colouring assigns registers', 'duration': 5}])
+        assert search(cs, 'colouring')['total'] == 1
+        cs.delete_lesson('fts-inst', course_id, lesson.id)
+        assert search(cs, 'automata')['total'] == 0
+        cs.update_course('fts-inst', course_id, {'is_published': False})
+        assert search(cs, 'compilers')['total'] == 0
+        cs.update_course('fts-inst', course_id, {'is_published': True, 'title': 'Compiler Construction'})
+        assert search(cs, 'construction')['total'] == 1
+        cs.delete_course('fts-inst', course_id)
+        assert db.session.execute(text('SELECT count(*) FROM course_search WHERE course_id = :id'),
+                                  {'id': course_id}).scalar() == 0
+
+
+def test_rebuild_reindexes_every_course(app, search_courses):
+    with app.app_context():
+        indexed = SearchIndex().rebuild()
+        assert indexed == db.session.execute(text('SELECT count(*) FROM courses')).scalar()
+        assert search(search_courses, 'quantum')['total'] == 2
+
+
+def test_search_route(client, search_courses):
+    r = client.get('/api/courses/search?q=quantum&fields=title&include=')
+    assert r.status_code == 200
+    data = r.get_json()['data']
+    assert data['items'][0]['title'] == 'Quantum Computing Basics' and 'snippet' in data['items'][0]
+    assert client.get('/api/courses/search?q=').status_code == 400
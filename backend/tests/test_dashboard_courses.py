@@ -0,0 +1,49 @@
+import pytest
+
+from app import db
+from app.models import Course, Enrollment, Lesson, Progress, User
+from app.services.dashboard_service import DashboardService
+
+
+@pytest.fixture()
+def seed_dashboard_courses(app):
+    with app.app_context():
+        if not User.query.get('dc-u'):
+            db.session.add(User(id='dc-u', email='dc-u@example.com', first_name='Dana', last_name='Student',
+                                role='student', password_hash='x'))
+            db.session.add(User(id='dc-inst', email='dc-inst@example.com', first_name='Ivy', last_name='Teacher',
+                                role='instructor', password_hash='x'))
+            for c in range(4):
+                db.session.add(Course(id=f'dc-c{c}', title=f'Dash {c}', description='d', instructor_id='dc-inst',
+                                      difficulty='beginner', category='AI'))
+                db.session.add(Enrollment(id=f'dc-e{c}', user_id='dc-u', course_id=f'dc-c{c}'))
+            for c in range(3):
+                for order in (1, 2, 3):
+                    db.session.add(Lesson(id=f'dc-c{c}-l{order}', title=f'Dash {c}.{order}', course_id=f'dc-c{c}',
+                                          order=order))
+            # dc-c0 in progress, dc-c1 finished, dc-c2 not started, dc-c3 has no lessons
+            db.session.add(Progress(user_id='dc-u', course_id='dc-c0', completed_lessons=1, total_lessons=3))
+            db.session.add(Progress(user_id='dc-u', course_id='dc-c1', completed_lessons=3, total_lessons=3))
+            db.session.commit()
+        yield
+
+
+def test_user_courses_read_model(app, seed_dashboard_courses, query_counter):
+    with app.app_context():
+        courses = {c['id']: c for c in DashboardService().get_user_courses('dc-u')}
+    assert len(query_counter) == 1
+    assert set(courses) == {'dc-c0', 'dc-c1', 'dc-c2', 'dc-c3'}
+    assert courses['dc-c0']['instructor'] == 'Ivy Teacher'
+    assert [courses[f'dc-c{c}']['totalLessons'] for c in range(4)] == [3, 3, 3, 0]
+    assert [courses[f'dc-c{c}']['completedLessons'] for c in range(4)] == [1, 3, 0, 0]
+    assert [courses[f'dc-c{c}']['nextLesson'] for c in range(4)] == [
+        'Dash 0.2', 'Course Complete', 'Dash 2.1', 'No lessons'
+    ]
+
+
+def test_user_courses_skip_unrequested_columns(app, seed_dashboard_courses, query_counter):
+    with app.app_context():
+        courses = DashboardService().get_user_courses('dc-u', {'title'})
+    assert all(set(c) == {'id', 'title'} for c in courses)
+    assert len(query_counter) == 1
+    assert 'FROM lessons' not in query_counter[0] and 'users' not in query_counter[0]
@@ -0,0 +1,84 @@
+import threading
+
+from app.services.dashboard_service import DashboardService, SUMMARY_SECTIONS
+
+
+def test_summary_returns_every_section(client, auth_headers, seed_basic_data):
+    r = client.get('/api/dashboard/summary', headers=auth_headers)
+    assert r.status_code == 200
+    body = r.get_json()
+    assert set(body['data']) == set(SUMMARY_SECTIONS)
+    assert body['partial'] is bool(body['errors'])
+    assert 'c1' in {c['id'] for c in body['data']['courses']}
+    assert body['data']['progress'] == client.get('/api/dashboard/progress', headers=auth_headers).get_json()['data']
+
+
+def test_summary_section_selection(client, auth_headers, seed_basic_data):
+    body = client.get('/api/dashboard/summary?sections=courses,quizzes', headers=auth_headers).get_json()
+    assert set(body['data']) == {'courses', 'quizzes'}
+    r = client.get('/api/dashboard/summary?sections=courses,bogus', headers=auth_headers)
+    assert r.status_code == 400
+
+
+def test_slow_section_degrades_to_partial_response(app, client, auth_headers, monkeypatch):
+    release = threading.Event()
+
+    def slow_recommendations(self, user_id):
+        release.wait(5)
+        return ['late']
+
+    monkeypatch.setattr(DashboardService, 'get_course_recommendations', slow_recommendations)
+    monkeypatch.setitem(app.config, 'DASHBOARD_SECTION_TIMEOUTS', {'recommendations': 0.05})
+    try:
+        r = client.get('/api/dashboard/summary?sections=recommendations,achievements', headers=auth_headers)
+    finally:
+        release.set()
+    body = r.get_json()
+    assert r.status_code == 200
+    assert body['partial'] is True
+    assert body['errors'] == {'recommendations': 'timeout'}
+    assert body['data'] == {'recommendations': None, 'achievements': []}
+
+
+def test_failing_section_is_isolated(app, client, auth_headers, monkeypatch):
+    def broken(self, user_id):
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(DashboardService, 'get_user_achievements', broken)
+    body = client.get('/api/dashboard/summary?sections=achievements,recommendations', headers=auth_headers).get_json()
+    assert body['errors'] == {'achievements': 'error'}
+    assert body['data'] == {'achievements': None, 'recommendations': []}
+
+
+def test_concurrent_summaries_share_the_pool(app, auth_headers, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    release, started = threading.Event(), threading.Semaphore(0)
+
+    def slow(self, user_id):
+        started.release()
+        release.wait(5)
+        return ['late']
+
+    monkeypatch.setattr(DashboardService, 'get_course_recommendations', slow)
+    monkeypatch.setattr(DashboardService, 'get_user_achievements', slow)
+    monkeypatch.setitem(app.config, 'DASHBOARD_SECTION_TIMEOUTS', {'recommendations': 0.2, 'achievements': 0.2})
+    monkeypatch.setitem(app.config, 'DASHBOARD_SUMMARY_MAX_INFLIGHT', 1)
+    monkeypatch.setitem(app.extensions, 'dashboard_executor', ThreadPoolExecutor(max_workers=2))
+    results = {}
+
+    def summarize(key, sections):
+        with app.app_context():
+            results[key] = DashboardService().get_summary('u1', sections)
+
+    try:
+        # the stuck request only ever holds one of the two workers, even after its sections time out
+        first = threading.Thread(target=summarize, args=('slow', {'recommendations', 'achievements'}))
+        first.start()
+        assert started.acquire(timeout=5)
+        summarize('fast', {'metrics'})
+        first.join(5)
+    finally:
+        release.set()
+        app.extensions['dashboard_executor'].shutdown(wait=True)
+    assert results['fast']['errors'] == {} and results['fast']['data']['metrics'] is not None
+    assert results['slow']['errors'] == {'recommendations': 'timeout', 'achievements': 'timeout'}
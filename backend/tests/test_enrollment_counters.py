@@ -0,0 +1,64 @@
+import pytest
+
+from app import db
+from app.models import User, Course, CourseCounterShard, Enrollment
+from app.services.course_service import CourseService
+
+
+@pytest.fixture()
+def counter_course(app):
+    with app.app_context():
+        if not Course.query.get('cnt-c1'):
+            db.session.add(Course(id='cnt-c1', title='Counters', description='desc', instructor_id='u1',
+                                  difficulty='beginner', category='counters', is_published=True))
+            for i in range(4):
+                u = User(id=f'cnt-u{i}', email=f'cnt-u{i}@example.com', first_name='C', last_name=str(i))
+                u.set_password('pw')
+                db.session.add(u)
+            db.session.commit()
+        yield 'cnt-c1'
+
+
+def test_enroll_and_unenroll_maintain_counter(app, counter_course):
+    cs = CourseService()
+    with app.app_context():
+        assert cs.enroll_user('cnt-u0', counter_course) is True
+        assert cs.enroll_user('cnt-u1', counter_course) is True
+        # idempotent re-enroll does not double count
+        assert cs.enroll_user('cnt-u1', counter_course) is True
+        assert Course.query.get(counter_course).enrolled_students == 2
+
+        assert cs.unenroll_user('cnt-u1', counter_course) is True
+        assert cs.unenroll_user('cnt-u1', counter_course) is False
+        assert Course.query.get(counter_course).to_dict()['enrolledStudents'] == 1
+
+
+def test_hot_course_uses_shards_and_reconciles(app, counter_course, monkeypatch):
+    cs = CourseService()
+    with app.app_context():
+        monkeypatch.setitem(app.config, 'HOT_COURSE_ENROLLMENT_THRESHOLD', 0)
+        monkeypatch.setitem(app.config, 'ENROLLMENT_COUNTER_SHARDS', 2)
+        cs.enroll_user('cnt-u2', counter_course)
+        cs.enroll_user('cnt-u3', counter_course)
+        assert CourseCounterShard.query.filter_by(course_id=counter_course).count() >= 1
+        expected = Enrollment.query.filter_by(course_id=counter_course).count()
+        assert Course.query.get(counter_course).enrolled_students == expected
+
+        # drift is repaired from the enrollments table and shards are folded
+        Course.query.get(counter_course).enrollment_count = 99
+        db.session.commit()
+        assert cs.reconcile_enrollment_counts() >= 1
+        course = Course.query.get(counter_course)
+        assert course.enrollment_count == expected
+        assert course.enrolled_students == expected
+        assert CourseCounterShard.query.count() == 0
+
+
+def test_unenroll_route(client, auth_headers, seed_basic_data):
+    r = client.delete('/api/courses/does-not-exist/enroll', headers=auth_headers)
+    assert r.status_code == 404
+
+
+def test_reconcile_cli_command(app):
+    result = app.test_cli_runner().invoke(args=['reconcile-enrollment-counts'])
+    assert 'Reconciled enrollment counts' in result.output
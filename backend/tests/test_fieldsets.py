@@ -0,0 +1,82 @@
+from app import db
+from app.models import Course, Quiz, Question
+from app.utils.fieldsets import parse_fieldset, nested_include, project
+
+
+def seed_quiz(app):
+    with app.app_context():
+        if not Quiz.query.get('fs-q1'):
+            db.session.add(Quiz(id='fs-q1', title='Fieldset Quiz', course_id='c1'))
+            db.session.add(Question(id='fs-qq1', text='What is ML?', type='short_answer', correct_answer='x', quiz_id='fs-q1'))
+            db.session.commit()
+
+
+def test_fieldset_helpers():
+    assert parse_fieldset(None) is None
+    assert parse_fieldset('') == set()
+    assert parse_fieldset('id, title,,') == {'id', 'title'}
+    assert nested_include(None, 'course') is None
+    assert nested_include({'course', 'course.instructor', 'user'}, 'course') == {'instructor'}
+    calls = []
+    item = project({'id': 1, 'cheap': 2, 'expensive': lambda: calls.append(1) or 3}, {'cheap'})
+    assert item == {'id': 1, 'cheap': 2}
+    assert calls == []
+
+
+def test_course_to_dict_projection(app, seed_basic_data):
+    with app.app_context():
+        data = Course.query.get('c1').to_dict(fields={'title'}, include=set())
+        assert set(data) == {'id', 'title'}
+        full = Course.query.get('c1').to_dict()
+        assert 'lessons' in full and 'instructor' in full and 'enrolledStudents' in full
+
+
+def test_catalog_route_sparse_fieldset(client, app, seed_basic_data, query_counter):
+    with app.app_context():
+        Course.query.get('c1').is_published = True
+        db.session.commit()
+    del query_counter[:]
+    r = client.get('/api/courses/?fields=title&include=')
+    assert r.status_code == 200
+    items = r.get_json()['data']['items']
+    assert items and all(set(i) == {'id', 'title'} for i in items)
+    # count + page only: no instructor, shard or lesson loads
+    assert not any('FROM lessons' in s or 'FROM users' in s or 'course_counter_shards' in s for s in query_counter)
+    with app.app_context():
+        Course.query.get('c1').is_published = False
+        db.session.commit()
+
+
+def test_fields_without_include_skip_relationships(client, app, auth_headers, seed_basic_data, query_counter):
+    seed_quiz(app)
+    del query_counter[:]
+    r = client.get('/api/quiz/fs-q1?fields=title', headers=auth_headers)
+    assert set(r.get_json()['data']) == {'id', 'title'}
+    # the version query and the quiz row: no course, lesson, instructor or question loads
+    assert len(query_counter) == 2
+
+    # naming a relationship in `fields` embeds it
+    data = client.get('/api/quiz/fs-q1?fields=title,questions', headers=auth_headers).get_json()['data']
+    assert set(data) == {'id', 'title', 'questions'}
+    with app.app_context():
+        data = Course.query.get('c1').to_dict(fields={'title', 'lessons'})
+        assert set(data) == {'id', 'title', 'lessons'}
+
+def test_quiz_route_include(client, app, auth_headers, seed_basic_data):
+    seed_quiz(app)
+    r = client.get('/api/quiz/fs-q1?include=course&fields=title', headers=auth_headers)
+    assert r.status_code == 200
+    data = r.get_json()['data']
+    assert set(data) == {'id', 'title', 'course'}
+    assert 'lessons' not in data['course'] and 'instructor' not in data['course']
+
+    r2 = client.get('/api/quiz/fs-q1', headers=auth_headers)
+    assert 'questions' in r2.get_json()['data']
+
+
+def test_dashboard_fields(client, auth_headers, seed_basic_data):
+    r = client.get('/api/dashboard/courses?fields=title', headers=auth_headers)
+    assert r.status_code == 200
+    assert all(set(c) == {'id', 'title'} for c in r.get_json()['data'])
+    r2 = client.get('/api/dashboard/progress?fields=completedLessons', headers=auth_headers)
+    assert all(set(p) == {'id', 'completedLessons'} for p in r2.get_json()['data'])
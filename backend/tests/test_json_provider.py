@@ -0,0 +1,44 @@
+import json
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.utils import json_provider
+from app.utils.json_provider import OrjsonJSONProvider, StdlibJSONProvider, get_json_provider_class
+
+
+PAYLOAD = {
+    'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'createdAt': datetime(2024, 1, 2, 3, 4, 5, 678000),
+    'price': Decimal('9.90'),
+    'nested': [{'b': 1, 'a': None}],
+}
+
+
+def test_providers_produce_identical_output(app):
+    stdlib = StdlibJSONProvider(app)
+    fast = OrjsonJSONProvider(app)
+    assert json.loads(stdlib.dumps(PAYLOAD)) == json.loads(fast.dumps(PAYLOAD))
+    decoded = fast.loads(fast.dumps(PAYLOAD))
+    assert decoded['createdAt'] == '2024-01-02T03:04:05.678000'
+    assert decoded['id'] == '12345678-1234-5678-1234-567812345678'
+    assert decoded['price'] == '9.90'
+
+
+def test_provider_selection(monkeypatch):
+    assert get_json_provider_class('stdlib') is StdlibJSONProvider
+    assert get_json_provider_class(None) is OrjsonJSONProvider
+    monkeypatch.setattr(json_provider, 'orjson', None)
+    assert get_json_provider_class('orjson') is StdlibJSONProvider
+    with pytest.raises(ValueError):
+        get_json_provider_class('yaml')
+
+
+def test_app_responses_use_installed_provider(app, client, seed_basic_data):
+    assert isinstance(app.json, OrjsonJSONProvider)
+    r = client.get('/api/courses/c1')
+    assert r.status_code == 200
+    data = r.get_json()['data']
+    assert datetime.fromisoformat(data['createdAt'])
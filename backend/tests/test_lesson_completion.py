@@ -0,0 +1,69 @@
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import db
+from app.models import LessonCompletion, Progress, User
+from app.services.course_service import CourseService
+
+
+@pytest.fixture()
+def learner(app, seed_basic_data):
+    with app.app_context():
+        if not User.query.get('lc-u1'):
+            db.session.add(User(id='lc-u1', email='lc-u1@example.com', password_hash='x',
+                                first_name='L', last_name='C', role='student'))
+            db.session.commit()
+            CourseService().enroll_user('lc-u1', 'c1')
+        yield {'Authorization': f'Bearer {create_access_token(identity="lc-u1")}'}
+
+
+def completed_lessons(user_id):
+    return Progress.query.filter_by(user_id=user_id, course_id='c1').one().completed_lessons
+
+
+def test_complete_lesson_is_idempotent(app, learner):
+    with app.app_context():
+        cs = CourseService()
+        before = completed_lessons('lc-u1')
+        first = cs.complete_lesson('lc-u1', 'c1', 'l2', time_spent_minutes=7, score=80)
+        retry = cs.complete_lesson('lc-u1', 'c1', 'l2', time_spent_minutes=9, score=10)
+        assert retry.id == first.id and retry.score == 80
+        assert LessonCompletion.query.filter_by(user_id='lc-u1', lesson_id='l2').count() == 1
+        assert completed_lessons('lc-u1') == before + 1
+
+
+def test_complete_lesson_requires_enrollment_and_matching_course(app, learner):
+    with app.app_context():
+        cs = CourseService()
+        assert cs.complete_lesson('lc-not-enrolled', 'c1', 'l1') is None
+        assert cs.complete_lesson('lc-u1', 'c1', 'missing-lesson') is None
+        assert cs.mark_lesson_complete('lc-u1', 'other-course', 'l1') is False
+
+
+def test_complete_route_retries_return_same_completion(client, app, learner):
+    r1 = client.post('/api/courses/c1/lessons/l1/complete', headers=learner, json={'timeSpentMinutes': 12})
+    r2 = client.post('/api/courses/c1/lessons/l1/complete', headers=learner, json={'timeSpentMinutes': 12})
+    assert r1.status_code == r2.status_code == 200
+    assert r1.get_json()['data']['id'] == r2.get_json()['data']['id']
+    with app.app_context():
+        assert LessonCompletion.query.filter_by(user_id='lc-u1', lesson_id='l1').count() == 1
+    assert client.post('/api/courses/c1/lessons/nope/complete', headers=learner).status_code == 404
+
+
+def test_reenrolled_student_can_complete_lessons_again(app):
+    from app.models import UserStats
+    with app.app_context():
+        if not User.query.get('lc-re'):
+            db.session.add(User(id='lc-re', email='lc-re@example.com', password_hash='x',
+                                first_name='L', last_name='R', role='student'))
+            db.session.commit()
+        cs = CourseService()
+        cs.enroll_user('lc-re', 'c1')
+        cs.complete_lesson('lc-re', 'c1', 'l1')
+        assert cs.unenroll_user('lc-re', 'c1')
+        assert LessonCompletion.query.filter_by(user_id='lc-re').count() == 0
+
+        cs.enroll_user('lc-re', 'c1')
+        assert cs.complete_lesson('lc-re', 'c1', 'l1') is not None
+        assert completed_lessons('lc-re') == 1
+        assert db.session.get(UserStats, 'lc-re').lessons_completed == 1
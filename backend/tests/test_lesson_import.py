@@ -0,0 +1,68 @@
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import db
+from app.models import Course, Lesson, User
+from app.services.course_service import CourseService
+
+
+@pytest.fixture()
+def admin_course(app):
+    with app.app_context():
+        if not User.query.get('li-admin'):
+            admin = User(id='li-admin', email='li-admin@example.com', first_name='A', last_name='D', role='admin')
+            admin.set_password('pass')
+            db.session.add(admin)
+            db.session.add(Course(id='li-c1', title='Import Target', description='d', instructor_id='li-admin'))
+            db.session.add(Lesson(id='li-l0', title='Existing', course_id='li-c1', order=3, duration=5))
+            db.session.commit()
+        yield {'Authorization': f'Bearer {create_access_token(identity="li-admin")}'}
+
+
+def lesson(title, order=None, **extra):
+    data = {'title': title, 'description': 'A description of the lesson',
+            'content': 'Lesson content that is long enough', 'duration': 10, **extra}
+    if order is not None:
+        data['order'] = order
+    return data
+
+
+def test_import_renumbers_and_reports_row_errors(app, admin_course, query_counter):
+    rows = [lesson('Second', order=20), {'title': 'x'}, lesson('First', order=5), 'nope', lesson('Third')]
+    with app.app_context():
+        del query_counter[:]
+        result = CourseService().import_lessons('li-admin', 'li-c1', rows)
+        inserts = [s for s in query_counter if s.startswith('INSERT INTO lessons')]
+        assert len(inserts) == 1
+        assert [e['index'] for e in result['errors']] == [1, 3]
+        assert 'Title must be at least 3 characters long' in result['errors'][0]['errors']
+        # 'Third' has no order, so it keeps its array position (4) and sorts before 5 and 20
+        assert {c['index']: c['order'] for c in result['created']} == {4: 4, 2: 5, 0: 6}
+        titles = [l.title for l in Lesson.query.filter_by(course_id='li-c1').order_by(Lesson.order)]
+        assert titles == ['Existing', 'Third', 'First', 'Second']
+        assert CourseService().import_lessons('someone-else', 'li-c1', rows) is None
+
+
+def test_import_reports_wrongly_typed_rows(app, admin_course):
+    rows = [lesson(42), lesson('Bad duration', duration='10'), lesson('Long link', videoUrl='https://x.io/' + 'v' * 250),
+            lesson('Typed fine', videoUrl='https://x.io/v')]
+    with app.app_context():
+        result = CourseService().import_lessons('li-admin', 'li-c1', rows)
+    assert {e['index']: e['errors'] for e in result['errors']} == {
+        0: ['Title must be a string'],
+        1: ['Duration must be a positive integer'],
+        2: ['Video URL must be a string of at most 255 characters'],
+    }
+    assert [c['index'] for c in result['created']] == [3]
+def test_import_route(client, admin_course):
+    r = client.post('/api/courses/li-c1/lessons/bulk', json={'lessons': [lesson('Routed lesson', order=1)]},
+                    headers=admin_course)
+    assert r.status_code == 201
+    assert len(r.get_json()['data']['created']) == 1
+
+    r = client.post('/api/courses/li-c1/lessons/bulk', json={'lessons': [{'title': 'x'}]}, headers=admin_course)
+    assert r.status_code == 400 and r.get_json()['data']['errors'][0]['index'] == 0
+    assert client.post('/api/courses/li-c1/lessons/bulk', json={'lessons': {'a': 1}},
+                       headers=admin_course).status_code == 400
+    assert client.post('/api/courses/missing/lessons/bulk', json={'lessons': [lesson('Nope lesson')]},
+                       headers=admin_course).status_code == 404
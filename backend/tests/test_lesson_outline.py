@@ -0,0 +1,43 @@
+from app import db
+from app.models import Lesson
+
+
+def test_course_detail_returns_outlines_without_content(client, app, seed_basic_data, query_counter):
+    with app.app_context():
+        Lesson.query.get('l1').content = 'x' * 5000
+        db.session.commit()
+    del query_counter[:]
+    r = client.get('/api/courses/c1')
+    assert r.status_code == 200
+    lessons = r.get_json()['data']['lessons']
+    assert [l['id'] for l in lessons] == ['l1', 'l2']
+    assert all(set(l) == {'id', 'title', 'duration', 'order'} for l in lessons)
+    assert not any('content' in s for s in query_counter)
+
+
+def test_catalog_lessons_skip_content(client, app, seed_basic_data, query_counter):
+    with app.app_context():
+        Lesson.query.get('l1').course.is_published = True
+        db.session.commit()
+    try:
+        del query_counter[:]
+        items = client.get('/api/courses/?limit=50').get_json()['data']['items']
+        c1 = next(i for i in items if i['id'] == 'c1')
+        assert set(c1['lessons'][0]) == {'id', 'title', 'duration', 'order'}
+        assert not any('content' in s for s in query_counter)
+    finally:
+        with app.app_context():
+            Lesson.query.get('l1').course.is_published = False
+            db.session.commit()
+
+
+def test_get_lesson_loads_content_in_one_query(client, app, seed_basic_data, query_counter):
+    with app.app_context():
+        Lesson.query.get('l2').content = 'Full lesson body'
+        db.session.commit()
+    del query_counter[:]
+    r = client.get('/api/courses/c1/lessons/l2')
+    assert r.status_code == 200
+    assert r.get_json()['data']['content'] == 'Full lesson body'
+    assert len(query_counter) == 1
+    assert client.get('/api/courses/other/lessons/l2').status_code == 404
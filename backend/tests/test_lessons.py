@@ -26,3 +26,28 @@ def test_completed_lessons_with_real_completions(client, auth_headers, seed_basi
     assert len(items) >= 2
     assert any(i.get('timeSpent') for i in items)
     assert any(i.get('quizScore') is not None for i in items)
+
+
+def test_completed_lessons_summary_is_one_statement(app, seed_basic_data, query_counter):
+    from app.models import LessonCompletion, Progress, User
+    from app.services.analytics_service import AnalyticsService
+
+    with app.app_context():
+        if not User.query.get('sm-u1'):
+            for user_id in ('sm-u1', 'sm-u2'):
+                db.session.add(User(id=user_id, email=f'{user_id}@example.com', first_name='S', last_name='S',
+                                    role='student', password_hash='x'))
+                db.session.add(Progress(user_id=user_id, course_id='c1', completed_lessons=2, average_score=70))
+            # sm-u1 has granular completions, one of them unscored; sm-u2 only has the progress snapshot
+            db.session.add(LessonCompletion(user_id='sm-u1', course_id='c1', lesson_id='l1', time_spent_minutes=50,
+                                            score=90))
+            db.session.add(LessonCompletion(user_id='sm-u1', course_id='c1', lesson_id='l2', time_spent_minutes=25))
+            db.session.commit()
+        del query_counter[:]
+        assert AnalyticsService().completed_lessons_summary('sm-u1') == {
+            'totalCompleted': 2, 'averageScore': 90.0, 'totalTime': '1h 15m'}
+        assert len(query_counter) == 1
+        assert AnalyticsService().completed_lessons_summary('sm-u2') == {
+            'totalCompleted': 2, 'averageScore': 70.0, 'totalTime': '0h 36m'}
+        assert AnalyticsService().completed_lessons_summary('nobody') == {
+            'totalCompleted': 0, 'averageScore': 0.0, 'totalTime': '0h 0m'}
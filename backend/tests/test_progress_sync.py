@@ -0,0 +1,69 @@
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import db
+from app.models import Course, Lesson, LessonCompletion, Progress, User
+from app.services.course_service import CourseService
+
+
+@pytest.fixture()
+def offline_learner(app):
+    with app.app_context():
+        if not User.query.get('ps-u1'):
+            db.session.add(User(id='ps-u1', email='ps-u1@example.com', password_hash='x',
+                                first_name='P', last_name='S', role='student'))
+            for c in range(2):
+                db.session.add(Course(id=f'ps-c{c}', title=f'Sync {c}', description='d', instructor_id='ps-u1'))
+                db.session.add_all([Lesson(id=f'ps-c{c}-l{i}', title=f'L{i}', course_id=f'ps-c{c}', order=i)
+                                    for i in range(4)])
+            db.session.add(Course(id='ps-other', title='Not enrolled', description='d', instructor_id='ps-u1'))
+            db.session.add(Lesson(id='ps-other-l0', title='L', course_id='ps-other', order=0))
+            db.session.commit()
+            cs = CourseService()
+            cs.enroll_user('ps-u1', 'ps-c0')
+            cs.enroll_user('ps-u1', 'ps-c1')
+            cs.complete_lesson('ps-u1', 'ps-c0', 'ps-c0-l0')
+        yield {'Authorization': f'Bearer {create_access_token(identity="ps-u1")}'}
+
+
+def completed(course_id):
+    return Progress.query.filter_by(user_id='ps-u1', course_id=course_id).one().completed_lessons
+
+
+def test_sync_dedupes_and_updates_progress_once(app, offline_learner, query_counter):
+    events = [
+        {'lessonId': 'ps-c0-l0', 'completedAt': '2026-01-01T10:00:00Z'},  # already recorded
+        {'lessonId': 'ps-c0-l1', 'completedAt': '2026-01-02T10:00:00Z', 'timeSpentMinutes': 9, 'score': 70},
+        {'lessonId': 'ps-c0-l1', 'completedAt': '2026-01-01T09:00:00+02:00', 'timeSpentMinutes': 4},
+        {'lessonId': 'ps-c1-l2', 'timeSpentMinutes': 3},
+        {'lessonId': 'ps-c1-l3', 'score': 101},
+        {'lessonId': 'ps-other-l0'},
+        'garbage',
+    ]
+    with app.app_context():
+        before = completed('ps-c0'), completed('ps-c1')
+        del query_counter[:]
+        result = CourseService().sync_lesson_completions('ps-u1', events)
+        writes = [s for s in query_counter if s.lstrip().upper().startswith(('INSERT', 'UPDATE'))]
+        # completions, progress, stats row + increment
+        assert len(writes) == 4
+        assert result['applied'] == ['ps-c0-l1', 'ps-c1-l2']
+        assert result['duplicates'] == ['ps-c0-l0']
+        assert [e['index'] for e in result['errors']] == [4, 5, 6]
+        assert (completed('ps-c0'), completed('ps-c1')) == (before[0] + 1, before[1] + 1)
+        # the earliest replayed event wins, normalized to UTC
+        lc = LessonCompletion.query.filter_by(user_id='ps-u1', lesson_id='ps-c0-l1').one()
+        assert lc.time_spent_minutes == 4 and lc.completed_at.isoformat() == '2026-01-01T07:00:00'
+
+        again = CourseService().sync_lesson_completions('ps-u1', events[:4])
+        assert again['applied'] == [] and len(again['duplicates']) == 3
+        assert (completed('ps-c0'), completed('ps-c1')) == (before[0] + 1, before[1] + 1)
+
+
+def test_sync_route(client, offline_learner):
+    r = client.post('/api/lessons/sync', json={'events': [{'lessonId': 'ps-c1-l0'}]}, headers=offline_learner)
+    assert r.status_code == 200
+    assert 'ps-c1-l0' in r.get_json()['data']['applied'] + r.get_json()['data']['duplicates']
+    assert client.post('/api/lessons/sync', json={'events': {'x': 1}}, headers=offline_learner).status_code == 400
+    too_many = [{'lessonId': 'ps-c1-l0'}] * 501
+    assert client.post('/api/lessons/sync', json={'events': too_many}, headers=offline_learner).status_code == 400
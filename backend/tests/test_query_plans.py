@@ -0,0 +1,129 @@
+"""EXPLAIN the hot service queries against a synthetic dataset and fail on sequential scans."""
+import re
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert, text
+
+from app import db
+from app.models import (User, Course, Lesson, Quiz, Question, QuizAttempt, QuizAnswer,
+                        Enrollment, Progress, LessonCompletion, LearningEvent)
+from app.services.activity_service import ActivityService
+from app.services.analytics_service import AnalyticsService
+from app.services.course_service import CourseService
+from app.services.dashboard_service import DashboardService
+from app.services.quiz_service import QuizService
+
+HOT_TABLES = {'enrollments', 'progress', 'lesson_completions', 'quiz_attempts',
+              'quiz_answers', 'questions', 'lessons', 'quizzes', 'learning_events'}
+
+N_USERS = 300
+N_COURSES = 60
+LESSONS_PER_COURSE = 10
+COURSES_PER_USER = 3
+
+
+@pytest.fixture(scope='module')
+def synthetic_dataset(app):
+    with app.app_context():
+        now = datetime.utcnow()
+        users = [{'id': f'qp-u{i}', 'email': f'qp-u{i}@example.com', 'password_hash': 'x',
+                  'first_name': 'Q', 'last_name': str(i), 'role': 'student'} for i in range(N_USERS)]
+        courses = [{'id': f'qp-c{i}', 'title': f'Plan {i}', 'instructor_id': 'qp-u0',
+                    'is_published': False, 'created_at': now, 'updated_at': now} for i in range(N_COURSES)]
+        lessons = [{'id': f'qp-c{c}-l{o}', 'title': f'L{o}', 'course_id': f'qp-c{c}', 'order': o,
+                    'created_at': now, 'updated_at': now}
+                   for c in range(N_COURSES) for o in range(LESSONS_PER_COURSE)]
+        quizzes = [{'id': f'qp-q{c}', 'title': f'Q{c}', 'course_id': f'qp-c{c}',
+                    'scheduled_at': now + timedelta(days=c - N_COURSES // 2), 'created_at': now, 'updated_at': now}
+                   for c in range(N_COURSES)]
+        questions = [{'id': f'qp-q{c}-{n}', 'text': 'Question text', 'type': 'short_answer', 'correct_answer': 'a',
+                      'quiz_id': f'qp-q{c}', 'created_at': now, 'updated_at': now}
+                     for c in range(N_COURSES) for n in range(5)]
+        enrollments, progress, completions, attempts, answers = [], [], [], [], []
+        for u in range(N_USERS):
+            for k in range(COURSES_PER_USER):
+                c = (u * 7 + k) % N_COURSES
+                enrollments.append({'id': str(uuid.uuid4()), 'user_id': f'qp-u{u}', 'course_id': f'qp-c{c}', 'enrolled_at': now})
+                progress.append({'id': str(uuid.uuid4()), 'user_id': f'qp-u{u}', 'course_id': f'qp-c{c}',
+                                 'completed_lessons': 4, 'total_lessons': LESSONS_PER_COURSE, 'average_score': 80,
+                                 'last_accessed_at': now, 'created_at': now, 'updated_at': now})
+                for o in range(4):
+                    completions.append({'id': str(uuid.uuid4()), 'user_id': f'qp-u{u}', 'course_id': f'qp-c{c}',
+                                        'lesson_id': f'qp-c{c}-l{o}', 'time_spent_minutes': 10, 'score': 80,
+                                        'completed_at': now - timedelta(minutes=o)})
+                attempt_id = str(uuid.uuid4())
+                attempts.append({'id': attempt_id, 'user_id': f'qp-u{u}', 'quiz_id': f'qp-q{c}', 'score': 60,
+                                 'total_points': 5, 'completed_at': now, 'created_at': now})
+                answers.extend({'id': str(uuid.uuid4()), 'question_id': f'qp-q{c}-{n}', 'answer': 'a',
+                                'is_correct': True, 'points': 1, 'attempt_id': attempt_id} for n in range(5))
+        for model, rows in [(User, users), (Course, courses), (Lesson, lessons), (Quiz, quizzes),
+                            (Question, questions), (Enrollment, enrollments), (Progress, progress),
+                            (LessonCompletion, completions), (QuizAttempt, attempts), (QuizAnswer, answers)]:
+            db.session.execute(insert(model), rows)
+        db.session.commit()
+        # refresh planner statistics so plans reflect the dataset size
+        db.session.execute(text('ANALYZE'))
+        db.session.commit()
+        yield
+
+
+def capture_statements(fn):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _record)
+    try:
+        fn()
+    finally:
+        event.remove(engine, 'before_cursor_execute', _record)
+    return statements
+
+
+def sequential_scans(statement, parameters):
+    """Hot tables the planner reads without an index for this statement"""
+    conn = db.session.connection()
+    if conn.dialect.name == 'postgresql':
+        plan = [row[0] for row in conn.exec_driver_sql('EXPLAIN ' + statement, parameters)]
+        pattern = re.compile(r'Seq Scan on (\w+)')
+    else:
+        plan = [row[-1] for row in conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)]
+        # "SCAN t" is a full table scan; "SCAN t USING [COVERING] INDEX ..." is not
+        pattern = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')
+    return {m.group(1) for line in plan for m in [pattern.search(line)] if m} & HOT_TABLES
+
+
+HOT_PATHS = {
+    'dashboard courses': lambda: DashboardService().get_user_courses('qp-u5'),
+    'dashboard quizzes': lambda: DashboardService().get_upcoming_quizzes('qp-u5'),
+    'dashboard progress': lambda: DashboardService().get_user_progress('qp-u5'),
+    'course progress': lambda: CourseService().get_user_progress('qp-u5', 'qp-c35'),
+    'completed summary': lambda: AnalyticsService().completed_lessons_summary('qp-u5'),
+    'completed list': lambda: AnalyticsService().completed_lessons_list('qp-u5'),
+    'quiz attempts': lambda: QuizService().get_user_attempts('qp-u5', 'qp-q35'),
+    'quiz history': lambda: QuizService().get_user_quiz_history('qp-u5'),
+    'quiz questions': lambda: QuizService().get_quiz_questions('qp-q35'),
+    'user activity': lambda: ActivityService().get_user_activity(
+        'qp-u5', cursor=ActivityService._encode_cursor(LearningEvent(created_at=datetime.utcnow(), id='~'))),
+}
+
+
+@pytest.mark.parametrize('name', sorted(HOT_PATHS))
+def test_hot_path_uses_indexes(app, synthetic_dataset, name):
+    with app.app_context():
+        statements = capture_statements(HOT_PATHS[name])
+        assert statements, f'{name} issued no queries'
+        for statement, parameters in statements:
+            scans = sequential_scans(statement, parameters)
+            assert not scans, f'{name}: sequential scan on {sorted(scans)} for\n{statement}'
+
+
+def test_detector_flags_unindexed_filter(app, synthetic_dataset):
+    with app.app_context():
+        statements = capture_statements(lambda: Question.query.filter_by(text='Question text').first())
+        assert any(sequential_scans(s, p) == {'questions'} for s, p in statements)
@@ -0,0 +1,72 @@
+import pytest
+
+from app import db
+from app.models import Course, CourseSimilarity, Enrollment, Lesson, LessonCompletion, User
+from app.services.recommendation_service import RecommendationService
+
+ENROLLMENTS = {
+    'rc-u1': ['rc-a', 'rc-b'],
+    'rc-u2': ['rc-a', 'rc-b', 'rc-c'],
+    'rc-u3': ['rc-a', 'rc-c'],
+    'rc-u4': ['rc-b', 'rc-hidden'],
+    'rc-target': ['rc-a'],
+    'rc-target2': ['rc-b'],
+}
+
+
+@pytest.fixture()
+def co_enrollments(app):
+    with app.app_context():
+        if not User.query.get('rc-inst'):
+            db.session.add(User(id='rc-inst', email='rc-inst@example.com', first_name='I', last_name='I',
+                                role='instructor', password_hash='x'))
+            for course_id in ['rc-a', 'rc-b', 'rc-c', 'rc-d', 'rc-hidden']:
+                db.session.add(Course(id=course_id, title=course_id, description='d', instructor_id='rc-inst',
+                                      difficulty='beginner', category='AI', is_published=course_id != 'rc-hidden'))
+            db.session.add(Lesson(id='rc-b-l1', title='L', course_id='rc-b', order=1))
+            for user_id, course_ids in ENROLLMENTS.items():
+                db.session.add(User(id=user_id, email=f'{user_id}@example.com', first_name='S', last_name='S',
+                                    role='student', password_hash='x'))
+                for course_id in course_ids:
+                    db.session.add(Enrollment(user_id=user_id, course_id=course_id))
+            db.session.add(LessonCompletion(user_id='rc-u1', course_id='rc-b', lesson_id='rc-b-l1'))
+            db.session.commit()
+        yield
+
+
+def _neighbours(course_id):
+    return [row.similar_course_id for row in
+            CourseSimilarity.query.filter_by(course_id=course_id).order_by(CourseSimilarity.rank)]
+
+
+@pytest.mark.parametrize('use_scipy', [False, True])
+def test_build_stores_ranked_neighbours(app, co_enrollments, use_scipy):
+    if use_scipy:
+        pytest.importorskip('scipy')
+    with app.app_context():
+        assert RecommendationService().build(top_k=2, use_scipy=use_scipy) > 0
+        assert _neighbours('rc-a') == ['rc-c', 'rc-b']
+        assert _neighbours('rc-hidden') == ['rc-b']
+        assert _neighbours('rc-d') == []  # nobody enrolled, so no neighbours
+        scores = [row.score for row in CourseSimilarity.query.filter_by(course_id='rc-b')]
+        assert all(0 < score <= 1 for score in scores)
+
+
+def test_recommendations_merge_precomputed_neighbours(app, client, co_enrollments, query_counter):
+    with app.app_context():
+        RecommendationService().build(use_scipy=False)
+        del query_counter[:]
+        recommended = [r['id'] for r in RecommendationService().get_recommendations('rc-target')]
+        assert len(query_counter) == 1
+        assert recommended == ['rc-c', 'rc-b']
+        # enrolled and unpublished courses are never recommended
+        assert 'rc-hidden' not in [r['id'] for r in RecommendationService().get_recommendations('rc-target2')]
+        assert RecommendationService().get_recommendations('nobody') == []
+
+
+def test_scipy_matches_the_pure_python_build(app, co_enrollments):
+    pytest.importorskip('scipy')
+    service = RecommendationService()
+    with app.app_context():
+        interactions = service._load_interactions()
+        assert service._neighbours_scipy(interactions, 5) == service._neighbours_python(interactions, 5)
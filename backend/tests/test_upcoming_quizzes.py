@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import db
+from app.models import Course, Enrollment, Quiz, User
+from app.services.course_service import CourseService
+from app.services.dashboard_service import DashboardService
+from app.services.quiz_service import QuizService
+
+
+@pytest.fixture()
+def quiz_feeds(app):
+    with app.app_context():
+        if not User.query.get('uq-inst'):
+            db.session.add(User(id='uq-inst', email='uq-inst@example.com', first_name='I', last_name='I',
+                                role='instructor', password_hash='x'))
+            soon = datetime.utcnow() + timedelta(days=1)
+            for course_id in ('uq-a', 'uq-b'):
+                db.session.add(Course(id=course_id, title=course_id, description='d', instructor_id='uq-inst',
+                                      difficulty='beginner', category='AI'))
+            for user_id, course_id in (('uq-u1', 'uq-a'), ('uq-u2', 'uq-b')):
+                db.session.add(User(id=user_id, email=f'{user_id}@example.com', first_name='S', last_name='S',
+                                    role='student', password_hash='x'))
+                db.session.add(Enrollment(user_id=user_id, course_id=course_id))
+            db.session.add(Quiz(id='uq-qa', title='A quiz', course_id='uq-a', scheduled_at=soon))
+            db.session.add(Quiz(id='uq-qb', title='B quiz', course_id='uq-b', scheduled_at=soon))
+            db.session.add(Quiz(id='uq-past', title='Past', course_id='uq-a',
+                                scheduled_at=datetime.utcnow() - timedelta(days=1)))
+            db.session.commit()
+        yield
+
+
+def _feed(user_id):
+    return [quiz['id'] for quiz in DashboardService().get_upcoming_quizzes(user_id)]
+
+
+def test_feed_is_served_from_cache(app, quiz_feeds, query_counter):
+    with app.app_context():
+        assert _feed('uq-u1') == ['uq-qa']
+        del query_counter[:]
+        assert _feed('uq-u1') == ['uq-qa']
+        assert query_counter == []
+
+
+def test_rescheduling_invalidates_only_its_course(app, client, quiz_feeds, query_counter):
+    with app.app_context():
+        _feed('uq-u1')
+        _feed('uq-u2')
+        token = create_access_token(identity='uq-inst')
+    soon = (datetime.utcnow() + timedelta(hours=2)).isoformat() + 'Z'
+    r = client.put('/api/quiz/uq-past/schedule', json={'scheduledAt': soon},
+                   headers={'Authorization': f'Bearer {token}'})
+    assert r.status_code == 200
+    with app.app_context():
+        del query_counter[:]
+        assert _feed('uq-u2') == ['uq-qb']
+        assert query_counter == []  # other course's students still hit the cache
+        assert _feed('uq-u1') == ['uq-past', 'uq-qa']
+        QuizService().schedule_quiz('uq-inst', 'uq-past', datetime.utcnow() - timedelta(days=1))
+        assert _feed('uq-u1') == ['uq-qa']
+
+
+def test_schedule_route_validation(app, client, quiz_feeds):
+    with app.app_context():
+        owner = {'Authorization': f'Bearer {create_access_token(identity="uq-inst")}'}
+        student = {'Authorization': f'Bearer {create_access_token(identity="uq-u1")}'}
+    assert client.put('/api/quiz/uq-qa/schedule', json={'scheduledAt': 'soon'}, headers=owner).status_code == 400
+    assert client.put('/api/quiz/uq-qa/schedule', json={'other': 1}, headers=owner).status_code == 400
+    assert client.put('/api/quiz/uq-qa/schedule', json={'scheduledAt': None}, headers=student).status_code == 404
+
+
+def test_enrollment_changes_invalidate_the_users_feed(app, quiz_feeds):
+    with app.app_context():
+        assert _feed('uq-u2') == ['uq-qb']
+        CourseService().enroll_user('uq-u2', 'uq-a')
+        assert _feed('uq-u2') == ['uq-qa', 'uq-qb']
+        CourseService().unenroll_user('uq-u2', 'uq-a')
+        assert _feed('uq-u2') == ['uq-qb']
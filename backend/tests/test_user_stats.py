@@ -0,0 +1,83 @@
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import db
+from app.models import Course, Lesson, Question, Quiz, User, UserStats
+from app.services.course_service import CourseService
+from app.services.quiz_service import QuizService
+from app.services.user_stats_service import UserStatsService
+
+
+@pytest.fixture()
+def stats_user(app):
+    with app.app_context():
+        if not User.query.get('us-inst'):
+            db.session.add(User(id='us-inst', email='us-inst@example.com', first_name='I', last_name='I',
+                                role='instructor', password_hash='x'))
+            db.session.add(Course(id='us-c1', title='Stats', description='d', instructor_id='us-inst',
+                                  difficulty='beginner', category='AI'))
+            for order in (1, 2):
+                db.session.add(Lesson(id=f'us-l{order}', title=f'L{order}', course_id='us-c1', order=order))
+            db.session.add(Quiz(id='us-q1', title='Q', course_id='us-c1'))
+            for n, answer in enumerate(['a', 'b']):
+                db.session.add(Question(id=f'us-q1-{n}', text='Question', type='short_answer',
+                                        correct_answer=answer, quiz_id='us-q1'))
+        # a fresh user per test keeps the counters predictable
+        n = User.query.filter(User.id.like('us-u%')).count()
+        user_id = f'us-u{n}'
+        db.session.add(User(id=user_id, email=f'{user_id}@example.com', first_name='S', last_name='S',
+                            role='student', password_hash='x'))
+        db.session.commit()
+        yield user_id
+
+
+def _metrics(client, user_id):
+    with client.application.app_context():
+        token = create_access_token(identity=user_id)
+    r = client.get('/api/dashboard/metrics', headers={'Authorization': f'Bearer {token}'})
+    assert r.status_code == 200
+    return r.get_json()['data']
+
+
+def test_writes_update_the_snapshot(app, client, stats_user):
+    with app.app_context():
+        courses, quizzes = CourseService(), QuizService()
+        courses.enroll_user(stats_user, 'us-c1')
+        courses.complete_lesson(stats_user, 'us-c1', 'us-l1')
+        courses.complete_lesson(stats_user, 'us-c1', 'us-l1')  # retry is not counted twice
+        courses.sync_lesson_completions(stats_user, [{'lessonId': 'us-l2'}])
+        quizzes.submit_quiz_attempt(stats_user, 'us-q1', [{'questionId': 'us-q1-0', 'answer': 'a'}])
+        quizzes.submit_quiz_attempt(stats_user, 'us-q1', [{'questionId': 'us-q1-0', 'answer': 'a'},
+                                                          {'questionId': 'us-q1-1', 'answer': 'b'}])
+    assert _metrics(client, stats_user) == {
+        'enrolledCourses': 1, 'lessonsCompleted': 2, 'quizzesTaken': 2, 'averageScore': 75.0
+    }
+    with app.app_context():
+        CourseService().unenroll_user(stats_user, 'us-c1')
+    assert _metrics(client, stats_user)['enrolledCourses'] == 0
+    assert _metrics(client, stats_user)['lessonsCompleted'] == 0
+
+
+def test_metrics_read_a_single_row(app, client, stats_user, query_counter):
+    _metrics(client, stats_user)  # creates the snapshot on first read
+    del query_counter[:]
+    assert _metrics(client, stats_user)['enrolledCourses'] == 0
+    assert len(query_counter) == 1 and 'user_stats' in query_counter[0]
+
+
+def test_reconcile_corrects_drift(app, stats_user):
+    with app.app_context():
+        service = UserStatsService()
+        CourseService().enroll_user(stats_user, 'us-c1')
+        UserStats.query.filter_by(user_id=stats_user).update({UserStats.enrolled_courses: 7,
+                                                              UserStats.quizzes_taken: 3})
+        db.session.commit()
+        assert service.reconcile([stats_user]) == 1
+        assert service.get_metrics(stats_user) == {
+            'enrolledCourses': 1, 'lessonsCompleted': 0, 'quizzesTaken': 0, 'averageScore': 0
+        }
+        # users without a snapshot get one
+        UserStats.query.filter_by(user_id=stats_user).delete()
+        db.session.commit()
+        assert service.reconcile() >= 1
+        assert db.session.get(UserStats, stats_user).enrolled_courses == 1
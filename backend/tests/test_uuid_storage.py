@@ -0,0 +1,123 @@
+import os
+import uuid
+
+import pytest
+from sqlalchemy import (Column, ForeignKey, Index, MetaData, Table, UniqueConstraint, create_engine, insert,
+                        inspect, select, text)
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models.types import UUIDString
+from app.utils.uuid_storage import convert_to_compact_uuids, uuid_columns
+
+
+def build_metadata():
+    metadata = MetaData()
+    parents = Table('parents', metadata, Column('id', UUIDString(compact=True), primary_key=True))
+    children = Table('children', metadata,
+                     Column('id', UUIDString(compact=True), primary_key=True),
+                     Column('parent_id', UUIDString(compact=True), ForeignKey('parents.id'), nullable=False))
+    return metadata, parents, children
+
+
+def test_compact_type_roundtrip_on_sqlite():
+    metadata, parents, _ = build_metadata()
+    engine = create_engine('sqlite://')
+    metadata.create_all(engine)
+    value = str(uuid.uuid4())
+    with engine.begin() as conn:
+        conn.execute(insert(parents), [{'id': value}])
+        assert conn.execute(select(parents.c.id)).scalar() == value
+        raw = conn.execute(text('SELECT typeof(id), length(id) FROM parents')).one()
+        assert tuple(raw) == ('blob', 16)
+        assert conn.execute(select(parents.c.id).where(parents.c.id == value.upper())).scalar() == value
+        assert conn.execute(select(parents.c.id).where(parents.c.id == 'not-a-uuid')).scalar() is None
+
+
+def test_compact_type_dialect_impls():
+    compact = UUIDString(compact=True)
+    value = uuid.uuid4()
+    assert isinstance(compact.load_dialect_impl(postgresql.dialect()), postgresql.UUID)
+    assert compact.process_bind_param(value, postgresql.dialect()) == str(value)
+    assert compact.process_bind_param(str(value), sqlite.dialect()) == value.bytes
+    assert UUIDString().process_bind_param('c1', sqlite.dialect()) == 'c1'
+    # malformed ids must not reach Postgres, which would reject them and abort the transaction
+    assert compact.process_bind_param('abc', postgresql.dialect()) is None
+    assert compact.process_result_value(b'abc', sqlite.dialect()) == 'abc'
+
+
+def test_malformed_ids_roundtrip_on_sqlite():
+    metadata, parents, _ = build_metadata()
+    engine = create_engine('sqlite://')
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(parents), [{'id': 'legacy-id'}])
+        assert conn.execute(select(parents.c.id)).scalar() == 'legacy-id'
+
+
+def test_sqlite_conversion_is_batched_and_resumable(tmp_path):
+    metadata, parents, children = build_metadata()
+    engine = create_engine(f'sqlite:///{tmp_path / "uuids.db"}')
+    metadata.create_all(engine)
+    parent_ids = [str(uuid.uuid4()) for _ in range(5)]
+    with engine.begin() as conn:
+        conn.execute(text('INSERT INTO parents (id) VALUES (:id)'), [{'id': p} for p in parent_ids])
+        conn.execute(text('INSERT INTO children (id, parent_id) VALUES (:id, :parent_id)'),
+                     [{'id': str(uuid.uuid4()), 'parent_id': p} for p in parent_ids])
+
+    logs = []
+    assert [c.name for _, c in uuid_columns(metadata)] == ['id', 'id', 'parent_id']
+    assert convert_to_compact_uuids(engine, metadata, batch_size=2, log=logs.append) == 15
+    assert len(logs) == 9  # 3 batches per column
+    assert convert_to_compact_uuids(engine, metadata, batch_size=2, log=logs.append) == 0
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM children WHERE typeof(parent_id) != 'blob'")).scalar() == 0
+        joined = conn.execute(select(children.c.parent_id).join(parents, parents.c.id == children.c.parent_id)).scalars().all()
+        assert sorted(joined) == sorted(parent_ids)
+
+
+def test_compact_uuids_command_requires_flag(app):
+    result = app.test_cli_runner().invoke(args=['compact-uuids'])
+    assert result.exit_code != 0
+    assert 'COMPACT_UUID_STORAGE' in result.output
+
+
+@pytest.mark.skipif(not os.environ.get('TEST_POSTGRES_URL'), reason='set TEST_POSTGRES_URL to run against Postgres')
+def test_postgresql_conversion_swaps_to_native_uuid():
+    engine = create_engine(os.environ['TEST_POSTGRES_URL'])
+    metadata, parents, children = build_metadata()
+    Index('ix_children_parent', children.c.parent_id)
+    children.append_constraint(UniqueConstraint('id', 'parent_id', name='uq_children_id_parent'))
+    legacy = MetaData()
+    for table in metadata.sorted_tables:
+        table.to_metadata(legacy)
+    for table in legacy.sorted_tables:
+        for column in table.columns:
+            column.type = UUIDString()  # the string(36) layout the conversion starts from
+    legacy.drop_all(engine)
+    legacy.create_all(engine)
+    parent_ids = [str(uuid.uuid4()) for _ in range(5)]
+    try:
+        with engine.begin() as conn:
+            conn.execute(insert(parents), [{'id': p} for p in parent_ids])
+            conn.execute(insert(children), [{'id': str(uuid.uuid4()), 'parent_id': p} for p in parent_ids])
+
+        assert convert_to_compact_uuids(engine, metadata, batch_size=2, log=lambda message: None) == 15
+        assert convert_to_compact_uuids(engine, metadata, batch_size=2, log=lambda message: None) == 0
+
+        inspector = inspect(engine)
+        assert {c['name']: str(c['type']) for c in inspector.get_columns('children')} == \
+            {'id': 'UUID', 'parent_id': 'UUID'}
+        assert inspector.get_pk_constraint('children')['constrained_columns'] == ['id']
+        assert [fk['referred_table'] for fk in inspector.get_foreign_keys('children')] == ['parents']
+        assert {i['name'] for i in inspector.get_indexes('children')} >= {'ix_children_parent', 'uq_children_id_parent'}
+
+        with engine.begin() as conn:
+            joined = conn.execute(select(children.c.parent_id)
+                                  .join(parents, parents.c.id == children.c.parent_id)).scalars().all()
+            assert sorted(joined) == sorted(parent_ids)
+            # a malformed id finds nothing and leaves the transaction usable
+            assert conn.execute(select(parents.c.id).where(parents.c.id == 'abc')).scalar() is None
+            assert conn.execute(select(parents.c.id).where(parents.c.id == parent_ids[0])).scalar() == parent_ids[0]
+    finally:
+        metadata.drop_all(engine)
@@ -1,7 +1,7 @@
 from app.utils.validators import (
     validate_email, validate_password, validate_phone, validate_url,
     sanitize_input, validate_course_data, validate_lesson_data,
-    validate_quiz_data, validate_question_data
+    validate_quiz_data, validate_question_data, parse_iso_datetime
 )
 
 
@@ -47,3 +47,8 @@ def test_validate_course_lesson_quiz_question():
         'text': 'too short', 'type': 'multiple_choice', 'options': ['A'], 'correct_answer': '', 'difficulty': 'hard', 'points': 0
     })
     assert question_bad['is_valid'] is False
+
+
+def test_parse_iso_datetime_accepts_z_suffix():
+    assert parse_iso_datetime('2026-01-01T10:00:00Z').utcoffset().total_seconds() == 0
+    assert parse_iso_datetime('2026-01-01T10:00:00').tzinfo is None